@@ -1,8 +1,18 @@
 #  Module Imports
+import os
 import sys
+import math
 import pygame
-import random
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import computers
+from assetcache import AssetCache
+from assetloader import AssetLoader
+from animation import AnimationClock, Animation
+from radar import RadarScanner
+from engine import SHIPLENGTHS, Occupancy, createGameLogic, randomLayout, shipCells, fireShot, checkForWinners
+from bitboard import SHIP
 
 pygame.init()
 
@@ -12,8 +22,12 @@ class Ship:
         self.pos = pos
         self.size = size
         self.rotation = False  # False: Vertical, True: Horizontal
-        self.active = False
+        self.active = False  # True khi tàu đang được kéo theo chuột
+        self.dragCells = None  # Các ô tàu sẽ chiếm nếu được thả tại vị trí hiện tại (None: ngoài lưới)
+        self.dragBlocked = False  # Vị trí hiện tại có va chạm với tàu khác không
         self.gunslist = []
+        self.grid = None  # Lưới tọa độ và chỉ mục ô của bàn cờ mà tàu thuộc về (gán bởi attachFleet)
+        self.occupancy = None
         self._load_images(img)
         self._initialize_guns(numGuns, gunPath, gunsize, gunCoordsOffset)
 
@@ -34,24 +48,42 @@ class Ship:
                     Guns(gunPath, self.rect.center, gun_size, gunCoordsOffset[i])
                 )
 
-    def selectShipAndMove(self):
-        """Kích hoạt chuyển động của tàu bằng chuột."""
+    def startDrag(self, pos):
+        """Nhấc tàu lên; vòng lặp chính chuyển các sự kiện chuột tới dragTo, drop và dragRotate."""
         self.active = True
-        while self.active:
-            self.rect.center = pygame.mouse.get_pos() # Cập nhật vị trí tàu, khiến tàu di chuyển theo chuột
-            updateGameScreen(GAMESCREEN, GAMESTATE, True)
-            for event in pygame.event.get():
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if not self.checkForCollisions(pFleet):
-                        if event.button == 1:  # Left click to place
-                            self._finalize_placement()
-                        elif event.button == 3:  # Right click to rotate
-                            self.rotateShip()
+        self.dragTo(pos)
+
+    def dragTo(self, pos):
+        """Di chuyển tàu theo chuột và tính trước ô đích, va chạm (từ chỉ mục ô) để báo cho người chơi."""
+        self.rect.center = pos  # Cập nhật vị trí tàu, khiến tàu di chuyển theo chuột
+        self.dragCells = self.gridCells()
+        self.dragBlocked = self.checkForCollisions(pFleet)
+
+    def drop(self):
+        """Thả tàu (chuột trái) nếu không va chạm; trả về True khi tàu đã được đặt."""
+        if self.dragBlocked:
+            return False
+        self._finalize_placement()
+        return True
+
+    def dragRotate(self, pos):
+        """Xoay tàu đang kéo (chuột phải) nếu vị trí hiện tại không va chạm."""
+        if not self.dragBlocked:
+            self.rotateShip()
+            self.dragTo(pos)
+
+    def dragFeedbackRect(self):
+        """Khung các ô đích của tàu đang kéo (None nếu tàu nằm ngoài lưới)."""
+        if not self.dragCells:
+            return None
+        first, last = self.dragCells[0], self.dragCells[-1]
+        return self.grid.cellRect(*first).union(self.grid.cellRect(*last))
 
     def _finalize_placement(self):
         """Hoàn tất việc đặt tàu."""
         self.hImageRect.center = self.vImageRect.center = self.rect.center
         self.active = False
+        self.snap()
 
     def rotateShip(self, force=False):
         """Chuyển đổi tàu giữa hướng dọc và hướng ngang."""
@@ -59,6 +91,7 @@ class Ship:
         if self.active or force:               
             self.rotation = not self.rotation   
             self._switch_image_and_rect()
+            self.updateOccupancy()
 
     def _switch_image_and_rect(self):
         """Switch between vertical and horizontal images."""
@@ -66,9 +99,37 @@ class Ship:
         self.image, self.rect = (self.hImage, self.hImageRect) if self.rotation else (self.vImage, self.vImageRect)
         self.hImageRect.center = self.vImageRect.center = self.rect.center
 
+    def gridCells(self, rect=None):
+        """
+        Các ô mà tàu sẽ chiếm sau khi được gióng vào lưới (theo ô chứa góc trên trái của rect),
+        hoặc None nếu rect không nằm trọn trong lưới (tàu sẽ trở về vị trí mặc định).
+        """
+        rect = rect or self.rect
+        if not self.grid.rect.contains(rect):
+            return None
+        row, col = self.grid.cellAt(rect.topleft)
+        return shipCells(row, col, SHIPLENGTHS[self.name], rect.width > rect.height)
+
+    def updateOccupancy(self):
+        """Ghi lại các ô tàu đang chiếm vào chỉ mục của bàn cờ (O(chiều dài tàu))."""
+        if self.occupancy is not None:
+            self.occupancy.place(self.name, self.gridCells() or [])
+
     def checkForCollisions(self, shiplist):
         """Kiểm tra xem tàu ​​có va chạm với tàu nào khác trong hạm đội không."""
-        return any(self.rect.colliderect(ship.rect) for ship in shiplist if ship != self)
+        cells = self.gridCells() if self.occupancy is not None else None
+        if cells is None:  # Ngoài lưới: so khung hình như trước
+            return any(self.rect.colliderect(ship.rect) for ship in shiplist if ship != self)
+        return self.occupancy.collides(self.name, cells)
+
+    def checkForRotateCollisions(self, shiplist):
+        """Kiểm tra xem tàu có va chạm với tàu khác hoặc ra khỏi lưới nếu xoay tại chỗ không."""
+        rotated = (self.vImageRect if self.rotation else self.hImageRect).copy()
+        rotated.center = self.rect.center
+        if self.occupancy is None or self.gridCells() is None:  # Tàu chưa được đặt lên lưới
+            return any(rotated.colliderect(ship.rect) for ship in shiplist if ship != self)
+        cells = self.gridCells(rotated)
+        return cells is None or self.occupancy.collides(self.name, cells)
 
     def returnToDefaultPosition(self):
         """Đặt lại tàu về vị trí và hướng mặc định."""
@@ -76,14 +137,29 @@ class Ship:
             self.rotateShip(force=True)     #Quay tàu dọc với force là True
         self.rect.topleft = self.pos
         self.hImageRect.center = self.vImageRect.center = self.rect.center
+        self.updateOccupancy()
+
+    def placeCells(self, cells):
+        """Đặt tàu (đang không được kéo) lên đúng các ô cells của lưới."""
+        horizontal = len(cells) > 1 and cells[0][0] == cells[1][0]
+        if horizontal != self.rotation:
+            self.rotateShip(force=True)
+        self.rect.topleft = self.grid.cellPos(*cells[0])
+        self.snap()
+
+    def snap(self):
+        """Gióng tàu vào lưới của nó (hoặc đưa về chỗ cũ) khi tàu vừa được đặt, xoay hoặc xếp lại."""
+        self.snapToGridEdge(self.grid)
+        self.snapToGrid(self.grid)
+        self.updateOccupancy()
 
     def snapToGridEdge(self, gridCoords):
         """Chuyển tàu vào cạnh lưới hoặc trở về mặc định nếu vượt quá giới hạn."""
-        left, right, top, bottom = gridCoords[0][0][0], gridCoords[0][-1][0] + 50, gridCoords[0][0][1], gridCoords[-1][0][1] + 50
-        if self.rect.left < left or self.rect.right > right or self.rect.top < top or self.rect.bottom > bottom:
+        bounds = gridCoords.rect
+        if not bounds.contains(self.rect):
             self.returnToDefaultPosition()
         else:
-            self._constrain_within_bounds(left, right, top, bottom)
+            self._constrain_within_bounds(bounds.left, bounds.right, bounds.top, bounds.bottom)
         self.vImageRect.center = self.hImageRect.center = self.rect.center
 
     def _constrain_within_bounds(self, left, right, top, bottom):
@@ -94,27 +170,50 @@ class Ship:
         self.rect.bottom = min(self.rect.bottom, bottom)
 
     def snapToGrid(self, gridCoords):
-        """Cập nhật vị trí tàu vào ô lưới gần nhất."""
-        for row in gridCoords:
-            for cell in row:
-                if self.rect.left >= cell[0] and self.rect.left < cell[0] + CELLSIZE and \
-                   self.rect.top >= cell[1] and self.rect.top < cell[1] + CELLSIZE:
-                    offset_x = (CELLSIZE - self.image.get_width()) // 2 if not self.rotation else 0
-                    offset_y = 0 if not self.rotation else (CELLSIZE - self.image.get_height()) // 2
-                    self.rect.topleft = (cell[0] + offset_x, cell[1] + offset_y)
+        """Cập nhật vị trí tàu vào ô lưới chứa góc trên trái của tàu."""
+        cell = gridCoords.cellAt(self.rect.topleft)
+        if cell is not None:
+            x, y = gridCoords.cellPos(*cell)
+            offset_x = (CELLSIZE - self.image.get_width()) // 2 if not self.rotation else 0
+            offset_y = 0 if not self.rotation else (CELLSIZE - self.image.get_height()) // 2
+            self.rect.topleft = (x + offset_x, y + offset_y)
         self.vImageRect.center = self.hImageRect.center = self.rect.center
 
     def draw(self, window):
         """Draw the ship and its guns on the window."""
+        self.drawHull(window)
+        self.drawGuns(window)
+
+    def drawHull(self, window):
+        """Vẽ thân tàu (phần tĩnh khi tàu đứng yên)."""
         window.blit(self.image, self.rect)
+
+    def drawDragged(self, window):
+        """Vẽ thân tàu đang kéo cùng khung ô đích (xanh: đặt được, đỏ: va chạm); trả về vùng đã vẽ."""
+        rect = self.rect.copy()
+        feedback = self.dragFeedbackRect()
+        if feedback:
+            colour = (255, 0, 0) if self.dragBlocked else (0, 255, 0)
+            rect.union_ip(pygame.draw.rect(window, colour, feedback, 3))
+        self.drawHull(window)
+        return rect
+
+    def drawGuns(self, window):
+        """Vẽ súng (xoay theo chuột) và trả về các vùng đã vẽ."""
+        rects = []
         for gun in self.gunslist:
             gun.draw(window, self)
+            rects.append(gun.rect.copy())
+        return rects
 
 
 class Guns:
     def __init__(self, imgPath, pos, size, offset):
-        self.orig_image = loadImage(imgPath, size, True)
+        self.imgPath = imgPath
+        self.size = size
+        self.orig_image = loadGunImage(imgPath, size)
         self.image = self.orig_image
+        self.angle = 0  # Góc (đã lượng tử hóa theo GUNSTEP) của self.image
         self.offset = offset
         self.rect = self.image.get_rect(center=pos)
 
@@ -138,8 +237,8 @@ class Guns:
 
     def _rotate_gun(self, ship):
         """Xoay súng theo con trỏ chuột dựa trên hướng tàu."""
-        direction = pygame.math.Vector2(pygame.mouse.get_pos()) - pygame.math.Vector2(self.rect.center)
-        _, angle = direction.as_polar()
+        mouseX, mouseY = pygame.mouse.get_pos()
+        angle = math.degrees(math.atan2(mouseY - self.rect.centery, mouseX - self.rect.centerx))
         if self._is_valid_rotation(ship, angle):
             self._update_image(angle)
 
@@ -153,8 +252,12 @@ class Guns:
                    (self.rect.centerx >= ship.hImageRect.centerx and -90 <= angle <= 90)
 
     def _update_image(self, angle):
-        """Cập nhật hình ảnh súng dựa trên góc quay."""
-        self.image = pygame.transform.rotate(self.orig_image, -angle)
+        """Cập nhật hình ảnh súng dựa trên góc quay; chỉ đổi Surface khi góc lượng tử hóa thay đổi."""
+        angle = round(angle / GUNSTEP) * GUNSTEP % 360
+        if angle == self.angle:
+            return
+        self.angle = angle
+        self.image = rotateGunImage(self.imgPath, self.size, angle)
         self.rect = self.image.get_rect(center=self.rect.center)
 
     def draw(self, window, ship):   
@@ -178,8 +281,7 @@ class Button:
 
     def _create_text(self, msg): 
         """Tạo văn bản hiển thị cho nút."""
-        font = pygame.font.SysFont('Stencil', 22)
-        return font.render(msg, True, (255, 255, 255))
+        return renderText('Stencil', 22, msg, (255, 255, 255))
 
     def focus_on_button(self, window):
         """Highlights nút khi được di chuột"""
@@ -237,8 +339,6 @@ class Button:
         TOKENS.clear()
         self._reset_ships(pFleet)
         self._randomize_positions(cFleet, cGameGrid)
-        updateGameLogic(cGameGrid, cFleet, cGameLogic)
-        updateGameLogic(pGameGrid, pFleet, pGameLogic)
 
     def _update_button_name(self, gameStatus):
         """Cập nhật tên nút động dựa trên trạng thái trò chơi."""
@@ -250,9 +350,11 @@ class Button:
             'Randomize': 'Quit' if not gameStatus else 'Randomize',
             'Quit': 'Randomize' if gameStatus else 'Quit',
         }
-        self.name = name_map.get(self.name, self.name)
-        self.msg = self._create_text(self.name)
-        self.msgRect = self.msg.get_rect(center=self.rect.center)
+        name = name_map.get(self.name, self.name)
+        if name != self.name:  # Chỉ tạo lại chữ khi tên nút thật sự thay đổi
+            self.name = name
+            self.msg = self._create_text(self.name)
+            self.msgRect = self.msg.get_rect(center=self.rect.center)
 
     def draw(self, window):
         """Draws the button on the screen."""
@@ -270,39 +372,107 @@ class Tokens:
         self.explosionList = explosionList
         self.action = action
         self.soundFile = soundFile
-        self.timer = pygame.time.get_ticks()
-        self.imageIndex = 0
-        self.explosionIndex = 0
-        self.explosion = False
-
-    def animate_Explosion(self):
-        """Hiệu ứng chuỗi vụ nổ"""
-        self.explosionIndex += 1
-        if self.explosionIndex < len(self.explosionList):
-            return self.explosionList[self.explosionIndex]
-        else:
-            return self.animate_fire()
-
-    def animate_fire(self):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.timer >= 100:
-            self.timer = current_time
-            self.imageIndex += 1
-        if self.imageIndex < len(self.imageList):
-            return self.imageList[self.imageIndex]
-        else:
-            self.imageIndex = 0
-            return self.imageList[self.imageIndex]
+        self.animation = None
+        if imageList:
+            # Chuỗi vụ nổ chạy một lần rồi chuyển sang ngọn lửa lặp lại
+            fire = Animation(imageList, FIREFRAMEMS, ANIMCLOCK.now, loop=True)
+            self.animation = Animation(explosionList, EXPLOSIONFRAMEMS, ANIMCLOCK.now, then=fire) if explosionList else fire
+
+    def update(self):
+        """Lấy khung hình theo đồng hồ hoạt ảnh (token có hoạt ảnh); trả về (image, rect) để vẽ."""
+        if self.animation:
+            self.image = self.animation.frame(ANIMCLOCK.now)
+            self.rect = self.image.get_rect(topleft=self.pos)
+            self.rect[1] = self.pos[1] - 10  # Điều chỉnh vị trí y một chút để căn chỉnh tốt hơn
+        return self.image, self.rect
 
     def draw(self, window):
         """Vẽ token ra màn hình"""
-        if not self.imageList:  # Nếu không có imageList nào được cung cấp, hãy sử dụng một hình ảnh
-            window.blit(self.image, self.rect)
+        window.blit(*self.update())
+
+
+class TokenLayer:
+    """
+    Quản lý token trên hai bàn cờ:
+    - Token tĩnh (trúng/trượt) được vẽ một lần lên lớp phủ overlay và không còn được vẽ lại mỗi khung hình.
+    - Chỉ token còn hoạt ảnh (vụ nổ, lửa) nằm trong danh sách animated và được vẽ bằng một lệnh blits.
+    Vẫn dùng như danh sách cũ: TOKENS.append(token), TOKENS.clear(), len(TOKENS).
+    """
+    def __init__(self, size):
+        self.overlay = pygame.Surface(size, pygame.SRCALPHA)
+        self.animated = []
+        self.fresh = []  # Token tĩnh mới, chưa có trong lớp tĩnh của ScreenLayer
+        self.count = 0
+        self.generation = 0  # Tăng mỗi lần xóa để lớp tĩnh được vẽ lại
+
+    def append(self, token):
+        self.count += 1
+        if token.imageList:
+            self.animated.append(token)
         else:
-            self.image = self.animate_Explosion()  # Sử dụng animate_Explosion() nếu imageList được cung cấp
-            self.rect = self.image.get_rect(topleft=self.pos)
-            self.rect[1] = self.pos[1] - 10  # Điều chỉnh vị trí y một chút để căn chỉnh tốt hơn
-            window.blit(self.image, self.rect)
+            self.overlay.blit(token.image, token.rect)
+            self.fresh.append(token)
+
+    def clear(self):
+        self.overlay.fill((0, 0, 0, 0))
+        self.animated.clear()
+        self.fresh.clear()
+        self.count = 0
+        self.generation += 1
+
+    def __len__(self):
+        return self.count
+
+    def drawStatic(self, window):
+        """Vẽ toàn bộ token tĩnh (khi vẽ lại lớp tĩnh)."""
+        window.blit(self.overlay, (0, 0))
+        self.fresh.clear()
+
+    def drawFresh(self, window):
+        """Vẽ các token tĩnh mới lên lớp tĩnh; trả về các vùng đã vẽ."""
+        rects = [window.blit(token.image, token.rect) for token in self.fresh]
+        self.fresh.clear()
+        return rects
+
+    def drawAnimated(self, window):
+        """Vẽ các token có hoạt ảnh bằng một lệnh blits; trả về các vùng đã vẽ."""
+        return window.blits([token.update() for token in self.animated])
+
+class ScreenLayer:
+    """
+    Vẽ lại theo vùng bẩn (dirty rectangles):
+    - Lớp tĩnh (nền, lưới, thân tàu, nút, token tĩnh) chỉ được vẽ lại khi khóa cảnh thay đổi.
+    - Các khung hình khác chỉ khôi phục nền dưới các phần động của khung trước,
+      vẽ lại phần động và đẩy đúng những vùng đó ra màn hình.
+    """
+    def __init__(self, window):
+        self.window = window
+        self.static = pygame.Surface(window.get_size()).convert()
+        self.sceneKey = None
+        self.full = True
+        self.dynamicRects = []  # Các vùng động đã vẽ ở khung trước
+
+    def begin(self, sceneKey):
+        """Bắt đầu khung hình; trả về True nếu cần vẽ lại lớp tĩnh vào self.static."""
+        self.full = sceneKey != self.sceneKey
+        self.sceneKey = sceneKey
+        if not self.full:
+            for rect in self.dynamicRects:
+                self.window.blit(self.static, rect, rect)
+        return self.full
+
+    def commit(self):
+        """Chép lớp tĩnh vừa vẽ lên cửa sổ."""
+        self.window.blit(self.static, (0, 0))
+
+    def present(self, dirtyRects):
+        """Đẩy ra màn hình toàn bộ cửa sổ (khi cảnh đổi) hoặc chỉ các vùng động cũ và mới."""
+        if self.full:
+            pygame.display.update()
+        elif self.dynamicRects or dirtyRects:
+            pygame.display.update(self.dynamicRects + dirtyRects)
+        self.dynamicRects = dirtyRects
+
 
 class Player:
     def __init__(self):
@@ -310,781 +480,221 @@ class Player:
 
     def make_attack(self, grid, logic_grid):
         """Xử lý cuộc tấn công của người chơi vào lưới máy tính dựa trên vị trí chuột."""
-        posX, posY = pygame.mouse.get_pos()
-
-        # Kiểm tra xem vị trí chuột có nằm trong giới hạn lưới không
-        if self._is_within_bounds(posX, posY, grid):
-            for i, row in enumerate(grid):
-                for j, col in enumerate(row):
-                    if self._is_cell_clicked(posX, posY, col):
-                        self._process_attack(i, j, grid, logic_grid)
-
-    def _is_within_bounds(self, posX, posY, grid):
-        # Kiểm tra xem vị trí chuột có nằm trong giới hạn lưới không
-        return (grid[0][0][0] <= posX <= grid[0][-1][0] + 50 and
-                grid[0][0][1] <= posY <= grid[-1][0][1] + 50)
-
-    def _is_cell_clicked(self, posX, posY, cell):
-        """Kiểm tra xem một ô lưới cụ thể có được nhấp vào hay không."""
-        return cell[0] <= posX < cell[0] + 50 and cell[1] <= posY < cell[1] + 50
+        # Ô được nhấp (None nếu vị trí chuột nằm ngoài lưới)
+        cell = grid.cellAt(pygame.mouse.get_pos())
+        if cell is not None:
+            self._process_attack(*cell, grid, logic_grid)
 
     def _process_attack(self, i, j, grid, logic_grid):
         """Xử lý kết quả đòn tấn công của người chơi."""
-        # Kiểm tra nếu ô đã được đánh dấu trước đó
-        if logic_grid[i][j] in ('X', 'T'):
+        result = fireShot(logic_grid, i, j)
+        # Bỏ qua nếu ô đã được đánh dấu trước đó
+        if result is None:
             return
 
-        if logic_grid[i][j] != ' ':
-            if logic_grid[i][j] == 'O':  # Hit
-                TOKENS.append(Tokens(REDTOKEN, grid[i][j], 'Hit', None, None, None))
-                logic_grid[i][j] = 'T'
-                SHOTSOUND.play()
-                HITSOUND.play()
-            self.turn = False  # End player's turn
+        if result == 'Hit':
+            TOKENS.append(Tokens(ASSETS['REDTOKEN'], grid[i][j], 'Hit', None, None, None))
+            ASSETS['SHOTSOUND'].play()
+            ASSETS['HITSOUND'].play()
         else:  # Miss
-            logic_grid[i][j] = 'X'
-            TOKENS.append(Tokens(GREENTOKEN, grid[i][j], 'Miss', None, None, None))
-            SHOTSOUND.play()
-            MISSSOUND.play()
-            self.turn = False  # End player's turn
-
-#Các thuật toán của computer
-#Tìm kiếm mù: DFS
-class DFSCOMPUTER:
-    def __init__(self):
-        # Biến điều khiển lượt chơi của máy
-        self.turn = False  # Biến cho biết máy đang ở lượt chơi hay không
-        self.status = self.computer_status('Thinking')  # Trạng thái hiện tại của máy
-        self.name = 'DFS Computer'  # Tên của máy
-        self.visited = set()  # Tập hợp các ô đã bắn (tránh lặp lại)
-        self.stack = []  # Ngăn xếp để thực hiện thuật toán tìm kiếm theo chiều sâu (DFS)
-
-    def computer_status(self, msg):
-        """Hiển thị trạng thái của máy."""
-        font = pygame.font.SysFont('Stencil', 22)
-        return font.render(msg, 1, (0, 0, 0))
-
-    def make_attack(self, gamelogic):
-        """
-        Máy thực hiện lượt tấn công:
-        - Nếu ngăn xếp rỗng, khởi tạo tất cả ô trên lưới vào ngăn xếp.
-        - Lấy các ô từ ngăn xếp để thực hiện bắn theo DFS.
-        """
-        current_time = pygame.time.get_ticks()  # Lấy thời gian hiện tại
-        if current_time - TURNTIMER >= 1000:  # Kiểm tra nếu đã qua ít nhất 1 giây từ lượt trước
-            if not self.stack:  # Nếu ngăn xếp rỗng
-                for row in range(10):  # Duyệt qua toàn bộ lưới
-                    for col in range(10):
-                        self.stack.append((row, col))  # Thêm tất cả ô vào ngăn xếp
-            # Lấy các ô tiếp theo từ ngăn xếp
-            while self.stack:
-                row, col = self.stack.pop()  # Lấy ô cuối cùng trong ngăn xếp
-                if (row, col) not in self.visited:  # Chỉ xử lý ô chưa bị bắn
-                    self._process_attack(row, col, gamelogic)  # Cập nhật trạng thái của ô vừa tấn công
-                    break
-        return self.turn  # Trả về trạng thái lượt chơi của máy
-
-    def _process_attack(self, row, col, gamelogic):
-        """
-        Thực hiện bắn vào ô (row, col) và cập nhật trạng thái:
-        - Nếu bắn trúng tàu, cập nhật ô trúng và thêm các ô lân cận vào ngăn xếp.
-        - Nếu bắn trượt, cập nhật ô trượt.
-        """
-        print(f"Attacking: ({row}, {col})")  # In ra vị trí đang bắn
-        self.visited.add((row, col))  # Đánh dấu ô đã bắn
-        if gamelogic[row][col] == 'O':  # Nếu ô chứa tàu
-            gamelogic[row][col] = 'T'  # Đánh dấu trạng thái ô trúng tàu
-            # Thêm hiệu ứng và âm thanh khi bắn trúng
-            TOKENS.append(Tokens(REDTOKEN, pGameGrid[row][col], 'Hit', FIRETOKENIMAGELIST, EXPLOSIONIMAGELIST, None))
-            SHOTSOUND.play()
-            HITSOUND.play()
-            # Thêm các ô lân cận vào ngăn xếp để tiếp tục DFS
-            self._add_neighbors_to_stack(row, col, gamelogic)
-        else:  # Nếu bắn trượt
-            gamelogic[row][col] = 'X'  # Đánh dấu trạng thái ô trượt
-            # Thêm hiệu ứng và âm thanh khi bắn trượt
-            TOKENS.append(Tokens(BLUETOKEN, pGameGrid[row][col], 'Miss', None, None, None))
-            SHOTSOUND.play()
-            MISSSOUND.play()
-        # Kết thúc lượt chơi
-        self.turn = False
-
-    def _add_neighbors_to_stack(self, row, col, gamelogic):
-        """
-        Thêm các ô lân cận (theo 4 hướng: Bắc, Nam, Đông, Tây) vào ngăn xếp để tiếp tục DFS.
-        """
-        directions = ['North', 'South', 'East', 'West']  # Các hướng di chuyển
-        for direction in directions:
-            # Lấy tọa độ ô lân cận dựa trên hướng
-            nx, ny = self._get_next_position(row, col, direction)
-            # Chỉ thêm ô hợp lệ (nằm trong lưới, chưa bị bắn)
-            if self.is_within_grid(nx, ny) and (nx, ny) not in self.visited:
-                if gamelogic[nx][ny] in ['O', ' ']:  # Ô khả nghi (chứa tàu hoặc chưa khám phá)
-                    self.stack.append((nx, ny))  # Thêm ô vào ngăn xếp
-
-    def _get_next_position(self, x, y, direction):
-        """
-        Trả về vị trí tiếp theo dựa trên hướng:
-        - 'North': Lên
-        - 'South': Xuống
-        - 'East': Sang phải
-        - 'West': Sang trái
-        """
-        if direction == 'North':
-            return x - 1, y
-        elif direction == 'South':
-            return x + 1, y
-        elif direction == 'East':
-            return x, y + 1
-        elif direction == 'West':
-            return x, y - 1
-        return x, y  # Trả về vị trí ban đầu nếu hướng không hợp lệ
-
-    def is_within_grid(self, x, y):
-        # Kiểm tra xem tọa độ (x, y) có nằm trong lưới (10x10) hay không.
-        return 0 <= x < 10 and 0 <= y < 10
+            TOKENS.append(Tokens(ASSETS['GREENTOKEN'], grid[i][j], 'Miss', None, None, None))
+            ASSETS['SHOTSOUND'].play()
+            ASSETS['MISSSOUND'].play()
+        self.turn = False  # End player's turn
 
-    def draw(self, window):
-        """
-        Hiển thị trạng thái của máy lên màn hình:
-        - Nếu đang ở lượt chơi, hiển thị trạng thái 'Thinking'.
-        """
-        if self.turn:
-            window.blit(self.status, (cGameGrid[0][0][0] - CELLSIZE, cGameGrid[-1][-1][1] + CELLSIZE))
+#Các thuật toán của computer (phần logic nằm trong computers.py)
+class ComputerView:
+    """Phần hiển thị dùng chung cho các máy: trạng thái 'Thinking', token, âm thanh và hẹn giờ lượt."""
+    delay = 1000  # Thời gian (ms) từ khi người chơi bắn đến khi máy bắn; ghi đè ở từng chế độ nếu cần
 
-
-# Quay lui (Backtracking)
-class BTCOMPUTER:
     def __init__(self):
-        # Khởi tạo trạng thái ban đầu của máy tính
-        self.turn = False  # Biến xác định liệu có phải lượt của máy hay không
-        self.status = self.computer_status('Thinking')  # Trạng thái hiển thị của máy
-        self.name = 'Backtracking Computer'  # Tên của máy
-        self.moves = []  # Danh sách các ô cần tấn công theo chiến thuật backtracking
-        self.visited = set()  # Tập hợp các ô đã được bắn
+        super().__init__(ROWS, COLS)
+        # Các khung 'Thinking', 'Thinking.', ... để trạng thái chuyển động trong lúc máy suy nghĩ
+        self.statusFrames = [self.computer_status('Thinking' + '.' * dots) for dots in range(4)]
+        self.status = self.statusFrames[0]  # Trạng thái hiện tại của máy
+        self.pending = None  # Nước đi đang được tính trên luồng nền (Future)
+        self.due = False  # Đã hết thời gian chờ của lượt hiện tại chưa
 
     def computer_status(self, msg):
         """Hiển thị trạng thái của máy."""
-        font = pygame.font.SysFont('Stencil', 22)
-        return font.render(msg, 1, (0, 0, 0))
+        return renderText('Stencil', 22, msg, (0, 0, 0))
 
-    def make_attack(self, gamelogic):
-        """
-        Máy thực hiện lượt tấn công:
-        - Nếu danh sách `self.moves` trống, máy chọn ngẫu nhiên một ô chưa được bắn.
-        - Nếu `self.moves` có ô, thực hiện tấn công theo chiến thuật backtracking.
-        """
-        current_time = pygame.time.get_ticks()  # Lấy thời gian hiện tại
-        if len(self.moves) == 0 and current_time - TURNTIMER >= 1000:
-            # Khi danh sách moves trống, chọn ngẫu nhiên một ô hợp lệ để bắn
-            valid_choice = False
-            while not valid_choice:
-                row, col = random.randint(0, 9), random.randint(0, 9)  # Chọn tọa độ ngẫu nhiên
-                # Kiểm tra ô chưa bắn và có khả năng chứa tàu
-                if (row, col) not in self.visited and gamelogic[row][col] in [' ', 'O']:
-                    valid_choice = True
-            self._process_attack(row, col, gamelogic)  # Cập nhật trạng thái của ô vừa tấn công
-        elif len(self.moves) > 0 and current_time - TURNTIMER >= 1000:
-            # Khi danh sách moves có ô, thực hiện tấn công backtracking
-            row, col = self.moves.pop()  # Lấy ô cuối cùng trong danh sách để bắn
-            self._process_attack(row, col, gamelogic)
-        return self.turn  # Trả về trạng thái lượt chơi của máy
-
-    def _process_attack(self, row, col, gamelogic):
-        """
-        Thực hiện bắn vào ô (row, col) và cập nhật trạng thái:
-        - Nếu bắn trúng tàu, thêm các ô lân cận vào danh sách moves.
-        - Nếu bắn trượt, chỉ cập nhật trạng thái ô đó.
-        """
-        print(f"Attacking: ({row}, {col})")  # Debug vị trí bắn
-        self.visited.add((row, col))  # Đánh dấu ô đã bắn
-        if gamelogic[row][col] == 'O':  # Nếu ô chứa tàu
-            gamelogic[row][col] = 'T'  # Đánh dấu trạng thái ô trúng tàu
-            # Thêm hiệu ứng và âm thanh khi bắn trúng
-            TOKENS.append(Tokens(REDTOKEN, pGameGrid[row][col], 'Hit', FIRETOKENIMAGELIST, EXPLOSIONIMAGELIST, None))
-            SHOTSOUND.play()
-            HITSOUND.play()
-            # Gọi hàm thêm các ô lân cận vào danh sách backtracking
-            self._backtrack_ship(row, col, gamelogic)
-        else:  # Nếu bắn trượt
-            gamelogic[row][col] = 'X'  # Đánh dấu trạng thái ô trượt
-            # Thêm hiệu ứng và âm thanh khi bắn trượt
-            TOKENS.append(Tokens(BLUETOKEN, pGameGrid[row][col], 'Miss', None, None, None))
-            SHOTSOUND.play()
-            MISSSOUND.play()
-        # Kết thúc lượt chơi
-        self.turn = False
-
-    def _backtrack_ship(self, row, col, gamelogic):
+    def schedule(self, gamelogic):
         """
-        Thêm các ô lân cận (theo 4 hướng: Bắc, Nam, Đông, Tây) vào danh sách moves
-        để thực hiện chiến thuật backtracking khi bắn trúng tàu.
+        Bắt đầu lượt của máy mà không chặn vòng lặp chính:
+        - Gửi việc chọn nước đi (trên bản sao bàn cờ) cho AIEXECUTOR; khi xong sẽ đăng sự kiện COMPUTERMOVE.
+        - Hẹn giờ sự kiện COMPUTERTURN sau thời gian chờ (0 khi chạy không màn hình).
+        Máy bắn khi đã nhận cả hai, nên mọi chế độ bắn sau cùng một khoảng thời gian (trừ khi tính lâu hơn).
         """
-        directions = ['North', 'South', 'East', 'West']  # Các hướng để tìm ô lân cận
-        for direction in directions:
-            nx, ny = self._get_next_position(row, col, direction)  # Lấy tọa độ ô lân cận
-            # Kiểm tra ô hợp lệ và chưa được bắn
-            if self.is_within_grid(nx, ny) and (nx, ny) not in self.visited:
-                if gamelogic[nx][ny] in ['O', ' ']:  # Ô khả nghi (chứa tàu hoặc chưa khám phá)
-                    self.moves.append((nx, ny))  # Thêm ô vào danh sách moves
-
-    def _get_next_position(self, x, y, direction):
+        self.turn = True
+        self.due = False
+        self.pending = AIEXECUTOR.submit(self.choose_move, gamelogic.copy())
+        self.pending.add_done_callback(self._post_move)
+        due = pygame.event.Event(COMPUTERTURN, future=self.pending)
+        delay = 0 if HEADLESS else self.delay
+        if delay > 0:
+            pygame.time.set_timer(due, delay, loops=1)
+        else:
+            pygame.event.post(due)
+
+    def _post_move(self, future):
+        """Chạy trên luồng nền khi nước đi đã tính xong."""
+        if not future.cancelled():
+            pygame.event.post(pygame.event.Event(COMPUTERMOVE, future=future))
+
+    def handle_event(self, event, gamelogic):
         """
-        Trả về tọa độ của ô lân cận dựa trên hướng:
-        - 'North': Lên
-        - 'South': Xuống
-        - 'East': Sang phải
-        - 'West': Sang trái
+        Xử lý COMPUTERTURN/COMPUTERMOVE của lượt hiện tại; trả về True khi máy vừa bắn.
+        Sự kiện của lượt đã bị hủy (Redeploy, đổi chế độ) mang Future cũ nên bị bỏ qua.
         """
-        if direction == 'North':
-            return x - 1, y
-        elif direction == 'South':
-            return x + 1, y
-        elif direction == 'East':
-            return x, y + 1
-        elif direction == 'West':
-            return x, y - 1
-        return x, y  # Trường hợp không hợp lệ
-
-    def is_within_grid(self, x, y):
-        """Kiểm tra xem tọa độ (x, y) có nằm trong lưới (10x10) hay không."""
-        return 0 <= x < 10 and 0 <= y < 10
+        if self.pending is None or event.future is not self.pending:
+            return False
+        if event.type == COMPUTERTURN:
+            self.due = True
+        if not (self.due and self.pending.done()):
+            return False
+        future, self.pending = self.pending, None
+        move = future.result()
+        if move is not None:
+            self._process_attack(move[0], move[1], gamelogic)
+        return True
+
+    def cancel(self):
+        """Hủy nước đi đang tính và hẹn giờ của lượt (khi Redeploy hoặc đổi chế độ chơi)."""
+        if self.pending is not None:
+            self.pending.cancel()
+            self.cancel_search()
+            self.pending = None
+        pygame.time.set_timer(COMPUTERTURN, 0)
+
+    def on_shot(self, row, col, result):
+        """Thêm hiệu ứng và âm thanh cho phát bắn vào lưới người chơi (bỏ qua ô đã bắn trước đó)."""
+        if result is None:
+            return
+        if result == 'Hit':
+            TOKENS.append(Tokens(ASSETS['REDTOKEN'], pGameGrid[row][col], 'Hit', ASSETS['FIRETOKENIMAGELIST'], ASSETS['EXPLOSIONIMAGELIST'], None))
+            ASSETS['SHOTSOUND'].play()
+            ASSETS['HITSOUND'].play()
+        else:
+            TOKENS.append(Tokens(ASSETS['BLUETOKEN'], pGameGrid[row][col], 'Miss', None, None, None))
+            ASSETS['SHOTSOUND'].play()
+            ASSETS['MISSSOUND'].play()
 
     def draw(self, window):
         """
         Hiển thị trạng thái của máy lên màn hình:
-        - Nếu máy đang trong lượt chơi, hiển thị trạng thái 'Thinking'.
+        - Nếu đang ở lượt chơi, hiển thị trạng thái 'Thinking' (có dấu chấm chuyển động khi đang tính).
+        - Trả về vùng đã vẽ (hoặc None).
         """
         if self.turn:
-            window.blit(self.status, (cGameGrid[0][0][0] - CELLSIZE, cGameGrid[-1][-1][1] + CELLSIZE))
+            if self.pending is not None:
+                self.status = self.statusFrames[ANIMCLOCK.now // 300 % len(self.statusFrames)]
+            return window.blit(self.status, (cGameGrid[0][0][0] - CELLSIZE, cGameGrid[-1][-1][1] + CELLSIZE))
+        return None
 
-# Tìm kiếm đối kháng
-class ADVCOMPUTER():
-    def __init__(self):
-        # Khởi tạo đối tượng máy tính:
-        self.turn = False
-        self.status = self.computer_status('Thinking')
-        self.name = 'Minimax Computer'
-        self.visited = set()  # Tập các ô đã tấn công
-
-    def computer_status(self, msg):
-        """Render trạng thái của máy tính."""
-        font = pygame.font.SysFont('Stencil', 22)
-        return font.render(msg, 1, (0, 0, 0))
 
-    def make_attack(self, gamelogic):
-        """
-        Máy tính thực hiện tấn công dựa trên thuật toán Minimax:
-        - Duyệt qua tất cả các ô hợp lệ để giả lập nước đi.
-        - Tính điểm của từng nước đi bằng cách gọi hàm Minimax.
-        - Chọn nước đi có điểm cao nhất.
-        """
-        best_score = float('-inf')  # Điểm số tốt nhất ban đầu
-        best_move = None  # Lưu trữ tọa độ nước đi tốt nhất
+class DFSCOMPUTER(ComputerView, computers.DFSCOMPUTER):
+    pass
 
-        # Duyệt qua toàn bộ lưới để tìm nước đi tốt nhất
-        for row in range(10):
-            for col in range(10):
-                if (row, col) not in self.visited and gamelogic[row][col] in [' ', 'O']:
-                    # Giả lập tấn công ô này
-                    original = gamelogic[row][col]
-                    gamelogic[row][col] = 'T' if original == 'O' else 'X'
 
-                    # Tính điểm của nước đi với Minimax
-                    score = self.minimax(gamelogic, 3, False, float('-inf'), float('inf'))
+class BTCOMPUTER(ComputerView, computers.BTCOMPUTER):
+    pass
 
-                    # Hoàn tác thay đổi trên lưới
-                    gamelogic[row][col] = original
 
-                    # Cập nhật nước đi tốt nhất nếu điểm số cao hơn
-                    if score > best_score:
-                        best_score = score
-                        best_move = (row, col)
+class ADVCOMPUTER(ComputerView, computers.ADVCOMPUTER):
+    pass
 
-        # Thực hiện nước đi tốt nhất
-        if best_move:
-            self._process_attack(best_move[0], best_move[1], gamelogic)
 
-        return self.turn
+class GCOMPUTER(ComputerView, computers.GCOMPUTER):
+    pass
 
-    def minimax(self, gamelogic, depth, is_maximizing, alpha, beta):
-        """
-        Thuật toán Minimax với Alpha-Beta Pruning:
-        - Đệ quy duyệt qua các trạng thái của trò chơi.
-        - Tối đa hóa điểm số cho máy tính hoặc tối thiểu hóa điểm số cho đối thủ.
-        - Sử dụng Alpha-Beta để cắt bỏ các nhánh không cần thiết.
-        """
-        # Điều kiện dừng: độ sâu bằng 0 hoặc trò chơi kết thúc
-        if depth == 0 or self.is_game_over(gamelogic):
-            return self.evaluate(gamelogic)
-
-        if is_maximizing:
-            max_eval = float('-inf')  # Giá trị tốt nhất cho máy tính
-            for row in range(10):
-                for col in range(10):
-                    if (row, col) not in self.visited and gamelogic[row][col] in [' ', 'O']:
-                        # Giả lập nước đi
-                        original = gamelogic[row][col]
-                        gamelogic[row][col] = 'T' if original == 'O' else 'X'
-
-                        # Gọi đệ quy Minimax cho đối thủ
-                        eval = self.minimax(gamelogic, depth - 1, False, alpha, beta)
-
-                        # Hoàn tác nước đi
-                        gamelogic[row][col] = original
-
-                        # Cập nhật giá trị tốt nhất và Alpha
-                        max_eval = max(max_eval, eval)
-                        alpha = max(alpha, eval)
-
-                        # Cắt tỉa nếu Beta <= Alpha
-                        if beta <= alpha:
-                            break
-            return max_eval
-        else:
-            # Giả lập đối thủ
-            min_eval = float('inf')  # Giá trị tốt nhất cho đối thủ
-            for row in range(10):
-                for col in range(10):
-                    if (row, col) not in self.visited and gamelogic[row][col] in [' ', 'O']:
-                        # Giả lập nước đi
-                        original = gamelogic[row][col]
-                        gamelogic[row][col] = 'T' if original == 'O' else 'X'
-
-                        # Gọi đệ quy Minimax cho máy tính
-                        eval = self.minimax(gamelogic, depth - 1, True, alpha, beta)
-
-                        # Hoàn tác nước đi
-                        gamelogic[row][col] = original
-
-                        # Cập nhật giá trị tốt nhất và Beta
-                        min_eval = min(min_eval, eval)
-                        beta = min(beta, eval)
-
-                        # Cắt tỉa nếu Beta <= Alpha
-                        if beta <= alpha:
-                            break
-            return min_eval
 
-    def evaluate(self, gamelogic):
-        """
-        Hàm đánh giá trạng thái lưới:
-        - Tính điểm dựa trên số ô đã bắn trúng tàu hoặc bắn trượt.
-        - +10 điểm cho mỗi ô bắn trúng.
-        - -5 điểm cho mỗi ô bắn trượt.
-        """
-        score = 0
-        for row in range(10):
-            for col in range(10):
-                if gamelogic[row][col] == 'T':  # Đánh trúng tàu
-                    score += 10
-                elif gamelogic[row][col] == 'X':  # Trượt
-                    score -= 5
-        return score
-
-    def is_game_over(self, gamelogic):
-        """
-        Kiểm tra xem trò chơi đã kết thúc hay chưa:
-        - Nếu còn ô 'O' (tàu chưa bị bắn trúng), trò chơi chưa kết thúc.
-        """
-        for row in gamelogic:
-            if 'O' in row:
-                return False
-        return True
+class OPTIMALMODE(ComputerView, computers.OPTIMALMODE):
+    def on_shot(self, row, col, result):
+        super().on_shot(row, col, result)
+        if result == 'Miss':
+            print(f"Ma trận xác suất sau khi bắn vào ({row}, {col}):")
+            self.print_probability_matrix()
 
-    def _process_attack(self, row, col, gamelogic):
-        """
-        Xử lý kết quả của nước đi:
-        - Cập nhật trạng thái lưới (đánh trúng hoặc trượt).
-        - Thêm hiệu ứng hình ảnh/sound.
-        """
-        self.visited.add((row, col))
-        print(f"Attacking: ({row}, {col})")
-        if gamelogic[row][col] == 'O':
-            gamelogic[row][col] = 'T'  # Đánh trúng tàu
-            SHOTSOUND.play()
-            HITSOUND.play()
-            TOKENS.append(Tokens(REDTOKEN, pGameGrid[row][col], 'Hit', FIRETOKENIMAGELIST, EXPLOSIONIMAGELIST, None))
-            print("Hit!")
-        else:
-            gamelogic[row][col] = 'X'  # Trượt
-            TOKENS.append(Tokens(BLUETOKEN, pGameGrid[row][col], 'Miss', None, None, None))
-            SHOTSOUND.play()
-            MISSSOUND.play()
-            print("Miss!")
-        self.turn = False  # Kết thúc lượt
 
-    def draw(self, window):
-        """Hiển thị trạng thái của máy tính lên màn hình."""
-        if self.turn:
-            window.blit(self.status, (cGameGrid[0][0][0] - CELLSIZE, cGameGrid[-1][-1][1] + CELLSIZE))
+class MCCOMPUTER(ComputerView, computers.MCCOMPUTER):
+    pass
 
 
-class GCOMPUTER():
-    def __init__(self):
-        # Khởi tạo trạng thái của máy tính
-        self.turn = False
-        self.status = self.computer_status('Thinking')
-        self.name = 'Greedy Computer'
+class NNCOMPUTER(ComputerView, computers.NNCOMPUTER):
+    pass
 
-        # Ma trận xác suất để máy tính quyết định vị trí tấn công, ban đầu phân bổ đều
-        self.probability_matrix = np.full((10, 10), 1 / 100)
 
-    def computer_status(self, msg):
-        """Render trạng thái của máy tính."""
-        font = pygame.font.SysFont('Stencil', 22)
-        return font.render(msg, 1, (0, 0, 0))
-
-    def update_probability(self, x, y, gamelogic, hit):
-        """Cập nhật ma trận xác suất sau khi bắn."""
-        n = self.probability_matrix.shape[0]  # Kích thước ma trận
-        reduction_factor = 0.2  # Hệ số giảm xác suất ở các ô lân cận
-
-        # Đặt xác suất của ô vừa bắn về 0 vì không còn khả năng chứa tàu
-        self.probability_matrix[x, y] = 0
-
-        if hit:  # Nếu bắn trúng tàu
-            # Tăng xác suất các ô lân cận vì khả năng có phần còn lại của tàu
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < n and 0 <= ny < n and gamelogic[nx][ny] not in ['X', 'T']:
-                    self.probability_matrix[nx, ny] += 0.3
-        else:  # Nếu trượt
-            # Giảm xác suất các ô lân cận vì khả năng không có tàu ở đây
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < n and 0 <= ny < n and gamelogic[nx][ny] not in ['X', 'T']:
-                    self.probability_matrix[nx, ny] *= (1 - reduction_factor)
-
-        # Chuẩn hóa lại ma trận xác suất để tổng xác suất = 1
-        total_probability = np.sum(self.probability_matrix)
-        if total_probability > 0:
-            self.probability_matrix /= total_probability
-
-    def choose_next_move(self):
-        """Chọn vị trí bắn tiếp theo dựa trên xác suất cao nhất."""
-        max_prob = np.max(self.probability_matrix)  # Lấy xác suất lớn nhất trong ma trận
-        # Lấy tất cả các ô có xác suất lớn nhất
-        candidates = np.argwhere(self.probability_matrix == max_prob)
-        # Chọn ngẫu nhiên một ô trong danh sách các ô có xác suất cao nhất
-        chosen = random.choice(candidates)
-        return tuple(chosen)
-
-    def make_attack(self, gamelogic):
-        """Thực hiện bước tấn công."""
-        current_time = pygame.time.get_ticks()  # Lấy thời gian hiện tại
-
-        # Nếu đã qua thời gian cần thiết, chọn ô tiếp theo để tấn công
-        if current_time - TURNTIMER >= 1000:
-            row, col = self.choose_next_move()  # Chọn ô dựa trên xác suất cao nhất
-            self._process_attack(row, col, gamelogic)  # Xử lý kết quả tấn công
-
-        return self.turn
-
-    def _process_attack(self, row, col, gamelogic):
-        """Xử lý kết quả của bước tấn công."""
-        print(f"Attacking: ({row}, {col})")  # In vị trí tấn công
-        if gamelogic[row][col] == 'O':  # Nếu đánh trúng tàu
-            gamelogic[row][col] = 'T'  # Đánh dấu ô đó là trúng
-            self.update_probability(row, col, gamelogic, hit=True)  # Cập nhật xác suất
-            # Thêm token trúng tàu và phát âm thanh
-            TOKENS.append(Tokens(REDTOKEN, pGameGrid[row][col], 'Hit', FIRETOKENIMAGELIST, EXPLOSIONIMAGELIST, None))
-            SHOTSOUND.play()
-            HITSOUND.play()
-        else:  # Nếu đánh trượt
-            gamelogic[row][col] = 'X'  # Đánh dấu ô đó là trượt
-            self.update_probability(row, col, gamelogic, hit=False)  # Cập nhật xác suất
-            # Thêm token trượt và phát âm thanh
-            TOKENS.append(Tokens(BLUETOKEN, pGameGrid[row][col], 'Miss', None, None, None))
-            SHOTSOUND.play()
-            MISSSOUND.play()
-
-        self.turn = False  # Kết thúc lượt của máy
+class NRCOMPUTER(ComputerView, computers.NRCOMPUTER):
+    pass
 
-    def draw(self, window):
-        """Vẽ trạng thái của máy trên cửa sổ."""
-        if self.turn:
-            window.blit(self.status, (cGameGrid[0][0][0] - CELLSIZE, cGameGrid[-1][-1][1] + CELLSIZE))
 
 
-class OPTIMALMODE:
-    def __init__(self):
-        self.turn = False  # Biến xác định lượt đi của máy tính.
-        self.status = self.computer_status('Thinking')  # Hiển thị trạng thái hiện tại của máy tính.
-        self.name = 'Optimal Computer'  # Tên chế độ.
-        self.probability_matrix = np.full((10, 10), 1 / 100)  # Ma trận xác suất khởi tạo, tất cả ô có xác suất 1/100.
-        self.moves = []  # Danh sách các nước đi ưu tiên sau khi bắn trúng.
 
-    def computer_status(self, msg):
-        """Render trạng thái cho máy tính."""
-        font = pygame.font.SysFont('Stencil', 22)
-        return font.render(msg, 1, (0, 0, 0))
-
-    def update_probability(self, x, y, gamelogic):
-        """Cập nhật ma trận xác suất sau khi bắn hụt."""
-        reduction_factor = 0.2  # Tỷ lệ giảm xác suất ở các ô lân cận
-        n = self.probability_matrix.shape[0]
-
-        # Đặt xác suất của ô đã bắn về 0
-        self.probability_matrix[x, y] = 0
-
-        # Giảm xác suất ở các ô lân cận chưa bị bắn
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1), (1, 1), (-1, -1), (1, -1), (-1, 1)]:  # Chỉ các ô lân cận
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < n and 0 <= ny < n and gamelogic[nx][ny] not in ['X', 'T']: # Nếu ô chưa bị bắn.
-                self.probability_matrix[nx, ny] *= (1 - reduction_factor)   # Giảm xác suất của ô.
-
-        # Chuẩn hóa lại ma trận để tổng xác suất vẫn bằng 1
-        total_probability = np.sum(self.probability_matrix)
-        if total_probability > 0:
-            self.probability_matrix /= total_probability
-
-        print(f"Ma trận xác suất sau khi bắn vào ({x}, {y}):")
-        self.print_probability_matrix()
-
-    def choose_next_move(self):
-        """Chọn vị trí bắn tiếp theo dựa trên ma trận xác suất."""
-        n = self.probability_matrix.shape[0]  # Kích thước ma trận.
-        flat_probs = self.probability_matrix.flatten()  # Chuyển ma trận thành mảng 1D.
-        index = np.random.choice(range(n * n), p=flat_probs)  # Chọn ngẫu nhiên một ô dựa trên phân phối xác suất.
-        row, col = divmod(index, n)  # Chuyển chỉ số 1D thành tọa độ 2D.
-        return row, col  # Trả về tọa độ của ô được chọn.
-
-    def make_attack(self, gamelogic):
-        """Thực hiện tấn công dựa trên lượt và trạng thái."""
-        current_time = pygame.time.get_ticks()  # Lấy thời gian hiện tại
-
-        # Nếu không có nước đi ưu tiên và đủ thời gian
-        if len(self.moves) == 0 and current_time - TURNTIMER >= 1000:
-            row, col = self.choose_next_move()  # Chọn ô bắn
-            self._process_attack(row, col, gamelogic)  # Thực hiện tấn công
-
-        # Nếu có nước đi ưu tiên
-        elif len(self.moves) > 0 and current_time - TURNTIMER >= 1000:
-            row, col = self.moves[0]  # Lấy nước đi ưu tiên đầu tiên
-            self._process_attack(row, col, gamelogic)  # Thực hiện tấn công
-            self.moves.pop(0)  # Xóa nước đi đã xử lý khỏi danh sách
-
-        return self.turn  # Trả về trạng thái lượt
-
-    def _process_attack(self, row, col, gamelogic):
-        print(f"Attacking: ({row}, {col})")
-        if gamelogic[row][col] == 'O':  # Hit
-            TOKENS.append(Tokens(REDTOKEN, pGameGrid[row][col], 'Hit', FIRETOKENIMAGELIST, EXPLOSIONIMAGELIST, None))
-            gamelogic[row][col] = 'T'
-
-            self.probability_matrix[row, col] = 0 # Xác suất của ô đã bắn được đặt về 0.
-            total_probability = np.sum(self.probability_matrix)
-            if total_probability > 0:
-                self.probability_matrix /= total_probability # Chuẩn hóa ma trận để tổng xác suất = 1.
-
-            SHOTSOUND.play()
-            HITSOUND.play()
-            if any(gamelogic[nx][ny] == 'T' for nx, ny in self.moves):
-                self.generate_moves2((row, col), gamelogic) # Sinh các nước đi ưu tiên dựa trên trục hiện tại của tàu.
-            else:
-                self.generate_moves((row, col), gamelogic) # Sinh các nước đi ưu tiên.
-        else:  # Miss
-            gamelogic[row][col] = 'X'
-            self.update_probability(row, col, gamelogic)
-            TOKENS.append(Tokens(BLUETOKEN, pGameGrid[row][col], 'Miss', None, None, None))
-            SHOTSOUND.play()
-            MISSSOUND.play()
-
-        self.turn = False  # End computer's turn
-
-    def is_within_grid(self, x, y):
-        return 0 <= x < 10 and 0 <= y < 10
-
-    def generate_moves2(self, coords, grid):
-        """Sinh các nước đi ưu tiên sau khi bắn trúng."""
-        x, y = coords  # Lấy tọa độ hiện tại (vị trí đã bắn trúng)
-        directions = []  # Danh sách hướng tấn công khả dĩ
-
-        # Xác định nếu con tàu có trục dọc (North-South)
-        if ((self.is_within_grid(x - 1, y) and grid[x - 1][y] == 'T') or
-                (self.is_within_grid(x + 1, y) and grid[x + 1][y] == 'T')):
-            directions = ['North', 'South']  # Hướng tấn công dọc
-            self.moves = [(r, c) for r, c in self.moves if c == y]  # Lọc danh sách nước đi chỉ giữ lại những ô cùng cột
-
-        # Xác định nếu con tàu có trục ngang (East-West)
-        elif ((self.is_within_grid(x, y - 1) and grid[x][y - 1] == 'T') or
-              (self.is_within_grid(x, y + 1) and grid[x][y + 1] == 'T')):
-            directions = ['East', 'West']  # Hướng tấn công ngang
-            self.moves = [(r, c) for r, c in self.moves if
-                          r == x]  # Lọc danh sách nước đi chỉ giữ lại những ô cùng hàng
-
-        # Tính toán các nước đi tiếp theo dựa trên hướng tấn công
-        for direction in directions:
-            nx, ny = self._get_next_position(x, y, direction)  # Lấy tọa độ của ô tiếp theo theo hướng `direction`
-            if (0 <= nx < 10 and 0 <= ny < 10 and grid[nx][ny] in [' ', 'O'] and
-                    (nx, ny) not in self.moves):  # Kiểm tra nếu ô hợp lệ và chưa bị chọn
-                self.moves.append((nx, ny))  # Thêm vào danh sách nước đi ưu tiên
-
-    def generate_moves(self, coords, grid):
-        """Sinh các nước đi ưu tiên sau khi bắn trúng."""
-        x, y = coords  # Lấy tọa độ hiện tại (vị trí đã bắn trúng)
-        directions = ['North', 'South', 'East', 'West']  # Các hướng tấn công có thể thực hiện
-
-        # Tính toán các nước đi tiếp theo cho từng hướng
-        for direction in directions:
-            nx, ny = self._get_next_position(x, y, direction)  # Lấy tọa độ của ô tiếp theo theo hướng `direction`
-
-            # Kiểm tra ô hợp lệ và chưa bị chọn
-            if (0 <= nx < 10 and 0 <= ny < 10 and grid[nx][ny] in [' ', 'O'] and
-                    (nx, ny) not in self.moves):
-                self.moves.append((nx, ny))  # Thêm vào danh sách nước đi ưu tiên
-
-    def _get_next_position(self, x, y, direction):
-        if direction == 'North':
-            return x - 1, y
-        elif direction == 'South':
-            return x + 1, y
-        elif direction == 'East':
-            return x, y + 1
-        elif direction == 'West':
-            return x, y - 1
-        return x, y  # Default, should never hit here
-
-    def draw(self, window):
-        if self.turn:
-            window.blit(self.status, (cGameGrid[0][0][0] - CELLSIZE, cGameGrid[-1][-1][1] + CELLSIZE))
-
-    def print_probability_matrix(self):
-        print(np.array2string(self.probability_matrix, formatter={'float_kind': lambda x: f"{x:0.4f}"}))
+#  Game Utility Functions
+@lru_cache(maxsize=None)
+def getFont(name, size):
+    """Font dùng chung: SysFont (rất chậm vì phải dò font hệ thống) chỉ được tạo một lần cho mỗi cỡ chữ."""
+    return pygame.font.SysFont(name, size)
 
-# Reinforcement learning (Nhưng chưa chạy được)
-class NRCOMPUTER():
-    def __init__(self):
-        self.turn = False
-        self.status = self.computer_status('Thinking')
-        self.name = 'RL Computer'
-        self.q_table = {}  # Q-Table lưu trữ giá trị Q cho từng trạng thái-hành động
-        self.epsilon = 0.1  # Xác suất khám phá (exploration)
-        self.learning_rate = 0.1  # Hệ số học
-        self.discount_factor = 0.9  # Hệ số chiết khấu (discount factor)
-        self.moves = []
 
-    def computer_status(self, msg):
-        font = pygame.font.SysFont('Stencil', 22)
-        return font.render(msg, 1, (0, 0, 0))
+@lru_cache(maxsize=256)
+def renderText(fontName, size, text, colour, rotation=0):
+    """Surface chữ đã render, lưu theo (font, cỡ, nội dung, màu, góc xoay) để chỉ render lại khi chữ đổi."""
+    textMessage = getFont(fontName, size).render(text, True, colour)
+    if rotation:
+        textMessage = pygame.transform.rotate(textMessage, rotation)
+    return textMessage
 
-    def make_attack(self, gamelogic):
-        """Máy tính thực hiện tấn công dựa trên Q-Learning."""
-        state = self._encode_state(gamelogic)
 
-        # Chọn hành động (tọa độ) dựa trên chính sách ε-greedy
-        if random.uniform(0, 1) < self.epsilon:
-            action = self._random_action(gamelogic)
-        else:
-            action = self._best_action(state, gamelogic)
-
-        # Thực hiện hành động
-        row, col = action
-        reward = self._process_attack(row, col, gamelogic)
-
-        # Cập nhật Q-Table
-        next_state = self._encode_state(gamelogic)
-        self._update_q_table(state, action, reward, next_state)
-
-        return self.turn
-
-    def _random_action(self, gamelogic):
-        """Chọn ngẫu nhiên một ô hợp lệ."""
-        while True:
-            row, col = random.randint(0, 9), random.randint(0, 9)
-            if gamelogic[row][col] in [' ', 'O']:
-                return (row, col)
-
-    def _best_action(self, state, gamelogic):
-        """Chọn hành động tốt nhất dựa trên Q-Table."""
-        if state not in self.q_table:
-            self.q_table[state] = {}  # Khởi tạo Q-values nếu chưa có
-        actions = self.q_table[state]
-
-        # Duyệt qua các hành động hợp lệ
-        best_action = None
-        max_q_value = -float('inf')
-        for row in range(10):
-            for col in range(10):
-                if gamelogic[row][col] in [' ', 'O']:  # Chỉ chọn các ô hợp lệ
-                    q_value = actions.get((row, col), 0)
-                    if q_value > max_q_value:
-                        max_q_value = q_value
-                        best_action = (row, col)
-        return best_action if best_action else self._random_action(gamelogic)
-
-    def _process_attack(self, row, col, gamelogic):
-        """Thực hiện tấn công và trả về phần thưởng."""
-        if gamelogic[row][col] == 'O':  # Hit
-            gamelogic[row][col] = 'T'
-            return 1  # Phần thưởng cho cú đánh trúng
-        else:  # Miss
-            gamelogic[row][col] = 'X'
-            return -1  # Phần thưởng âm cho cú đánh trượt
+class GridGeometry:
+    """
+    Hình học của một lưới ô vuông trên màn hình: đổi pixel <-> ô bằng phép tính số nguyên.
+    Vẫn truy cập được như danh sách tọa độ cũ: grid[row][col] là góc trên trái của ô.
+    """
+    def __init__(self, rows, cols, cellsize, origin):
+        self.rows = rows
+        self.cols = cols
+        self.cellsize = cellsize
+        self.origin = origin
+        self.rect = pygame.Rect(origin, (cols * cellsize, rows * cellsize))  # Toàn bộ lưới
+        self._coords = [[self.cellPos(row, col) for col in range(cols)] for row in range(rows)]
 
-    def _update_q_table(self, state, action, reward, next_state):
-        """Cập nhật giá trị Q-Table theo công thức Q-Learning."""
-        if state not in self.q_table:
-            self.q_table[state] = {}
-        if action not in self.q_table[state]:
-            self.q_table[state][action] = 0
+    def cellPos(self, row, col):
+        """Góc trên trái (pixel) của ô (row, col)."""
+        return (self.origin[0] + col * self.cellsize, self.origin[1] + row * self.cellsize)
 
-        # Giá trị Q hiện tại
-        current_q = self.q_table[state][action]
+    def cellAt(self, pos):
+        """Ô (row, col) chứa điểm pos, hoặc None nếu điểm nằm ngoài lưới."""
+        if not self.rect.collidepoint(pos):
+            return None
+        return ((pos[1] - self.origin[1]) // self.cellsize, (pos[0] - self.origin[0]) // self.cellsize)
 
-        # Giá trị Q tối đa trong trạng thái tiếp theo
-        next_max_q = max(self.q_table.get(next_state, {}).values(), default=0)
+    def cellRect(self, row, col):
+        return pygame.Rect(self.cellPos(row, col), (self.cellsize, self.cellsize))
 
-        # Cập nhật giá trị Q
-        new_q = (1 - self.learning_rate) * current_q + \
-                self.learning_rate * (reward + self.discount_factor * next_max_q)
-        self.q_table[state][action] = new_q
+    #  Giao diện danh sách tọa độ cũ
+    def __getitem__(self, row):
+        return self._coords[row]
 
-    def _encode_state(self, gamelogic):
-        """Mã hóa trạng thái của lưới thành chuỗi để sử dụng trong Q-Table."""
-        return ''.join(''.join(row) for row in gamelogic)
+    def __len__(self):
+        return self.rows
 
-    def draw(self, window):
-        if self.turn:
-            window.blit(self.status, (cGameGrid[0][0][0] - CELLSIZE, cGameGrid[-1][-1][1] + CELLSIZE))
+    def __iter__(self):
+        return iter(self._coords)
 
 
+def createGameGrid(rows, cols, cellsize, pos):
+    """Tạo lưới tọa độ 2D cho từng ô trong lưới."""
+    return GridGeometry(rows, cols, cellsize, pos)
 
 
-#  Game Utility Functions
-def createGameGrid(rows, cols, cellsize, pos):
-    """Tạo danh sách tọa độ 2D cho từng ô trong lưới."""
-    startX, startY = pos
-    coordGrid = []
-    for row in range(rows):
-        rowX = []
-        for col in range(cols):
-            rowX.append((startX, startY))
-            startX += cellsize
-        coordGrid.append(rowX)
-        startX = pos[0]
-        startY += cellsize
-    return coordGrid
-
-
-def createGameLogic(rows, cols):
-    """Khởi tạo lưới trò chơi với các khoảng trống (' ') cho người chơi và máy"""
-    return [[' ' for _ in range(cols)] for _ in range(rows)]
-
-
-def updateGameLogic(coordGrid, shiplist, gamelogic):
-    for i, rowX in enumerate(coordGrid):
-        for j, colX in enumerate(rowX):
-            # Bỏ qua các ô đã bị tấn công hoặc phá hủy
-            if gamelogic[i][j] in {'T', 'X'}:
-                continue
-            # Reset ô hiện tại thành trống
-            gamelogic[i][j] = ' '
-            # Kiểm tra va chạm với từng tàu
-            cell_rect = pygame.Rect(colX[0], colX[1], CELLSIZE, CELLSIZE)
-            if any(cell_rect.colliderect(ship.rect) for ship in shiplist):
-                gamelogic[i][j] = 'O'  # Đánh dấu ô có tàu
+def attachFleet(shiplist, coordGrid, occupancy):
+    """Gắn đội tàu vào lưới và chỉ mục ô của bàn cờ; gamelogic được cập nhật theo từng tàu."""
+    for ship in shiplist:
+        ship.grid = coordGrid
+        ship.occupancy = occupancy
+        ship.updateOccupancy()
 
 
 def showGridOnScreen(window, cellsize, playerGrid, computerGrid):
@@ -1105,12 +715,26 @@ def printGameLogic():
 
 
 def loadImage(path, size, rotate=False):
-    """Tải hình ảnh, chia tỷ lệ và xoay hình ảnh nếu cần."""
-    img = pygame.image.load(path).convert_alpha()
-    img = pygame.transform.scale(img, size)
-    if rotate:
-        img = pygame.transform.rotate(img, -90)
-    return img
+    """Tải hình ảnh, chia tỷ lệ và xoay hình ảnh nếu cần (lấy từ ASSETCACHE nếu đã có)."""
+    def build():
+        img = pygame.image.load(path).convert_alpha()
+        img = pygame.transform.scale(img, size)
+        if rotate:
+            img = pygame.transform.rotate(img, -90)
+        return img
+    return ASSETCACHE.load(f'{path}|{size[0]}x{size[1]}|{rotate}', path, build)
+
+
+@lru_cache(maxsize=None)
+def loadGunImage(path, size):
+    """Hình súng dùng chung cho mọi khẩu súng cùng loại."""
+    return loadImage(path, size, True)
+
+
+@lru_cache(maxsize=None)
+def rotateGunImage(path, size, angle):
+    """Hình súng đã xoay theo góc lượng tử hóa angle; mỗi góc chỉ được xoay một lần."""
+    return pygame.transform.rotate(loadGunImage(path, size), -angle)
 
 
 def loadAnimationImages(path, aniNum,  size):
@@ -1125,12 +749,41 @@ def loadAnimationImages(path, aniNum,  size):
     return imageList
 
 
-def loadSpriteSheetImages(spriteSheet, rows, cols, newSize, size):
-    image = pygame.Surface((128, 128))
-    image.blit(spriteSheet, (0, 0), (rows * size[0], cols * size[1], size[0], size[1]))
-    image = pygame.transform.scale(image, (newSize[0], newSize[1]))
-    image.set_colorkey((0, 0, 0))
-    return image
+@lru_cache(maxsize=None)
+def loadSpriteSheet(path):
+    """Bảng sprite chỉ được giải mã khi có ô chưa nằm trong ASSETCACHE."""
+    return pygame.image.load(path).convert_alpha()
+
+
+def loadSpriteSheetImages(spriteSheetPath, rows, cols, newSize, size):
+    def build():
+        image = pygame.Surface((128, 128))
+        image.blit(loadSpriteSheet(spriteSheetPath), (0, 0), (rows * size[0], cols * size[1], size[0], size[1]))
+        image = pygame.transform.scale(image, (newSize[0], newSize[1]))
+        image.set_colorkey((0, 0, 0))
+        return image
+    key = f'{spriteSheetPath}|{rows},{cols}|{newSize[0]}x{newSize[1]}'
+    return ASSETCACHE.load(key, spriteSheetPath, build, colorkey=(0, 0, 0))
+
+
+def loadExplosionImages(spriteSheetPath):
+    """Cắt bảng sprite vụ nổ 8 x 8 thành các khung hình."""
+    imageList = []
+    for row in range(8):
+        for col in range(8):
+            imageList.append(loadSpriteSheetImages(spriteSheetPath, col, row, (CELLSIZE, CELLSIZE), (128, 128)))
+    return imageList
+
+
+def loadSound(path, volume):
+    sound = pygame.mixer.Sound(path)
+    sound.set_volume(volume)
+    return sound
+
+
+def loadRadarScanner(scanner):
+    scanner.load()
+    return scanner
 
 
 def increaseAnimationImage(imageList, ind):
@@ -1159,63 +812,17 @@ def sortFleet(ship, shiplist):
     shiplist.append(ship)
 
 
-def randomizeShipPositions(shiplist, gamegrid, max_attempts=10):
+def randomizeShipPositions(shiplist, gamegrid):
     """
-    Đặt ngẫu nhiên các tàu trên lưới sử dụng Random Restart Hill Climbing.
+    Đặt ngẫu nhiên các tàu trên lưới: bố trí được sinh đều trên các chỉ số ô (engine.randomLayout),
+    sau đó mới đặt ảnh tàu vào đúng ô, không cần thử va chạm bằng khung hình.
     """
-    placedShips = []  # Danh sách các tàu đã đặt
-    attempts = 0  # Đếm số lần khởi động lại toàn bộ
-
-    while attempts < max_attempts:
-        placedShips.clear()  # Mỗi lần khởi động lại, xóa danh sách tàu đã đặt
-        validPosition = True  # Giả định ban đầu là có thể đặt tất cả các tàu
-
-        # Lặp qua từng tàu trong danh sách
-        for ship in shiplist:
-            shipPlaced = False  # Trạng thái đặt tàu (chưa đặt thành công)
-            retries = 0  # Số lần thử đặt lại cho từng tàu
-
-            # Thử đặt tàu trong tối đa 'max_attempts' lần
-            while not shipPlaced and retries < max_attempts:
-                # Đưa tàu về vị trí mặc định (nếu có xoay trước đó)
-                ship.returnToDefaultPosition()
-
-                # Ngẫu nhiên quyết định xoay tàu (True: xoay ngang, False: giữ dọc)
-                rotateShip = random.choice([True, False])
-                if rotateShip:
-                    # Tính tọa độ ngẫu nhiên sao cho tàu nằm gọn trên lưới
-                    yAxis = random.randint(0, 9)
-                    xAxis = random.randint(0, 9 - (ship.hImage.get_width() // CELLSIZE))
-                    ship.rotateShip(True)  # Xoay tàu sang hướng ngang
-                    ship.rect.topleft = gamegrid[yAxis][xAxis]  # Cập nhật vị trí tàu
-                else:
-                    # Tính tọa độ ngẫu nhiên khi tàu ở hướng dọc
-                    yAxis = random.randint(0, 9 - (ship.vImage.get_height() // CELLSIZE))
-                    xAxis = random.randint(0, 9)
-                    ship.rect.topleft = gamegrid[yAxis][xAxis]  # Cập nhật vị trí tàu
-
-                # Kiểm tra xem tàu có bị chồng chéo với các tàu đã đặt trước đó không
-                if any(ship.rect.colliderect(item.rect) for item in placedShips):
-                    retries += 1  # Nếu chồng chéo, tăng số lần thử
-                else:
-                    # Nếu không chồng chéo, đặt tàu thành công
-                    shipPlaced = True
-                    placedShips.append(ship)  # Thêm tàu vào danh sách đã đặt
-
-            # Nếu không thể đặt tàu sau số lần thử tối đa, dừng vòng lặp và khởi động lại
-            if not shipPlaced:
-                validPosition = False
-                break
-
-        # Nếu tất cả các tàu được đặt thành công, trả về danh sách
-        if validPosition:
-            return placedShips
-
-        # Nếu không thành công, tăng số lần khởi động lại
-        attempts += 1
-
-    # Nếu không thể đặt toàn bộ tàu sau số lần khởi động lại tối đa, báo lỗi
-    raise ValueError("Không thể đặt tất cả các tàu sau số lần thử tối đa!")
+    layout = randomLayout(gamegrid.rows, gamegrid.cols, {ship.name: SHIPLENGTHS[ship.name] for ship in shiplist})
+    for ship in shiplist:  # Gỡ hết tàu khỏi lưới trước để chỉ mục ô không bị chồng tạm thời
+        ship.returnToDefaultPosition()
+    for ship in shiplist:
+        ship.placeCells(layout[ship.name])
+    return shiplist
 
 
 def placeShipsAtFixedPositions(shiplist, gamegrid):
@@ -1252,6 +859,7 @@ def placeShipsAtFixedPositions(shiplist, gamegrid):
 
         # Đặt vị trí cố định cho tàu
         ship.rect.topleft = gamegrid[x][y]
+        ship.snap()
         placed_ships.append(ship)  # Lưu lại tàu đã đặt
 
     # Kiểm tra kết quả sau khi đặt
@@ -1295,6 +903,7 @@ def placeShipsAtSeamlessFixedPositions(shiplist, gamegrid):
 
         # Đặt vị trí cố định cho tàu
         ship.rect.topleft = gamegrid[x][y]
+        ship.snap()
         placed_ships.append(ship)  # Lưu lại tàu đã đặt
 
     # Kiểm tra kết quả sau khi đặt
@@ -1310,65 +919,40 @@ def deploymentPhase(deployment):
         return True
 
 def pick_random_ship_location(gameLogic):
-    """Chọn một vị trí hợp lệ ngẫu nhiên cho một con tàu."""
-    validChoice = False
-    while not validChoice:
-        posX = random.randint(0, 9)
-        posY = random.randint(0, 9)
-        if gameLogic[posX][posY] == ' ':
-            validChoice = True
-    return (posX, posY)
+    """Chọn ngẫu nhiên một ô trống (chưa bắn, không có tàu); None nếu không còn ô nào."""
+    return gameLogic.random_unshot(avoid=gameLogic.cellsWith(SHIP))
 
 
-def displayRadarScanner(imagelist, indnum, SCANNER):
+def displayRadarScanner(scanner, indnum, SCANNER):
     if SCANNER == True and indnum <= 359:
-        image = increaseAnimationImage(imagelist, indnum)
+        image = scanner.frame(indnum)
         return image
     else:
         return False
 
 
 def displayRadarBlip(num, position):
-    if SCANNER:
+    if SCANNER and position is not None:
         image = None
-        if position[0] >= 5 and position[1] >= 5:
+        midRow, midCol = ROWS // 2, COLS // 2  # Góc phần tư của lưới chứa điểm sáng
+        if position[0] >= midRow and position[1] >= midCol:
             if num >= 0 and num <= 90:
-                image = increaseAnimationImage(RADARBLIPIMAGES, num // 10)
-        elif position[0] < 5 and position[1] >= 5:
+                image = increaseAnimationImage(ASSETS['RADARBLIPIMAGES'], num // 10)
+        elif position[0] < midRow and position[1] >= midCol:
             if num > 270 and num <= 360:
-                image = increaseAnimationImage(RADARBLIPIMAGES, (num // 4) // 10)
-        elif position[0] < 5 and position[1] < 5:
+                image = increaseAnimationImage(ASSETS['RADARBLIPIMAGES'], (num // 4) // 10)
+        elif position[0] < midRow and position[1] < midCol:
             if num > 180 and num <= 270:
-                image = increaseAnimationImage(RADARBLIPIMAGES, (num // 3) // 10)
-        elif position[0] >= 5 and position[1] < 5:
+                image = increaseAnimationImage(ASSETS['RADARBLIPIMAGES'], (num // 3) // 10)
+        elif position[0] >= midRow and position[1] < midCol:
             if num > 90 and num <= 180:
-                image = increaseAnimationImage(RADARBLIPIMAGES, (num // 2) // 10)
+                image = increaseAnimationImage(ASSETS['RADARBLIPIMAGES'], (num // 2) // 10)
         return image
 
 
-def takeTurns(p1, p2):
-    """Lượt luân phiên giữa những người chơi."""
-    if p1.turn:
-        p2.turn = False
-    else:
-        p2.turn = True
-        if not p2.make_attack(pGameLogic):
-            p1.turn = True
-
-
-def checkForWinners(grid):
-    validGame = True
-    for row in grid:
-        if 'O' in row:
-            validGame = False
-    return validGame
-
-
 def shipLabelMaker(msg):
     """Tạo tên tàu và xoay dọc"""
-    font = pygame.font.SysFont('Stencil', 22)
-    textMessage = font.render(msg, 1, (255, 200, 15))
-    return pygame.transform.rotate(textMessage, 90)
+    return renderText('Stencil', 22, msg, (255, 200, 15), 90)
 
 
 def displayShipNames(window):
@@ -1382,51 +966,67 @@ def displayShipNames(window):
         startPos += 75
 
 
+def hoveredButton():
+    """Tên nút đang hoạt động nằm dưới con trỏ chuột (nút được phóng to khi di chuột)."""
+    mousePos = pygame.mouse.get_pos()
+    for button in BUTTONS:
+        if button.active and button.rect.collidepoint(mousePos):
+            return button.name
+    return None
+
+
+def playSoundLoop(sound):
+    """Phát lại âm thanh nếu nó chưa đang phát (gọi được ở mọi khung hình)."""
+    if sound.get_num_channels() == 0:
+        sound.play()
+
+
+def drawLoadingProgress(window):
+    """Vẽ thanh tiến trình tải tài nguyên nền; trả về vùng đã vẽ (None khi đã tải xong)."""
+    if ASSETS.done():
+        return None
+    barRect = pygame.Rect(SCREENWIDTH // 2 - 200, SCREENHEIGHT - 20, 400, 10)
+    pygame.draw.rect(window, (20, 20, 20), barRect)
+    pygame.draw.rect(window, (255, 200, 15), (barRect.x, barRect.y, int(barRect.width * ASSETS.progress()), barRect.height))
+    pygame.draw.rect(window, (255, 255, 255), barRect, 1)
+    label = renderText('Stencil', 22, f'Loading {int(ASSETS.progress() * 100)}%', (255, 255, 255))
+    labelRect = window.blit(label, label.get_rect(midright=(barRect.x - 10, barRect.centery)))
+    return barRect.union(labelRect)
+
+
 def mainMenuScreen(window):
     window.fill((0, 0, 0))
-    window.blit(MAINMENUIMAGE, (0, 0))
-    window.blit(TITLEIMAGE, (-15, -90))
-    window.blit(NAME1IMAGE, (500, 5))
+    window.blit(ASSETS['MAINMENUIMAGE'], (0, 0))
+    window.blit(ASSETS['TITLEIMAGE'], (-15, -90))
+    window.blit(ASSETS['NAME1IMAGE'], (500, 5))
 
     for button in BUTTONS:
-        if button.name in ['DFS', 'BackTracking', 'Adversarial', 'Greedy', 'NeuralNetwork','Optimal', 'Instructions']:
+        if button.name in ['DFS', 'BackTracking', 'Adversarial', 'Greedy', 'NeuralNetwork','Optimal', 'MonteCarlo', 'QLearning', 'Instructions']:
             button.active = True
             button.draw(window)
         else:
             button.active = False
-    
-        MENUSOUND.play()
-
-
-
-def deploymentScreen(window):
-    MENUSOUND.stop()
-    WINSOUND.stop()
-    LOSESOUND.stop()
 
 
+def deploymentLayer(window):
+    """Vẽ phần tĩnh của màn hình triển khai: nền, lưới, thân tàu, tên tàu, nút và token tĩnh."""
     window.fill((0, 0, 0))
     
-    window.blit(BACKGROUND, (0, 0))
-    window.blit(PGAMEGRIDIMG, (0, 0))
-    window.blit(CGAMEGRIDIMG, (cGameGrid[0][0][0] - 50, cGameGrid[0][0][1] - 50))
-    window.blit(NAME1IMAGE, (950, 750))
+    window.blit(ASSETS['BACKGROUND'], (0, 0))
+    window.blit(ASSETS['PGAMEGRIDIMG'], (0, 0))
+    window.blit(ASSETS['CGAMEGRIDIMG'], (cGameGrid[0][0][0] - 50, cGameGrid[0][0][1] - 50))
+    window.blit(ASSETS['NAME1IMAGE'], (950, 750))
 
     #  Draws the player and computer grids to the screen
     # showGridOnScreen(window, CELLSIZE, pGameGrid, cGameGrid)
 
-    #  Draw ships to screen
+    #  Draw ships to screen (súng và tàu đang kéo được vẽ ở phần động)
     for ship in pFleet:
-        ship.draw(window)
-        ship.snapToGridEdge(pGameGrid)
-        ship.snapToGrid(pGameGrid)
+        if not ship.active:
+            ship.drawHull(window)
 
     displayShipNames(window)
 
-    for ship in cFleet:
-        ship.snapToGridEdge(cGameGrid)
-        ship.snapToGrid(cGameGrid)
-
     for button in BUTTONS:
         if button.name in ['Randomize','SparseFix','SeamlessFix', 'Reset', 'Start', 'Quit', 'Radar Scan', 'Redeploy']:
             button.active = True
@@ -1434,42 +1034,68 @@ def deploymentScreen(window):
         else:
             button.active = False
 
-    computer.draw(window)
+    TOKENS.drawStatic(window)
 
-    radarScan = displayRadarScanner(RADARGRIDIMAGES, INDNUM, SCANNER)
-    if not radarScan:
-        pass
-    else:
-        window.blit(radarScan, (cGameGrid[0][0][0], cGameGrid[0][0][1]))
-        window.blit(RADARGRID, (cGameGrid[0][0][0], cGameGrid[0][0][1]))
+
+def deploymentScreen(window):
+    ASSETS['MENUSOUND'].stop()
+    ASSETS['WINSOUND'].stop()
+    ASSETS['LOSESOUND'].stop()
+
+    # Lớp tĩnh chỉ vẽ lại khi tàu, nút, token hoặc giai đoạn thay đổi
+    sceneKey = ('Deployment', DEPLOYMENT, hoveredButton(), TOKENS.generation,
+                tuple((ship.name, ship.active or ship.rect.topleft, ship.rotation) for ship in pFleet))
+    if SCREENLAYER.begin(sceneKey):
+        deploymentLayer(SCREENLAYER.static)
+        SCREENLAYER.commit()
+
+    #  Token tĩnh mới được vẽ thẳng vào lớp tĩnh thay vì vẽ lại cả màn hình
+    dirtyRects = []
+    for rect in TOKENS.drawFresh(SCREENLAYER.static):
+        window.blit(SCREENLAYER.static, rect, rect)
+        dirtyRects.append(rect)
+
+    #  Phần động: tàu đang kéo, súng, trạng thái máy, radar và token đang chuyển động
+    for ship in pFleet:
+        if ship.active:
+            dirtyRects.append(ship.drawDragged(window))
+        dirtyRects.extend(ship.drawGuns(window))
+
+    statusRect = computer.draw(window)
+    if statusRect:
+        dirtyRects.append(statusRect)
+
+    radarScan = displayRadarScanner(RADARSCANNER, INDNUM, SCANNER)
+    if radarScan:
+        radarRect = window.blit(radarScan, (cGameGrid[0][0][0], cGameGrid[0][0][1]))
+        window.blit(ASSETS['RADARGRID'], (cGameGrid[0][0][0], cGameGrid[0][0][1]))
+        dirtyRects.append(radarRect)
+        # Token tĩnh nằm dưới radar được vẽ lại lên trên như trước
+        window.blit(TOKENS.overlay, radarRect, radarRect)
 
     RBlip = displayRadarBlip(INDNUM, BLIPPOSITION)
     if RBlip:
-        window.blit(RBlip, (cGameGrid[BLIPPOSITION[0]][BLIPPOSITION[1]][0],
-                            cGameGrid[BLIPPOSITION[0]][BLIPPOSITION[1]][1]))
+        dirtyRects.append(window.blit(RBlip, (cGameGrid[BLIPPOSITION[0]][BLIPPOSITION[1]][0],
+                                              cGameGrid[BLIPPOSITION[0]][BLIPPOSITION[1]][1])))
 
-    for token in TOKENS:
-        token.draw(window)
+    dirtyRects.extend(TOKENS.drawAnimated(window))
 
-    updateGameLogic(pGameGrid, pFleet, pGameLogic)
-    updateGameLogic(cGameGrid, cFleet, cGameLogic)
+    SCREENLAYER.present(dirtyRects)
 
 
 def endScreen(window, win):
     window.fill((0, 0, 0))
 
     if win:
-        window.blit(WINSCREENIMAGE, (0, 0))
-        window.blit(WINIMAGE, (0, -220))
-        WINSOUND.play()
+        window.blit(ASSETS['WINSCREENIMAGE'], (0, 0))
+        window.blit(ASSETS['WINIMAGE'], (0, -220))
     else: 
-        window.blit(LOSESCREENIMAGE, (0, 0))
-        window.blit(LOSEIMAGE, (0, -220))
-        LOSESOUND.play()
+        window.blit(ASSETS['LOSESCREENIMAGE'], (0, 0))
+        window.blit(ASSETS['LOSEIMAGE'], (0, -220))
 
-    window.blit(NAME1IMAGE, (500, 5))
+    window.blit(ASSETS['NAME1IMAGE'], (500, 5))
     for button in BUTTONS:
-        if button.name in ['DFS', 'BackTracking', 'Adversarial', 'Greedy', 'NeuralNetwork', 'Optimal']:
+        if button.name in ['DFS', 'BackTracking', 'Adversarial', 'Greedy', 'NeuralNetwork', 'Optimal', 'MonteCarlo', 'QLearning']:
             button.active = True
             button.draw(window)
         else:
@@ -1477,33 +1103,61 @@ def endScreen(window, win):
 
 
 def updateGameScreen(window, GAMESTATE, win):
-    """Cập nhật màn hình trò chơi dựa trên trạng thái trò chơi hiện tại."""
+    """
+    Cập nhật màn hình trò chơi dựa trên trạng thái trò chơi hiện tại.
+    Màn hình tĩnh chỉ được vẽ lại khi cảnh thay đổi (ví dụ di chuột lên nút);
+    màn hình triển khai chỉ đẩy ra các vùng động đã thay đổi.
+    """
+    ANIMCLOCK.tick()
     if GAMESTATE == 'Main Menu':
-        mainMenuScreen(window)
+        if SCREENLAYER.begin(('Main Menu', hoveredButton())):
+            mainMenuScreen(SCREENLAYER.static)
+            SCREENLAYER.commit()
+        playSoundLoop(ASSETS['MENUSOUND'])
+        progressRect = drawLoadingProgress(window)
+        SCREENLAYER.present([progressRect] if progressRect else [])
     elif GAMESTATE == 'Deployment':
         deploymentScreen(window)
     elif GAMESTATE == 'Game Over':
-        endScreen(window, win)
-    pygame.display.update()
+        if SCREENLAYER.begin(('Game Over', win, hoveredButton())):
+            endScreen(SCREENLAYER.static, win)
+            SCREENLAYER.commit()
+        playSoundLoop(ASSETS['WINSOUND'] if win else ASSETS['LOSESOUND'])
+        SCREENLAYER.present([])
 
 
 #  Game Settings and Variables
 SCREENWIDTH = 1260
 SCREENHEIGHT = 800
+FPS = 60  # Số khung hình tối đa mỗi giây
 ROWS = 10
 COLS = 10
 CELLSIZE = 50
+GUNSTEP = 3  # Bước góc (độ) khi xoay súng theo chuột; súng chỉ được xoay lại khi vượt qua một bước
+RADARSTEP = 1  # Bước góc (độ) của vệt quét radar; tăng lên để dựng ít khung hình hơn
+RADARSWEEPMS = 6000  # Thời gian (ms) một vòng quét radar 360 độ
+EXPLOSIONFRAMEMS = 16  # Thời gian (ms) mỗi khung của vụ nổ
+FIREFRAMEMS = 100  # Thời gian (ms) mỗi khung của ngọn lửa
+HEADLESS = os.environ.get('SDL_VIDEODRIVER') == 'dummy'  # Chạy không màn hình: máy bắn ngay, không chờ
+COMPUTERTURN = pygame.event.custom_type()  # Hết thời gian chờ trước phát bắn của máy
+COMPUTERMOVE = pygame.event.custom_type()  # Máy đã tính xong nước đi trên luồng nền
 DEPLOYMENT = True
 SCANNER = False
 INDNUM = 0
+RADARSWEEP = None  # Hoạt ảnh góc quét của lần quét radar hiện tại
+DRAGSHIP = None  # Tàu đang được kéo trong giai đoạn triển khai
 BLIPPOSITION = None
-TURNTIMER = pygame.time.get_ticks()
 GAMESTATE = 'Main Menu'
+AIEXECUTOR = ThreadPoolExecutor(max_workers=1)  # Luồng nền tính nước đi của máy
 
 
 #  Pygame Display Initialization
 GAMESCREEN = pygame.display.set_mode((SCREENWIDTH, SCREENHEIGHT))
 pygame.display.set_caption('Battle Ship')
+CLOCK = pygame.time.Clock()
+ANIMCLOCK = AnimationClock(pygame.time.get_ticks)  # Đồng hồ chung của mọi hoạt ảnh
+SCREENLAYER = ScreenLayer(GAMESCREEN)
+ASSETCACHE = AssetCache('assets/.cache/images.bin')  # Hình ảnh đã chia tỷ lệ sẵn từ lần chạy trước
 
 
 #  Game Lists/Dictionaries
@@ -1525,73 +1179,76 @@ FLEET = {
 }
 STAGE = ['Main Menu', 'Deployment', 'Game Over']
 
+#  Loading Game Sounds and Images
+#  Ưu tiên 0: màn hình chính, 1: màn hình triển khai, 2: hoạt ảnh (lửa, vụ nổ) và màn hình kết thúc
+ASSETS = AssetLoader()
+ASSETS.add('MAINMENUIMAGE', 0, lambda: loadImage('assets/images/background/battleshipmenu2.jpg', (SCREENWIDTH, SCREENHEIGHT)))
+ASSETS.add('TITLEIMAGE', 0, lambda: loadImage('assets/images/background/title2.png', (SCREENWIDTH, SCREENHEIGHT)))
+ASSETS.add('NAME1IMAGE', 0, lambda: loadImage('assets/images/background/NAME1.png', (270, 20)))
+ASSETS.add('BUTTONIMAGE1', 0, lambda: loadImage('assets/images/buttons/buttonvip.png', (250, 100)))
+ASSETS.add('MENUSOUND', 0, lambda: loadSound('assets/sounds/menu.mp3', 0.1))
+ASSETS.add('INSIMAGE', 0, lambda: loadImage('assets/images/background/instruction.png', (SCREENWIDTH, SCREENHEIGHT)))
+ASSETS.add('NAMEIMAGE', 0, lambda: loadImage('assets/images/background/NAME.png', (270, 70)))
+ASSETS.add('BACKGROUND', 1, lambda: loadImage('assets/images/background/bgongame4.png', (SCREENWIDTH, SCREENHEIGHT)))
+ASSETS.add('PGAMEGRIDIMG', 1, lambda: loadImage('assets/images/grids/NEWgrid.png', ((ROWS + 1) * CELLSIZE, (COLS + 1) * CELLSIZE)))
+ASSETS.add('CGAMEGRIDIMG', 1, lambda: loadImage('assets/images/grids/comp_grid.png', ((ROWS + 1) * CELLSIZE, (COLS + 1) * CELLSIZE)))
+ASSETS.add('BUTTONIMAGE', 1, lambda: loadImage('assets/images/buttons/newbutton.png', (150, 50)))
+ASSETS.add('REDTOKEN', 1, lambda: loadImage('assets/images/tokens/BanTrung.png', (CELLSIZE, CELLSIZE)))
+ASSETS.add('GREENTOKEN', 1, lambda: loadImage('assets/images/tokens/BanHut.png', (CELLSIZE, CELLSIZE)))
+ASSETS.add('BLUETOKEN', 1, lambda: loadImage('assets/images/tokens/Hut2.png', (CELLSIZE, CELLSIZE)))
+ASSETS.add('RADARGRID', 1, lambda: loadImage('assets/images/grids/grid_faint.png', ((ROWS) * CELLSIZE, (COLS) * CELLSIZE)))
+ASSETS.add('HITSOUND', 1, lambda: loadSound('assets/sounds/explosion.wav', 0.05))
+ASSETS.add('SHOTSOUND', 1, lambda: loadSound('assets/sounds/gunshot.wav', 0.05))
+ASSETS.add('MISSSOUND', 1, lambda: loadSound('assets/sounds/splash.wav', 0.05))
+ASSETS.add('FIRETOKENIMAGELIST', 2, lambda: loadAnimationImages('assets/images/tokens/fireloop/fire1_ ', 13, (CELLSIZE, CELLSIZE)))
+ASSETS.add('EXPLOSIONIMAGELIST', 2, lambda: loadExplosionImages('assets/images/tokens/explosion/explosion.png'))
+ASSETS.add('RADARBLIPIMAGES', 2, lambda: loadAnimationImages('assets/images/radar_blip/Blip_', 11, (50, 50)))
+ASSETS.add('LOSEIMAGE', 2, lambda: loadImage('assets/images/background/youlose.png', (SCREENWIDTH, SCREENHEIGHT)))
+ASSETS.add('WINIMAGE', 2, lambda: loadImage('assets/images/background/youwin.png', (SCREENWIDTH, SCREENHEIGHT)))
+ASSETS.add('LOSESCREENIMAGE', 2, lambda: loadImage('assets/images/background/newlose.png', (SCREENWIDTH, SCREENHEIGHT)))
+ASSETS.add('WINSCREENIMAGE', 2, lambda: loadImage('assets/images/background/newwin.png', (SCREENWIDTH, SCREENHEIGHT)))
+ASSETS.add('LOSESOUND', 2, lambda: loadSound('assets/sounds/lose.mp3', 0.1))
+ASSETS.add('WINSOUND', 2, lambda: loadSound('assets/sounds/victory.mp3', 0.1))
+RADARSCANNER = RadarScanner('assets/images/radar_base/radar_anim', (ROWS * CELLSIZE, COLS * CELLSIZE),
+                            step=RADARSTEP)
+# Radar chỉ được dựng ở lần bấm 'Radar Scan' đầu tiên (không nằm trong luồng tải nền)
+ASSETS.addLazy('RADARSCANNER', lambda: loadRadarScanner(RADARSCANNER))
+# Ghi các hình ảnh mới dựng để lần khởi động sau bỏ qua giải mã PNG
+ASSETS.start(onFinish=ASSETCACHE.save)
+
+BUTTONS = [
+    Button(ASSETS['BUTTONIMAGE'], (150, 50), (725, 600), 'Randomize'),
+    Button(ASSETS['BUTTONIMAGE'], (150, 50), (725, 680), 'SparseFix'),
+    Button(ASSETS['BUTTONIMAGE'], (150, 50), (900, 680), 'SeamlessFix'),
+    Button(ASSETS['BUTTONIMAGE'], (150, 50), (900, 600), 'Reset'),
+    Button(ASSETS['BUTTONIMAGE'], (150, 50), (1075, 600), 'Start'),
+    Button(ASSETS['BUTTONIMAGE1'], (250, 100), (40, SCREENHEIGHT // 2 + 160), 'DFS'),
+    Button(ASSETS['BUTTONIMAGE1'], (250, 100), (350, SCREENHEIGHT // 2 + 160), 'BackTracking'),
+    Button(ASSETS['BUTTONIMAGE1'], (250, 100), (660, SCREENHEIGHT // 2 + 160), 'Adversarial'),
+    Button(ASSETS['BUTTONIMAGE1'], (250, 100), (970, SCREENHEIGHT // 2 + 160), 'Greedy'),
+    Button(ASSETS['BUTTONIMAGE1'], (250, 100), (40, SCREENHEIGHT // 2 + 275), 'NeuralNetwork'),
+    Button(ASSETS['BUTTONIMAGE1'], (250, 100), (350, SCREENHEIGHT // 2 + 275), 'Optimal'),
+    Button(ASSETS['BUTTONIMAGE1'], (250, 100), (660, SCREENHEIGHT // 2 + 275), 'MonteCarlo'),
+    Button(ASSETS['BUTTONIMAGE1'], (250, 100), (970, SCREENHEIGHT // 2 + 275), 'QLearning'),
+]
+TOKENS = TokenLayer((SCREENWIDTH, SCREENHEIGHT))
+
 #  Loading Game Variables
 pGameGrid = createGameGrid(ROWS, COLS, CELLSIZE, (50, 50))
 pGameLogic = createGameLogic(ROWS, COLS)
 pFleet = createFleet()
+pOccupancy = Occupancy(pGameLogic)  # Chỉ mục ô -> tàu, cập nhật khi tàu được đặt/xoay/đưa về chỗ cũ
+attachFleet(pFleet, pGameGrid, pOccupancy)
 
 cGameGrid = createGameGrid(ROWS, COLS, CELLSIZE, (SCREENWIDTH - (ROWS * CELLSIZE), 50))
 cGameLogic = createGameLogic(ROWS, COLS)
 cFleet = createFleet()
+cOccupancy = Occupancy(cGameLogic)
+attachFleet(cFleet, cGameGrid, cOccupancy)
 randomizeShipPositions(cFleet, cGameGrid)
 
 printGameLogic()
 
-#  Loading Game Sounds and Images
-MAINMENUIMAGE = loadImage('assets/images/background/battleshipmenu2.jpg', (SCREENWIDTH, SCREENHEIGHT))
-TITLEIMAGE = loadImage('assets/images/background/title2.png', (SCREENWIDTH, SCREENHEIGHT))
-INSIMAGE = loadImage('assets/images/background/instruction.png', (SCREENWIDTH, SCREENHEIGHT))
-NAMEIMAGE = loadImage('assets/images/background/NAME.png', (270, 70))
-NAME1IMAGE = loadImage('assets/images/background/NAME1.png', (270, 20))
-LOSEIMAGE = loadImage('assets/images/background/youlose.png', (SCREENWIDTH, SCREENHEIGHT))
-WINIMAGE = loadImage('assets/images/background/youwin.png', (SCREENWIDTH, SCREENHEIGHT))
-LOSESCREENIMAGE = loadImage('assets/images/background/newlose.png', (SCREENWIDTH, SCREENHEIGHT))
-WINSCREENIMAGE = loadImage('assets/images/background/newwin.png', (SCREENWIDTH, SCREENHEIGHT))
-BACKGROUND = loadImage('assets/images/background/bgongame4.png', (SCREENWIDTH, SCREENHEIGHT))
-PGAMEGRIDIMG = loadImage('assets/images/grids/NEWgrid.png', ((ROWS + 1) * CELLSIZE, (COLS + 1) * CELLSIZE))
-CGAMEGRIDIMG = loadImage('assets/images/grids/comp_grid.png', ((ROWS + 1) * CELLSIZE, (COLS + 1) * CELLSIZE))
-BUTTONIMAGE = loadImage('assets/images/buttons/newbutton.png', (150, 50))
-BUTTONIMAGE1 = loadImage('assets/images/buttons/buttonvip.png', (250, 100))
-BUTTONS = [
-    Button(BUTTONIMAGE, (150, 50), (725, 600), 'Randomize'),
-    Button(BUTTONIMAGE, (150, 50), (725, 680), 'SparseFix'),
-    Button(BUTTONIMAGE, (150, 50), (900, 680), 'SeamlessFix'),
-    Button(BUTTONIMAGE, (150, 50), (900, 600), 'Reset'),
-    Button(BUTTONIMAGE, (150, 50), (1075, 600), 'Start'),
-    Button(BUTTONIMAGE1, (250, 100), (170, SCREENHEIGHT // 2 + 160), 'DFS'),
-    Button(BUTTONIMAGE1, (250, 100), (500, SCREENHEIGHT // 2 + 160), 'BackTracking'),
-    Button(BUTTONIMAGE1, (250, 100), (830, SCREENHEIGHT // 2 + 160), 'Adversarial'),
-    Button(BUTTONIMAGE1, (250, 100), (170, SCREENHEIGHT // 2 + 275), 'Greedy'),
-    Button(BUTTONIMAGE1, (250, 100), (500, SCREENHEIGHT // 2 + 275), 'NeuralNetwork'),
-    Button(BUTTONIMAGE1, (250, 100), (830, SCREENHEIGHT // 2 + 275), 'Optimal'),
-]
-REDTOKEN = loadImage('assets/images/tokens/BanTrung.png', (CELLSIZE, CELLSIZE))
-GREENTOKEN = loadImage('assets/images/tokens/BanHut.png', (CELLSIZE, CELLSIZE))
-BLUETOKEN = loadImage('assets/images/tokens/Hut2.png', (CELLSIZE, CELLSIZE))
-FIRETOKENIMAGELIST = loadAnimationImages('assets/images/tokens/fireloop/fire1_ ', 13, (CELLSIZE, CELLSIZE))
-EXPLOSIONSPRITESHEET = pygame.image.load('assets/images/tokens/explosion/explosion.png').convert_alpha()
-EXPLOSIONIMAGELIST = []
-for row in range(8):
-    for col in range(8):
-        EXPLOSIONIMAGELIST.append(loadSpriteSheetImages(EXPLOSIONSPRITESHEET, col, row, (CELLSIZE, CELLSIZE), (128, 128)))
-TOKENS = []
-RADARGRIDIMAGES = loadAnimationImages('assets/images/radar_base/radar_anim', 360, (ROWS * CELLSIZE, COLS * CELLSIZE))
-RADARBLIPIMAGES = loadAnimationImages('assets/images/radar_blip/Blip_', 11, (50, 50))
-RADARGRID = loadImage('assets/images/grids/grid_faint.png', ((ROWS) * CELLSIZE, (COLS) * CELLSIZE))
-HITSOUND = pygame.mixer.Sound('assets/sounds/explosion.wav')
-HITSOUND.set_volume(0.05)
-SHOTSOUND = pygame.mixer.Sound('assets/sounds/gunshot.wav')
-SHOTSOUND.set_volume(0.05)
-MISSSOUND = pygame.mixer.Sound('assets/sounds/splash.wav')
-MISSSOUND.set_volume(0.05)
-MENUSOUND = pygame.mixer.Sound('assets/sounds/menu.mp3')
-MENUSOUND.set_volume(0.1)
-LOSESOUND = pygame.mixer.Sound('assets/sounds/lose.mp3')
-LOSESOUND.set_volume(0.1)
-WINSOUND = pygame.mixer.Sound('assets/sounds/victory.mp3')
-WINSOUND.set_volume(0.1)
-
-
 #  Initialise Players
 player1 = Player()
 computer = DFSCOMPUTER()
@@ -1603,23 +1260,45 @@ while True:
     for event in pygame.event.get():
         # Nếu sự kiện là đóng cửa sổ (QUIT), thoát chương trình
         if event.type == pygame.QUIT:
+            AIEXECUTOR.shutdown(wait=False, cancel_futures=True)
             pygame.quit()
             sys.exit()
 
+        # Lượt của máy: hết thời gian chờ hoặc đã tính xong nước đi
+        elif event.type in (COMPUTERTURN, COMPUTERMOVE):
+            if computer.handle_event(event, pGameLogic):
+                if computer.turn:  # Máy chưa bắn được (không còn ô hợp lệ): thử lại
+                    computer.schedule(pGameLogic)
+                else:
+                    player1.turn = True
+
+        # Tàu đang kéo đi theo chuột
+        elif event.type == pygame.MOUSEMOTION:
+            if DRAGSHIP:
+                DRAGSHIP.dragTo(event.pos)
+
+        # Khi đang kéo tàu, mọi cú nhấn chuột chỉ dùng để thả hoặc xoay tàu đó
+        elif event.type == pygame.MOUSEBUTTONDOWN and DRAGSHIP:
+            if event.button == 1 and DRAGSHIP.drop():  # Chuột trái: thả tàu nếu không va chạm
+                DRAGSHIP = None
+            elif event.button == 3:  # Chuột phải: xoay tàu
+                DRAGSHIP.dragRotate(event.pos)
+
         # Nếu sự kiện là nhấn chuột
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:  # Chuột trái
                 if DEPLOYMENT:  # Trong giai đoạn triển khai
-                    for ship in pFleet:  # Kiểm tra tất cả các tàu trong đội tàu của người chơi
-                        if ship.rect.collidepoint(pygame.mouse.get_pos()):  # Nếu chuột nằm trên một tàu
-                            ship.active = True  # Đặt tàu này thành hoạt động
-                            sortFleet(ship, pFleet)  # Sắp xếp lại đội tàu
-                            ship.selectShipAndMove()  # Kích hoạt chế độ chọn và di chuyển tàu
+                    for ship in reversed(pFleet):  # Tàu vẽ sau (nằm trên) được chọn trước
+                        if ship.rect.collidepoint(event.pos):  # Nếu chuột nằm trên một tàu
+                            DRAGSHIP = ship
+                            sortFleet(ship, pFleet)  # Đưa tàu lên trên cùng
+                            ship.startDrag(event.pos)  # Bắt đầu kéo tàu theo chuột
+                            break
                 else:  # Nếu không phải giai đoạn triển khai
                     if player1.turn:  # Kiểm tra lượt chơi của người chơi 1
                         player1.make_attack(cGameGrid, cGameLogic)  # Người chơi 1 tấn công
                         if not player1.turn:  # Nếu lượt chuyển sang máy tính
-                            TURNTIMER = pygame.time.get_ticks()  # Đặt thời gian bắt đầu lượt máy tính
+                            computer.schedule(pGameLogic)  # Hẹn giờ lượt của máy
 
                 # Xử lý khi nhấn vào các nút giao diện
                 for button in BUTTONS:
@@ -1627,20 +1306,29 @@ while True:
                         if button.name == 'Start' and button.active:
                             DEPLOYMENT = deploymentPhase(DEPLOYMENT)  # Bắt đầu giai đoạn triển khai
                         elif button.name == 'Redeploy' and button.active:
+                            computer.cancel()  # Bỏ nước đi máy đang tính dở
+                            if not player1.turn:  # Lượt của máy bắt đầu lại từ đầu
+                                computer.schedule(pGameLogic)
                             DEPLOYMENT = deploymentPhase(DEPLOYMENT)  # Triển khai lại đội hình
                         elif button.name == 'Quit' and button.active:
+                            AIEXECUTOR.shutdown(wait=False, cancel_futures=True)
                             pygame.quit()  # Thoát game
                             sys.exit()
                         elif button.name == 'Radar Scan' and button.active:
+                            ASSETS['RADARSCANNER']  # Dựng radar ở lần bấm đầu tiên
                             SCANNER = True  # Bật chế độ quét radar
                             INDNUM = 0  # Khởi tạo số đếm chỉ số radar
+                            RADARSWEEP = Animation(range(360), RADARSWEEPMS / 360, ANIMCLOCK.now)  # Một độ mỗi khung
                             BLIPPOSITION = pick_random_ship_location(cGameLogic)  # Chọn vị trí ngẫu nhiên để quét
                         # Xử lý các chế độ chơi máy tính khác nhau
                         elif (button.name == 'DFS' or button.name == 'BackTracking' or
                               button.name == 'Adversarial' or button.name == 'Greedy' or
                               button.name == 'NeuralNetwork'or
-                              button.name == 'Optimal' or button.name == 'Instructions' ) and button.active:
+                              button.name == 'Optimal' or button.name == 'MonteCarlo' or
+                              button.name == 'QLearning' or
+                              button.name == 'Instructions' ) and button.active:
                             # Khởi tạo máy tính phù hợp với chế độ được chọn
+                            computer.cancel()  # Bỏ nước đi của máy cũ nếu đang tính dở
                             if button.name == 'DFS':
                                 computer = DFSCOMPUTER()
                             elif button.name == 'BackTracking':
@@ -1650,9 +1338,17 @@ while True:
                             elif button.name == 'Greedy':
                                 computer = GCOMPUTER()
                             elif button.name == 'NeuralNetwork':
-                                computer = NRCOMPUTER()
+                                computer = NNCOMPUTER()
+                                if not computer.load():  # Trọng số do policytraining.py huấn luyện sẵn
+                                    print(f"Chưa có trọng số tại {computer.weights}: chạy python policytraining.py để huấn luyện")
                             elif button.name == 'Optimal':
                                 computer = OPTIMALMODE()
+                            elif button.name == 'MonteCarlo':
+                                computer = MCCOMPUTER()
+                            elif button.name == 'QLearning':
+                                computer = NRCOMPUTER()
+                                if not computer.load():  # Bảng Q do qtraining.py huấn luyện sẵn
+                                    print(f"Chưa có bảng Q tại {computer.checkpoint}: chạy python qtraining.py để huấn luyện")
                             # Nếu trạng thái trò chơi kết thúc, thiết lập lại trò chơi
                             if GAMESTATE == 'Game Over':
                                 TOKENS.clear()
@@ -1660,10 +1356,13 @@ while True:
                                     ship.returnToDefaultPosition()
                                 randomizeShipPositions(cFleet, cGameGrid)
                                 pGameLogic = createGameLogic(ROWS, COLS)
-                                updateGameLogic(pGameGrid, pFleet, pGameLogic)
+                                pOccupancy.rebind(pGameLogic)
                                 cGameLogic = createGameLogic(ROWS, COLS)
-                                updateGameLogic(cGameGrid, cFleet, cGameLogic)
+                                cOccupancy.rebind(cGameLogic)
                                 DEPLOYMENT = deploymentPhase(DEPLOYMENT)
+                                player1.turn = True  # Ván mới bắt đầu bằng lượt của người chơi
+                            elif not player1.turn:  # Máy mới tiếp tục lượt đang dở của máy cũ
+                                computer.schedule(pGameLogic)
                             GAMESTATE = STAGE[1]  # Cập nhật trạng thái trò chơi
                         button.handle_action()  # Thực hiện hành động của nút
 
@@ -1676,12 +1375,13 @@ while True:
                         if ship.rect.collidepoint(pygame.mouse.get_pos()):  # Nếu chuột nằm trên một tàu
                             if not ship.checkForRotateCollisions(pFleet):  # Nếu không có va chạm khi xoay
                                 ship.rotateShip(True)  # Xoay tàu
+                                ship.snap()
 
     # Cập nhật giao diện màn hình trò chơi
     updateGameScreen(GAMESCREEN, GAMESTATE, p1win)
 
     if SCANNER:  # Nếu đang ở chế độ quét radar
-        INDNUM += 1  # Tăng chỉ số radar
+        INDNUM = RADARSWEEP.index(ANIMCLOCK.now)  # Góc radar theo thời gian đã trôi qua
 
     # Kiểm tra các trạng thái trò chơi để chuyển đổi
     if GAMESTATE == 'Deployment' and not DEPLOYMENT:  # Nếu hoàn tất triển khai
@@ -1693,5 +1393,4 @@ while True:
             p1win = False
             GAMESTATE = STAGE[2]  # Cập nhật trạng thái thành máy tính chiến thắng
 
-    # Thực hiện lượt chơi luân phiên giữa người chơi và máy tính
-    takeTurns(player1, computer)
+    CLOCK.tick(FPS)  # Giới hạn số khung hình để không chiếm 100% CPU
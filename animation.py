@@ -0,0 +1,60 @@
+"""
+Hoạt ảnh theo thời gian thực thay vì theo số vòng lặp.
+
+Mọi hoạt ảnh đọc cùng một đồng hồ AnimationClock (ms), được cập nhật một lần mỗi khung
+hình. Khung hình hiện tại của một Animation chỉ phụ thuộc vào thời gian đã trôi qua nên
+tốc độ hoạt ảnh giống nhau ở mọi tốc độ khung hình; khi máy chậm, các khung bị bỏ qua
+thay vì làm chậm cả hoạt ảnh.
+"""
+
+
+class AnimationClock:
+    """Đồng hồ chung cho mọi hoạt ảnh; ticks() trả về thời gian hiện tại tính bằng ms."""
+
+    def __init__(self, ticks):
+        self.ticks = ticks
+        self.now = ticks()
+
+    def tick(self):
+        """Chốt thời gian cho khung hình hiện tại để mọi hoạt ảnh dùng chung một mốc."""
+        self.now = self.ticks()
+        return self.now
+
+
+class Animation:
+    """
+    Chuỗi khung hình frames, mỗi khung kéo dài frameMs mili giây, bắt đầu tại start.
+    - loop: lặp lại từ đầu khi hết khung.
+    - then: hoạt ảnh tiếp theo chạy ngay khi hoạt ảnh này kết thúc (ví dụ vụ nổ -> lửa).
+    Hoạt ảnh không lặp và không có then sẽ dừng ở khung cuối.
+    """
+
+    def __init__(self, frames, frameMs, start, loop=False, then=None):
+        self.frames = frames
+        self.frameMs = frameMs
+        self.start = start
+        self.loop = loop
+        self.then = then
+
+    @property
+    def duration(self):
+        return len(self.frames) * self.frameMs
+
+    def index(self, now):
+        """Số khung đã trôi qua kể từ khi bắt đầu (không giới hạn bởi số khung)."""
+        return int(max(0, now - self.start) // self.frameMs)
+
+    def finished(self, now):
+        return not self.loop and now - self.start >= self.duration
+
+    def frame(self, now):
+        """Khung hình tại thời điểm now."""
+        index = self.index(now)
+        if index < len(self.frames):
+            return self.frames[index]
+        if self.loop:
+            return self.frames[index % len(self.frames)]
+        if self.then is not None:
+            self.then.start = self.start + self.duration
+            return self.then.frame(now)
+        return self.frames[-1]
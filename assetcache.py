@@ -0,0 +1,137 @@
+"""
+Bộ nhớ đệm trên đĩa cho hình ảnh đã được chia tỷ lệ sẵn.
+
+Khi khởi động, game giải mã và chia tỷ lệ hàng trăm tệp PNG (nền, tàu, khung lửa,
+blip, 64 ô của bảng sprite vụ nổ...). Lần chạy đầu, các pixel đã chia tỷ lệ được ghi
+vào một tệp đóng gói duy nhất; các lần sau tệp này được ánh xạ bộ nhớ (mmap) và mỗi
+Surface được dựng thẳng từ các byte đó, bỏ qua giải mã PNG và chia tỷ lệ.
+
+Cấu trúc tệp:
+    MAGIC | độ dài chỉ mục (8 byte, little-endian) | chỉ mục JSON | dữ liệu pixel
+
+Mỗi mục trong chỉ mục được khóa theo (đường dẫn nguồn, kích thước đích, biến đổi)
+và lưu mtime/kích thước của tệp nguồn: mục sẽ bị bỏ qua khi ảnh gốc thay đổi.
+"""
+import json
+import mmap
+import os
+import threading
+
+import pygame
+
+MAGIC = b'BSASSET1'
+HEADERSIZE = len(MAGIC) + 8
+
+
+def sourceStamp(path):
+    """Dấu của tệp nguồn (mtime_ns, số byte) để phát hiện ảnh gốc đã thay đổi."""
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class AssetCache:
+    """Tệp đệm đóng gói chứa pixel RGBA/RGB đã chia tỷ lệ của các Surface."""
+
+    def __init__(self, path):
+        self.path = path
+        self.index = {}  # khóa -> {'source', 'stamp', 'offset', 'size', 'format', 'colorkey'}
+        self.data = None  # memoryview trên vùng dữ liệu pixel của tệp (mmap)
+        self.pending = {}  # khóa -> (mục chỉ mục, bytes) của các Surface mới dựng
+        self._file = None
+        self._mmap = None
+        self.lock = threading.Lock()  # load() và save() có thể chạy trên luồng tải nền
+        self._open()
+
+    def _open(self):
+        """Ánh xạ tệp đệm vào bộ nhớ; tệp hỏng hoặc khác phiên bản bị coi như chưa có."""
+        try:
+            self._file = open(self.path, 'rb')
+        except OSError:
+            return
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._mmap[:len(MAGIC)] != MAGIC:
+                raise ValueError('sai định dạng')
+            indexSize = int.from_bytes(self._mmap[len(MAGIC):HEADERSIZE], 'little')
+            self.index = json.loads(self._mmap[HEADERSIZE:HEADERSIZE + indexSize])
+            self.data = memoryview(self._mmap)[HEADERSIZE + indexSize:]
+        except (ValueError, OSError):
+            self.close()
+            self.index = {}
+
+    def close(self):
+        if self.data is not None:
+            self.data.release()
+            self.data = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def load(self, key, source, build, colorkey=None):
+        """
+        Trả về Surface cho khóa key:
+        - Lấy từ tệp đệm nếu mục còn khớp với tệp nguồn source.
+        - Ngược lại gọi build() để dựng Surface và ghi nhận để lưu ở lần save() tới.
+        Surface có colorkey được lưu dạng RGB và gắn lại colorkey khi tải.
+        """
+        stamp = sourceStamp(source)
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is not None and entry['stamp'] == stamp and key not in self.pending:
+                start = entry['offset']
+                width, height = entry['size']
+                pixels = self.data[start:start + width * height * len(entry['format'])]
+                image = pygame.image.frombuffer(pixels, (width, height), entry['format'])
+                if entry['colorkey'] is None:
+                    return image.convert_alpha()
+                image = image.convert()
+                image.set_colorkey(entry['colorkey'])
+                return image
+
+        image = build()
+        pixelFormat = 'RGBA' if colorkey is None else 'RGB'
+        entry = {'source': source, 'stamp': stamp, 'size': list(image.get_size()),
+                 'format': pixelFormat, 'colorkey': colorkey}
+        with self.lock:
+            self.pending[key] = (entry, pygame.image.tobytes(image, pixelFormat))
+        return image
+
+    def save(self):
+        """Ghi lại tệp đệm nếu có Surface mới; các mục cũ còn hợp lệ được giữ nguyên."""
+        with self.lock:
+            self._save()
+
+    def _save(self):
+        if not self.pending:
+            return
+        chunks, index, offset = [], {}, 0
+        for key, entry in self.index.items():
+            if key in self.pending or not os.path.exists(entry['source']):
+                continue
+            width, height = entry['size']
+            end = entry['offset'] + width * height * len(entry['format'])
+            chunks.append(bytes(self.data[entry['offset']:end]))
+            index[key] = dict(entry, offset=offset)
+            offset += len(chunks[-1])
+        for key, (entry, pixels) in self.pending.items():
+            chunks.append(pixels)
+            index[key] = dict(entry, offset=offset)
+            offset += len(pixels)
+
+        header = json.dumps(index).encode()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'wb') as cacheFile:
+            cacheFile.write(MAGIC)
+            cacheFile.write(len(header).to_bytes(8, 'little'))
+            cacheFile.write(header)
+            for chunk in chunks:
+                cacheFile.write(chunk)
+        # Các Surface đang dùng đã được convert nên có thể đóng vùng mmap cũ trước khi thay tệp
+        self.close()
+        os.replace(temporary, self.path)
+        self.pending.clear()
+        self._open()
@@ -0,0 +1,70 @@
+"""
+Tải tài nguyên (hình ảnh, âm thanh) trên một luồng nền theo thứ tự ưu tiên.
+
+Mỗi tài nguyên được đăng ký bằng tên, mức ưu tiên (số nhỏ được tải trước) và hàm tải.
+Màn hình có thể hiện ngay trong khi luồng nền làm việc; ASSETS['TÊN'] chỉ chờ đúng
+tài nguyên đó: nếu luồng nền chưa bắt đầu tải nó thì luồng gọi tự tải luôn.
+Tài nguyên đăng ký bằng addLazy không được tải nền mà chỉ được tạo khi dùng lần đầu.
+"""
+import threading
+import traceback
+
+
+class AssetLoader:
+    """Bộ tải tài nguyên nền; truy cập kết quả như dict: loader['MAINMENUIMAGE']."""
+
+    def __init__(self):
+        self.tasks = []  # (ưu tiên, thứ tự đăng ký, tên)
+        self.loaders = {}  # tên -> hàm tải
+        self.locks = {}  # tên -> khóa, bảo đảm mỗi tài nguyên chỉ được tải một lần
+        self.assets = {}  # tên -> tài nguyên đã tải
+        self.thread = None
+
+    def add(self, name, priority, load):
+        """Đăng ký tài nguyên name; load() được gọi đúng một lần để tạo ra nó."""
+        self.tasks.append((priority, len(self.tasks), name))
+        self.loaders[name] = load
+        self.locks[name] = threading.Lock()
+
+    def addLazy(self, name, load):
+        """Đăng ký tài nguyên name chỉ được tải ở lần truy cập ASSETS[name] đầu tiên (không tải nền)."""
+        self.loaders[name] = load
+        self.locks[name] = threading.Lock()
+
+    def start(self, onFinish=None):
+        """Bắt đầu luồng nền; onFinish() được gọi trên luồng đó sau khi tải xong mọi thứ."""
+        self.thread = threading.Thread(target=self._run, args=(onFinish,), name='AssetLoader', daemon=True)
+        self.thread.start()
+
+    def _run(self, onFinish):
+        for _, _, name in sorted(self.tasks):
+            try:
+                self._load(name)
+            except Exception:
+                # Luồng gọi ASSETS[name] sẽ thử tải lại và nhận lỗi này
+                traceback.print_exc()
+        if onFinish is not None:
+            onFinish()
+
+    def _load(self, name):
+        with self.locks[name]:
+            if name not in self.assets:
+                self.assets[name] = self.loaders[name]()
+            return self.assets[name]
+
+    def __getitem__(self, name):
+        asset = self.assets.get(name)
+        if asset is None:
+            asset = self._load(name)
+        return asset
+
+    def _loaded(self):
+        """Số tài nguyên tải nền đã tải xong."""
+        return sum(name in self.assets for _, _, name in self.tasks)
+
+    def progress(self):
+        """Tỷ lệ tài nguyên tải nền đã tải xong (0.0 - 1.0)."""
+        return self._loaded() / len(self.tasks) if self.tasks else 1.0
+
+    def done(self):
+        return self._loaded() == len(self.tasks)
@@ -0,0 +1,478 @@
+"""
+Mô phỏng theo lô: N ván được giữ trong các mảng NumPy xếp chồng và cùng tiến một phát bắn mỗi bước.
+
+Bàn cờ của cả lô là các mảng bool (N, rows * cols) cho tàu và ô chưa bắn. Mỗi bước, thuật
+toán chọn một ô cho mọi ván bằng các phép toán trên cả mảng (không có vòng lặp Python theo ván),
+lô bắn đồng loạt rồi bỏ các ván đã thắng ra khỏi mảng. Dùng cho các đợt đánh giá nhiều ván
+(tournament.py) thay cho việc chạy từng ván bằng các lớp trong computers.py.
+
+Các thuật toán có bản theo lô:
+- BatchGreedy: GCOMPUTER (tăng/giảm xác suất 4 ô lân cận rồi chuẩn hóa).
+- BatchDFS, BatchBacktracking: DFSCOMPUTER, BTCOMPUTER (ngăn xếp của mọi ván trong một mảng).
+- BatchQLearning: NRCOMPUTER (bảng Q của mẫu lân cận tra cho mọi ô).
+- BatchDensity: OPTIMALMODE (mật độ vị trí đặt tàu, tính bằng phép nhân với ma trận vị trí đặt).
+- BatchNeuralNetwork: NNCOMPUTER (chỉ chạy lại mạng trên cửa sổ quanh phát bắn vừa rồi).
+
+Mỗi bước xử lý cả lưới của mọi ván nên chỉ dành cho lưới nhỏ (tới montecarlo.MAXCELLS ô);
+trên lưới lớn các lớp trong computers.py cập nhật tăng dần và nhanh hơn.
+"""
+from collections import Counter
+
+import numpy as np
+
+from computers import NNCOMPUTER, NRCOMPUTER, PATTERNOFFSETS, PATTERNS
+from density import HITWEIGHT
+from engine import ROWS, COLS, SHIPLENGTHS
+from montecarlo import placementMatrix
+from policynet import RADIUS, WINDOW, UNKNOWN, HITCELL, MISSCELL, PolicyNetwork, boardFeatures, emptyStates
+from qtraining import UNKNOWN as PATTERNUNKNOWN, HITCELL as PATTERNHIT, MISSCELL as PATTERNMISS, patternCodes
+
+
+FEWGAMES = 32  # Dưới số ván này, các vòng lặp dời từng ô chuyển sang tìm trong một lượt
+
+
+def gather(array, rows, columns):
+    """array[rows, columns] của mảng 2 chiều qua chỉ số phẳng (nhanh hơn nhiều so với chỉ số theo hai trục)."""
+    return array.reshape(-1)[rows * array.shape[1] + columns]
+
+
+def scatter(array, rows, columns, values):
+    """Gán array[rows, columns] = values qua chỉ số phẳng (xem gather)."""
+    np.put(array, rows * array.shape[1] + columns, values)
+
+
+class BatchGames:
+    """N bàn cờ xếp chồng; các ván đã thắng được bỏ khỏi mảng khi đủ nhiều (xem compact)."""
+
+    def __init__(self, ships):
+        count, self.rows, self.cols = ships.shape
+        self.ships = ships.reshape(count, -1).astype(bool)
+        self.unshot = np.ones_like(self.ships)
+        self.remaining = self.ships.sum(axis=1)
+        self.ids = np.arange(count)  # Chỉ số ban đầu của các ván còn trong mảng
+        self.shots = np.zeros(count, dtype=np.int64)  # Số phát bắn của từng ván (theo chỉ số ban đầu)
+
+    def __len__(self):
+        return len(self.ids)
+
+    # Ô trúng và ô trượt chỉ BatchDensity cần nên được tính khi dùng thay vì cập nhật ở mỗi phát bắn
+    @property
+    def hits(self):
+        return self.ships & ~self.unshot
+
+    @property
+    def misses(self):
+        return ~(self.ships | self.unshot)
+
+    def fire(self, actions):
+        """
+        Mỗi ván bắn vào ô actions[i] (chỉ số row * cols + col); trả về mảng bool trúng/trượt.
+        Như engine.Game, bắn lại ô đã bắn vẫn tính một phát nhưng không đổi bàn cờ (trả về trượt).
+        """
+        everyone = np.arange(len(actions))
+        hit = gather(self.unshot, everyone, actions) & gather(self.ships, everyone, actions)
+        scatter(self.unshot, everyone, actions, False)
+        self.shots[self.ids] += self.remaining > 0  # Ván đã thắng nhưng chưa bị bỏ không tính thêm phát
+        self.remaining -= hit
+        return hit
+
+    def compact(self):
+        """
+        Bỏ các ván đã chìm hết tàu khi chúng chiếm từ 1/8 lô trở lên (sao chép mọi mảng ở mỗi bước
+        tốn hơn việc chơi tiếp vài ván đã xong); trả về mặt nạ các ván giữ lại, hoặc None nếu không bỏ.
+        """
+        keep = self.remaining > 0
+        finished = len(keep) - np.count_nonzero(keep)
+        if finished == 0 or finished < len(keep) // 8:
+            return None
+        for name in ('ships', 'unshot', 'remaining', 'ids'):
+            setattr(self, name, getattr(self, name)[keep])
+        return keep
+
+
+class BatchStrategy:
+    """Lớp cơ sở cho thuật toán theo lô; trạng thái theo từng ván nằm trong các mảng tên ở arrays."""
+    arrays = ()
+    # Số ván tối đa chơi cùng lúc (xem playBatch): thuật toán có ít phép tính mỗi ván cần lô lớn để chia
+    # đều chi phí cố định của mỗi lệnh NumPy, thuật toán nặng cần lô nhỏ để mảng trạng thái nằm trong cache
+    lotSize = 1000
+
+    def __init__(self, rows=ROWS, cols=COLS, rng=None):
+        self.rows = rows
+        self.cols = cols
+        # 4 ô lân cận (Bắc, Nam, Đông, Tây) của mỗi ô; ô ngoài lưới được thay bằng chính ô đó
+        row, col = np.divmod(np.arange(rows * cols)[:, None], cols)
+        self.neighbors = np.clip(row + [-1, 1, 0, 0], 0, rows - 1) * cols + np.clip(col + [0, 0, 1, -1], 0, cols - 1)
+        # Lấy seed từ np.random để np.random.seed(...) vẫn làm kết quả lặp lại được
+        self.rng = rng or np.random.default_rng(np.random.randint(2 ** 32))
+
+    def start(self, games):
+        """Khởi tạo trạng thái cho lô ván mới (lớp con gọi lại hàm này)."""
+        # Khóa ngẫu nhiên cố định của từng ô để phá thế hòa, như khóa random.random() trong hàng đợi
+        # ưu tiên của các lớp ở computers.py; rút một lần thay vì rút cả lưới mới ở mỗi bước
+        self.keys = self.rng.random((len(games), self.rows * self.cols), dtype=np.float32)
+
+    def choose(self, games):
+        """Chọn ô bắn (chỉ số row * cols + col) cho mọi ván: mảng (số ván,)."""
+        raise NotImplementedError
+
+    def observe(self, games, actions, hit):
+        """Cập nhật trạng thái sau khi cả lô bắn vào actions."""
+
+    def compact(self, keep):
+        """Giữ lại trạng thái của các ván còn chơi."""
+        self.keys = self.keys[keep]
+        for name in self.arrays:
+            setattr(self, name, getattr(self, name)[keep])
+
+    def _best(self, values, allowed):
+        """Ô có giá trị lớn nhất trong mặt nạ allowed của mỗi ván; hòa thì chọn ngẫu nhiên theo khóa của ô."""
+        values = np.where(allowed, values, -np.inf)
+        best = values == values.max(axis=1, keepdims=True)
+        return np.argmax(np.where(best, self.keys, -1), axis=1)
+
+    def _random(self, allowed):
+        """Một ô ngẫu nhiên trong mặt nạ allowed của mỗi ván (ván không có ô nào trả về ô bất kỳ)."""
+        return np.argmax(np.where(allowed, self.keys, -1), axis=1)
+
+
+class BatchGreedy(BatchStrategy):
+    """
+    GCOMPUTER theo lô. Như bản từng ván, xác suất thật = giá trị lưu * scale nên chuẩn hóa chỉ cập nhật
+    total và scale. Cột j của values là ô order[i, j] (thứ tự ngẫu nhiên của từng ván): np.argmax lấy
+    cột đầu tiên khi hòa nên chọn ngẫu nhiên đều giữa các ô hòa mà chỉ cần một lượt qua mảng.
+    """
+    arrays = ('order', 'columns', 'values', 'total', 'scale')
+    lotSize = 5000
+    reduction_factor = 0.2  # Hệ số giảm xác suất ở các ô lân cận khi bắn trượt
+
+    def start(self, games):
+        super().start(games)
+        count, cells = len(games), self.rows * self.cols
+        self.order = np.argsort(self.keys, axis=1).astype(np.int32)
+        self.columns = np.argsort(self.order, axis=1).astype(np.int32)  # Cột của từng ô
+        self.values = np.full((count, cells), 1 / cells)
+        self.total = np.ones(count)  # Tổng giá trị lưu của mỗi ván
+        self.scale = np.ones(count)
+
+    def choose(self, games):
+        # Ô đã bắn có xác suất 0, ô chưa bắn luôn dương nên không cần mặt nạ
+        return gather(self.order, np.arange(len(games)), np.argmax(self.values, axis=1))
+
+    def observe(self, games, actions, hit):
+        everyone = np.arange(len(actions))
+        values = self.values
+        # Đặt xác suất của ô vừa bắn về 0
+        shot = gather(self.columns, everyone, actions)
+        self.total -= gather(values, everyone, shot)
+        scatter(values, everyone, shot, 0.0)
+        # 4 ô lân cận; ô ngoài lưới là chính ô vừa bắn (đã bắn) nên không thay đổi
+        neighbors = self.neighbors[actions]
+        everyone = everyone[:, None]
+        unshot = gather(games.unshot, everyone, neighbors)
+        columns = gather(self.columns, everyone, neighbors)
+        current = gather(values, everyone, columns)
+        updated = np.where(hit[:, None], current + 0.3 / self.scale[:, None], current * (1 - self.reduction_factor))
+        updated = np.where(unshot, updated, current)
+        scatter(values, everyone, columns, updated)
+        self.total += (updated - current).sum(axis=1)
+        # Chuẩn hóa lại để tổng xác suất của mỗi ván = 1
+        np.divide(1, self.total, out=self.scale, where=self.total > 0)
+
+
+class BatchStack(BatchStrategy):
+    """
+    Cơ sở cho DFSCOMPUTER và BTCOMPUTER theo lô: ngăn xếp của ván i là size[i] ô đầu của hàng
+    stack[i]; khi ngăn xếp rỗng, ván bắn ô chưa bắn kế tiếp theo thứ tự cursor của lớp con (xem _next).
+    Các vòng lặp chỉ xử lý các ván cần thay đổi nên chi phí mỗi bước gần như chỉ là vài phép gom chỉ số.
+    """
+    arrays = ('stack', 'size', 'cursor')
+    lotSize = 5000
+
+    def start(self, games):
+        super().start(games)
+        count = len(games)
+        # Mỗi phát trúng đẩy tối đa 4 ô và chỉ có remaining phát trúng nên ngăn xếp không bao giờ đầy
+        self.stack = np.zeros((count, 4 * int(games.remaining.max(initial=0)) + 1), dtype=np.int32)
+        self.size = np.zeros(count, dtype=np.intp)
+        self.cursor = np.zeros(count, dtype=np.intp)
+
+    def _next(self, games):
+        """Ô chưa bắn kế tiếp theo cursor của mỗi ván (chỉ dời cursor của các ván có ngăn xếp rỗng)."""
+        raise NotImplementedError
+
+    def _top(self):
+        """Ô ở đỉnh ngăn xếp của mỗi ván (ván có ngăn xếp rỗng trả về ô bất kỳ)."""
+        return gather(self.stack, np.arange(len(self.size)), np.maximum(self.size - 1, 0))
+
+    def observe(self, games, actions, hit):
+        self.size -= self.size > 0  # Ván có ngăn xếp vừa bắn ô ở đỉnh ngăn xếp
+        self._pushNeighbors(games, actions, hit)
+
+    def _dropShot(self, games):
+        """Bỏ các ô đã bắn ở đỉnh ngăn xếp (bản sao của ô được đẩy nhiều lần) của mỗi ván."""
+        pending = np.flatnonzero(self.size)
+        while True:
+            pending = pending[~gather(games.unshot, pending, gather(self.stack, pending, self.size[pending] - 1))]
+            if len(pending) <= FEWGAMES:
+                break
+            self.size[pending] -= 1
+            pending = pending[self.size[pending] > 0]
+        if len(pending):
+            # Ô chưa bắn cao nhất trong ngăn xếp của các ván còn lại, tìm trong một lượt
+            depth = np.arange(self.stack.shape[1])
+            valid = gather(games.unshot, pending[:, None], self.stack[pending]) & (depth < self.size[pending, None])
+            self.size[pending] = np.where(valid.any(axis=1), len(depth) - np.argmax(valid[:, ::-1], axis=1), 0)
+
+    def _pushNeighbors(self, games, actions, hit):
+        """Đẩy các ô lân cận (Bắc, Nam, Đông, Tây) trong lưới, chưa bắn của ô vừa bắn trúng vào ngăn xếp."""
+        hitGames = np.flatnonzero(hit)[:, None]
+        # Ô lân cận ngoài lưới là chính ô vừa bắn nên không được đẩy
+        cell = self.neighbors[actions[hitGames[:, 0]]]
+        push = gather(games.unshot, hitGames, cell)
+        # Các ô được đẩy của một ván nằm liên tiếp từ size theo thứ tự hướng
+        slot = self.size[hitGames] + np.cumsum(push, axis=1) - 1
+        scatter(self.stack, np.broadcast_to(hitGames, push.shape)[push], slot[push], cell[push])
+        self.size[hitGames[:, 0]] += push.sum(axis=1)
+
+
+class BatchDFS(BatchStack):
+    """DFSCOMPUTER theo lô: bỏ qua các ô đã bắn ở đỉnh ngăn xếp; lấy các ô của lưới từ ô cuối về ô đầu."""
+
+    def _next(self, games):
+        # cursor đếm từ ô cuối: vị trí p là ô rows * cols - 1 - p
+        cells = self.rows * self.cols
+        pending = np.flatnonzero((self.size == 0) & (games.remaining > 0))
+        pending = pending[~gather(games.unshot, pending, cells - 1 - self.cursor[pending])]
+        if len(pending):
+            # Ô chưa bắn kế tiếp của các ván có ô ở con trỏ đã bị bắn (qua ngăn xếp), tìm trong một lượt
+            unshot = games.unshot[pending, ::-1] & (np.arange(cells) >= self.cursor[pending, None])
+            self.cursor[pending] = np.argmax(unshot, axis=1)
+        return cells - 1 - self.cursor
+
+    def choose(self, games):
+        self._dropShot(games)
+        return np.where(self.size > 0, self._top(), self._next(games))
+
+
+class BatchBacktracking(BatchStack):
+    """
+    BTCOMPUTER theo lô: như bản từng ván, bỏ qua các ô đã bắn ở đỉnh ngăn xếp rồi bắn ô ở đỉnh.
+    Ngăn xếp rỗng thì bắn ô chưa bắn kế tiếp trong một thứ tự ngẫu nhiên của lưới:
+    phần chưa lấy của thứ tự không phụ thuộc các ô đã bắn nên ô đó ngẫu nhiên đều như random_unshot.
+    """
+    arrays = BatchStack.arrays + ('order',)
+
+    def start(self, games):
+        super().start(games)
+        self.order = np.argsort(self.keys, axis=1).astype(np.int32)
+
+    def _next(self, games):
+        everyone = np.arange(len(games))
+        pending = everyone[(self.size == 0) & (games.remaining > 0)]
+        while True:
+            pending = pending[~gather(games.unshot, pending, gather(self.order, pending, self.cursor[pending]))]
+            if len(pending) <= FEWGAMES:
+                break
+            self.cursor[pending] += 1
+        if len(pending):
+            # Ô chưa bắn kế tiếp của các ván còn lại, tìm trong một lượt
+            positions = np.arange(self.rows * self.cols)
+            unshot = gather(games.unshot, pending[:, None], self.order[pending])
+            self.cursor[pending] = np.argmax(unshot & (positions >= self.cursor[pending, None]), axis=1)
+        return gather(self.order, everyone, self.cursor)
+
+    def choose(self, games):
+        self._dropShot(games)
+        return np.where(self.size > 0, self._top(), self._next(games))
+
+
+class BatchQLearning(BatchStrategy):
+    """
+    NRCOMPUTER theo lô. Như bản từng ván, ô tốt nhất trong các ô có ô đã bắn ở gần (near) được so với
+    một ô ngẫu nhiên chưa có ô đã bắn ở gần. Mã mẫu lân cận (codes) và Q (values) của mọi ô được cập
+    nhật tăng dần: mỗi phát bắn chỉ đổi một chữ số của 8 ô nhìn thấy ô vừa bắn.
+    """
+    arrays = ('codes', 'values', 'near')
+
+    def __init__(self, rows=ROWS, cols=COLS, rng=None):
+        super().__init__(rows, cols, rng)
+        self.q_table = np.zeros(PATTERNS)
+        # Ô thấy ô s ở vị trí thứ k của mẫu lân cận là s - PATTERNOFFSETS[k] (-1 nếu ngoài lưới)
+        row, col = np.divmod(np.arange(rows * cols)[:, None], cols)
+        offsets = np.array(PATTERNOFFSETS)
+        row, col = row - offsets[:, 0], col - offsets[:, 1]
+        self.watchers = np.where((row >= 0) & (row < rows) & (col >= 0) & (col < cols), row * cols + col, -1)
+        self.digits = 3 ** np.arange(len(PATTERNOFFSETS), dtype=np.int32)
+
+    def load(self, path=None):
+        """Nạp bảng Q từ checkpoint; trả về False (giữ bảng hiện tại) nếu không có checkpoint hợp lệ."""
+        player = NRCOMPUTER(self.rows, self.cols)
+        if not player.load(path):
+            return False
+        self.q_table = player.q_table
+        return True
+
+    def start(self, games):
+        super().start(games)
+        count = len(games)
+        # Mã mẫu lân cận của bàn cờ trống (ô lân cận ngoài lưới = trượt), giống nhau cho mọi ván
+        states = np.full((1, self.rows + 4, self.cols + 4), PATTERNMISS, dtype=np.int8)
+        states[:, 2:-2, 2:-2] = PATTERNUNKNOWN
+        self.codes = np.tile(patternCodes(states, self.rows, self.cols), (count, 1))
+        self.values = self.q_table[self.codes]
+        self.near = np.zeros((count, self.rows * self.cols), dtype=bool)
+
+    def choose(self, games):
+        count = len(games)
+        everyone = np.arange(count)
+        near = self.near & games.unshot
+        far = games.unshot & ~self.near
+        best, fresh = self._best(self.values, near), self._random(far)
+        bestValue = np.where(near.any(axis=1), gather(self.values, everyone, best), -np.inf)
+        freshValue = np.where(far.any(axis=1), gather(self.values, everyone, fresh), -np.inf)
+        # Hòa thì chọn ngẫu nhiên một trong hai ô
+        pickBest = (bestValue > freshValue) | ((bestValue == freshValue) & (self.rng.random(count) < 0.5))
+        return np.where(pickBest, best, fresh)
+
+    def observe(self, games, actions, hit):
+        watchers = self.watchers[actions]
+        inside = watchers >= 0
+        # 8 ô thấy ô vừa bắn của một ván là 8 ô khác nhau nên cộng qua chỉ số phẳng không bị trùng
+        flat = (np.arange(len(actions))[:, None] * self.codes.shape[1] + watchers)[inside]
+        digit = np.where(hit, PATTERNHIT, PATTERNMISS)[:, None] * self.digits
+        codes = self.codes.reshape(-1)
+        codes[flat] += digit[inside]
+        np.put(self.values, flat, self.q_table[codes[flat]])
+        np.put(self.near, flat, True)
+
+
+class BatchDensity(BatchStrategy):
+    """
+    OPTIMALMODE theo lô: mật độ của mỗi ô là tổng trọng số các vị trí đặt tàu phủ lên ô đó
+    (0 nếu vị trí chạm ô trượt, HITWEIGHT ** số ô trúng nếu không), giống density.DensityTargeter.
+    Số ô trúng/trượt của mọi vị trí đặt và mật độ là hai phép nhân với ma trận vị trí đặt
+    (montecarlo.placementMatrix) cho cả lô.
+    """
+
+    def __init__(self, rows=ROWS, cols=COLS, rng=None, shiplengths=SHIPLENGTHS):
+        super().__init__(rows, cols, rng)
+        lengths = sorted(Counter(shiplengths.values()).items())
+        matrices = [placementMatrix(rows, cols, length) for length, _ in lengths]
+        self.placements = np.concatenate(matrices)
+        self.counts = np.concatenate([np.full(len(matrix), count, dtype=np.float32)
+                                      for (_, count), matrix in zip(lengths, matrices)])
+        # Mã của vị trí đặt = số ô trúng + missCode * số ô trượt; mã từ missCode trở lên có trọng số 0
+        self.missCode = max(length for length, _ in lengths) + 1
+        codes = np.arange(self.missCode * self.missCode)
+        self.powers = np.where(codes < self.missCode, HITWEIGHT ** np.minimum(codes, self.missCode), 0)
+        self.powers = self.powers.astype(np.float32)
+
+    def density(self, games):
+        """Bản đồ mật độ (số ván, rows, cols) theo các ô trúng/trượt hiện tại."""
+        # Số ô trúng và ô trượt của mọi vị trí đặt trong cùng một phép nhân (số nguyên nhỏ, float32 chính xác)
+        codes = (games.hits + np.float32(self.missCode) * games.misses) @ self.placements.T
+        weight = self.counts * self.powers[codes.astype(np.intp)]
+        return (weight @ self.placements).reshape(len(games), self.rows, self.cols)
+
+    def choose(self, games):
+        return self._best(self.density(games).reshape(len(games), -1), games.unshot)
+
+
+class BatchNeuralNetwork(BatchStrategy):
+    """
+    NNCOMPUTER theo lô. Đầu vào one-hot nên tiền kích hoạt lớp đầu của một ô là tổng đóng góp của
+    từng ô trong cửa sổ của nó: mảng hidden giữ giá trị này cho mọi ô của mọi ván, mỗi phát bắn chỉ
+    cộng phần chênh lệch vào các ô trong cửa sổ quanh nó rồi chạy lại các lớp sau trên các ô đó
+    (chỉ các ô trong lưới chưa bắn: giá trị của ô viền và ô đã bắn không bao giờ được dùng lại).
+    """
+    # hidden không bị thu gọn khi bỏ ván (mảng lớn): slots là hàng trong hidden của các ván còn chơi
+    arrays = ('slots', 'logits')
+    lotSize = 500
+
+    def __init__(self, rows=ROWS, cols=COLS, rng=None, network=None):
+        super().__init__(rows, cols, rng)
+        self.network = network or PolicyNetwork()
+        # Cửa sổ được tính trên lưới có viền RADIUS ô để không phải cắt chỉ số; ô (row + 2R - a, col + 2R - b)
+        # của lưới có viền thấy phát bắn (row, col) ở vị trí p = a * WINDOW + b của cửa sổ
+        self.width = cols + 2 * RADIUS
+        offsets = np.arange(WINDOW)
+        self.windowOffsets = (2 * RADIUS - offsets.repeat(WINDOW)) * self.width + 2 * RADIUS - np.tile(offsets, WINDOW)
+        # Ô của lưới (cột trong logits) ứng với từng ô có viền; ô viền = rows * cols
+        cellIndex = np.full((rows + 2 * RADIUS, self.width), rows * cols)
+        cellIndex[RADIUS:-RADIUS, RADIUS:-RADIUS] = np.arange(rows * cols).reshape(rows, cols)
+        self.cellIndex = cellIndex.ravel()
+
+    def load(self, path=None):
+        """Nạp trọng số đã huấn luyện; trả về False (giữ mạng hiện tại) nếu không có tệp hợp lệ."""
+        try:
+            self.network = PolicyNetwork.load(path or NNCOMPUTER.weights)
+        except (OSError, KeyError, ValueError):
+            return False
+        return True
+
+    def _head(self, hidden):
+        """Các lớp sau lớp đầu: tiền kích hoạt lớp đầu (..., H) -> logit (...)."""
+        activation = hidden
+        for weight, bias in zip(self.network.weights[1:], self.network.biases[1:]):
+            activation = np.maximum(activation, 0) @ weight + bias
+        return activation[..., 0]
+
+    def start(self, games):
+        super().start(games)
+        count = len(games)
+        weight, bias = self.network.weights[0], self.network.biases[0]
+        # Phần thay đổi tiền kích hoạt khi ô ở vị trí p của cửa sổ chuyển từ chưa biết sang trúng/trượt
+        contributions = weight.reshape(WINDOW * WINDOW, 3, -1)
+        # Hàng kind * WINDOW² + p: ô ở vị trí p chuyển sang trạng thái kind (HITCELL/MISSCELL)
+        self.deltas = (contributions - contributions[:, UNKNOWN:UNKNOWN + 1]).transpose(1, 0, 2).reshape(3 * WINDOW * WINDOW, -1)
+        # Mọi bàn cờ trống giống nhau: chỉ cần tính trên một bàn rồi sao chép
+        empty = (boardFeatures(emptyStates(1, self.rows, self.cols)) @ weight + bias).reshape(self.rows, self.cols, -1)
+        self.hidden = np.tile(empty.reshape(1, -1, empty.shape[-1]), (count, 1, 1))
+        self.slots = np.arange(count)
+        self.logits = np.tile(self._head(empty).ravel(), (count, 1))
+
+    def choose(self, games):
+        return self._best(self.logits, games.unshot)
+
+    def observe(self, games, actions, hit):
+        cells = self.rows * self.cols
+        row, col = np.divmod(actions, self.cols)
+        window = (row * self.width + col)[:, None] + self.windowOffsets
+        cell = self.cellIndex[window]
+        inside = cell < cells
+        update = inside & gather(games.unshot, np.arange(len(actions))[:, None], np.where(inside, cell, 0))
+        # Các cặp (ván, vị trí trong cửa sổ) cần cập nhật, xử lý như một danh sách phẳng
+        game, position = np.nonzero(update)
+        hidden = self.hidden.reshape(-1, self.hidden.shape[-1])
+        rows = self.slots[game] * cells + cell[game, position]
+        kind = np.where(hit, HITCELL, MISSCELL)[game]
+        values = hidden[rows] + self.deltas[kind * WINDOW * WINDOW + position]
+        hidden[rows] = values
+        np.put(self.logits, game * cells + cell[game, position], self._head(values))
+
+
+def playBatch(strategy, ships, maxShots=None):
+    """
+    Chơi các ván có bản đồ tàu ships (số ván, rows, cols) bằng một thuật toán theo lô, mỗi lần
+    strategy.lotSize ván cùng lúc; trả về số phát bắn của từng ván (ván chưa thắng sau maxShots phát
+    dừng ở maxShots).
+    """
+    return np.concatenate([playLot(strategy, ships[start:start + strategy.lotSize], maxShots)
+                           for start in range(0, len(ships), strategy.lotSize)])
+
+
+def playLot(strategy, ships, maxShots=None):
+    """Chơi cùng lúc mọi ván có bản đồ tàu ships; trả về số phát bắn của từng ván (xem playBatch)."""
+    games = BatchGames(ships)
+    strategy.start(games)
+    step = 0
+    while len(games) and (maxShots is None or step < maxShots):
+        # Các ván đã thắng còn trong lô vẫn được chọn ô và bắn tiếp (bắn lại ô đã bắn không đổi gì)
+        actions = strategy.choose(games)
+        strategy.observe(games, actions, games.fire(actions))
+        keep = games.compact()
+        if keep is not None:
+            strategy.compact(keep)
+        step += 1
+    return games.shots
@@ -0,0 +1,281 @@
+"""
+Bàn cờ logic: trạng thái của mọi ô nằm trong một bytearray (state[row * cols + col] là mã
+EMPTY/SHIP/HIT/MISS), các mặt nạ bit (tàu, trúng, trượt; bit thứ row * cols + col ứng với
+ô (row, col)) được dựng từ đó khi cần truy vấn trên toàn bàn cờ (tìm kiếm Minimax).
+
+BitBoard vẫn truy cập được như list-of-lists cũ (board[i][j], board[i][j] = 'O',
+'O' in row, for row in board) nên phần pygame không cần thay đổi.
+
+Kích thước lưới là tham số thật: các truy vấn và thao tác theo ô (get, set, is_unshot, fire,
+random_unshot, neighbor_cells) là O(1) nhờ state và chỉ mục unshotCells, nên bàn cờ 1000x1000
+vẫn dùng được. Các mặt nạ (ships, hits, misses, unshot()) tốn O(rows * cols) mỗi lần dựng.
+"""
+import random
+from array import array
+
+EMPTY, SHIP, HIT, MISS = ' ', 'O', 'T', 'X'
+STATES = (EMPTY, SHIP, HIT, MISS)  # Trạng thái theo mã lưu trong BitBoard.state
+CODES = {value: code for code, value in enumerate(STATES)}
+EMPTYCODE, SHIPCODE, HITCODE, MISSCODE = range(len(STATES))
+
+
+def _bitTable(*codes):
+    """Bảng translate: mã trong codes -> '1', mã khác -> '0' (để dựng mặt nạ bit từ state)."""
+    return bytes(ord('1') if code in codes else ord('0') for code in range(256))
+
+
+SHIPBITS = _bitTable(SHIPCODE, HITCODE)
+HITBITS = _bitTable(HITCODE)
+MISSBITS = _bitTable(MISSCODE)
+UNSHOTBITS = _bitTable(EMPTYCODE, SHIPCODE)
+
+
+def iterBits(mask):
+    """Duyệt chỉ số các bit 1 của mask theo thứ tự tăng dần."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class CellIndex:
+    """
+    Tập chỉ số ô cho phép thêm, xóa và chọn ngẫu nhiên trong O(1):
+    items là danh sách các chỉ số, positions[index] là vị trí của index trong items (-1 nếu không có).
+    Xóa bằng cách đổi chỗ phần tử cần xóa với phần tử cuối rồi pop.
+    """
+    __slots__ = ('items', 'positions')
+
+    def __init__(self, size):
+        # array thay vì list: 8 byte mỗi ô và copy() chỉ là một lần chép bộ nhớ
+        self.items = array('q', range(size))
+        self.positions = array('q', range(size))
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, index):
+        return self.positions[index] >= 0
+
+    def add(self, index):
+        if self.positions[index] < 0:
+            self.positions[index] = len(self.items)
+            self.items.append(index)
+
+    def discard(self, index):
+        position = self.positions[index]
+        if position < 0:
+            return
+        last = self.items.pop()
+        if last != index:
+            self.items[position] = last
+            self.positions[last] = position
+        self.positions[index] = -1
+
+    def choice(self, rng=random):
+        """Một chỉ số ngẫu nhiên, hoặc None nếu tập rỗng."""
+        return self.items[rng.randrange(len(self.items))] if self.items else None
+
+    def copy(self):
+        index = CellIndex.__new__(CellIndex)
+        index.items = array('q', self.items)
+        index.positions = array('q', self.positions)
+        return index
+
+
+class _Row:
+    """Một hàng của BitBoard, hành xử như list các ký tự ' ', 'O', 'T', 'X'."""
+    __slots__ = ('board', 'row')
+
+    def __init__(self, board, row):
+        self.board = board
+        self.row = row
+
+    def __getitem__(self, col):
+        if isinstance(col, slice):
+            return [self.board.get(self.row, c) for c in range(self.board.cols)[col]]
+        if col < 0:
+            col += self.board.cols
+        return self.board.get(self.row, col)
+
+    def __setitem__(self, col, value):
+        if col < 0:
+            col += self.board.cols
+        self.board.set(self.row, col, value)
+
+    def __len__(self):
+        return self.board.cols
+
+    def __iter__(self):
+        board = self.board
+        return (board.get(self.row, col) for col in range(board.cols))
+
+    def __contains__(self, value):
+        board = self.board
+        if value not in CODES:
+            return False
+        return CODES[value] in board.state[self.row * board.cols:(self.row + 1) * board.cols]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class _CellsWith:
+    """Tập (chỉ hỗ trợ `index in`) các ô của BitBoard đang có một trong các mã codes, đọc thẳng từ state."""
+    __slots__ = ('state', 'codes')
+
+    def __init__(self, state, codes):
+        self.state = state
+        self.codes = codes
+
+    def __contains__(self, index):
+        return self.state[index] in self.codes
+
+
+class BitBoard:
+    """Bàn cờ logic: mã trạng thái của từng ô (state) và mặt nạ bit dựng từ đó cho tàu, ô trúng, ô trượt."""
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.full = (1 << (rows * cols)) - 1  # Mặt nạ toàn bộ lưới
+        self.state = bytearray(rows * cols)  # Mã trạng thái của từng ô (ban đầu EMPTYCODE)
+        self.remaining = 0  # Số ô tàu chưa bị bắn trúng
+        self.unshotCells = CellIndex(rows * cols)  # Các ô chưa bị bắn, để chọn ngẫu nhiên trong O(1)
+        self._rows = [_Row(self, row) for row in range(rows)]
+
+    #  Chuyển đổi tọa độ
+    def index(self, row, col):
+        return row * self.cols + col
+
+    def cell(self, index):
+        return divmod(index, self.cols)
+
+    def rowMask(self, row):
+        return ((1 << self.cols) - 1) << (row * self.cols)
+
+    #  Mặt nạ bit dựng từ state (O(rows * cols)) cho các truy vấn trên toàn bàn cờ
+    def _mask(self, table):
+        if not self.state:
+            return 0
+        return int(self.state.translate(table)[::-1], 2)
+
+    @property
+    def ships(self):
+        """Các ô có tàu (kể cả đã bị bắn trúng)."""
+        return self._mask(SHIPBITS)
+
+    @property
+    def hits(self):
+        """Các ô tàu đã bị bắn trúng."""
+        return self._mask(HITBITS)
+
+    @property
+    def misses(self):
+        """Các ô trống đã bị bắn trượt."""
+        return self._mask(MISSBITS)
+
+    def cellsWith(self, *values):
+        """Tập các ô (chỉ số row * cols + col) đang có một trong các trạng thái values, dùng cho `in` trong O(1)."""
+        return _CellsWith(self.state, {CODES[value] for value in values})
+
+    #  Truy cập theo ô
+    def get(self, row, col):
+        return STATES[self.state[row * self.cols + col]]
+
+    def set(self, row, col, value):
+        """Gán trạng thái ' ', 'O', 'T' hoặc 'X' cho ô (row, col)."""
+        if value not in CODES:
+            raise ValueError(f'Trạng thái ô không hợp lệ: {value!r}')
+        index = row * self.cols + col
+        self.remaining += (value == SHIP) - (self.state[index] == SHIPCODE)
+        self.state[index] = CODES[value]
+        if value in (HIT, MISS):
+            self.unshotCells.discard(index)
+        else:
+            self.unshotCells.add(index)
+
+    def is_unshot(self, row, col):
+        return self.unshotCells.positions[row * self.cols + col] >= 0
+
+    def fire(self, row, col):
+        """Bắn vào ô (row, col): trả về 'Hit', 'Miss' hoặc None nếu ô đã bị bắn."""
+        index = row * self.cols + col
+        if self.unshotCells.positions[index] < 0:
+            return None
+        self.unshotCells.discard(index)
+        if self.state[index] == SHIPCODE:
+            self.state[index] = HITCODE
+            self.remaining -= 1
+            return 'Hit'
+        self.state[index] = MISSCODE
+        return 'Miss'
+
+    #  Truy vấn trên toàn bàn cờ
+    def unshot(self):
+        """Mặt nạ các ô chưa bị bắn."""
+        return self._mask(UNSHOTBITS)
+
+    def random_unshot(self, rng=random, avoid=()):
+        """
+        Ô (row, col) ngẫu nhiên chưa bị bắn và có chỉ số không thuộc avoid (tập, dict hoặc cellsWith),
+        hoặc None nếu không còn ô nào. Chọn trong O(1) từ unshotCells; chỉ khi avoid phủ gần hết
+        các ô còn lại mới phải duyệt các ô chưa bắn một lần.
+        """
+        for _ in range(8):
+            index = self.unshotCells.choice(rng)
+            if index is None:
+                return None
+            if index not in avoid:
+                return self.cell(index)
+        candidates = [index for index in self.unshotCells.items if index not in avoid]
+        return self.cell(rng.choice(candidates)) if candidates else None
+
+    def all_sunk(self):
+        """Tất cả tàu đã bị bắn trúng (O(1) nhờ bộ đếm remaining)."""
+        return self.remaining == 0
+
+    def score(self):
+        """Điểm của bàn cờ: +10 cho mỗi ô trúng, -5 cho mỗi ô trượt."""
+        return 10 * self.state.count(HITCODE) - 5 * self.state.count(MISSCODE)
+
+    def neighbor_cells(self, row, col):
+        """Các ô lân cận (Bắc, Nam, Đông, Tây) nằm trong lưới của (row, col)."""
+        return [(nx, ny) for nx, ny in ((row - 1, col), (row + 1, col), (row, col + 1), (row, col - 1))
+                if 0 <= nx < self.rows and 0 <= ny < self.cols]
+
+    def neighbors(self, row, col):
+        """Mặt nạ 4 ô lân cận của (row, col)."""
+        mask = 0
+        for nx, ny in self.neighbor_cells(row, col):
+            mask |= 1 << (nx * self.cols + ny)
+        return mask
+
+    def cells(self, mask):
+        """Danh sách tọa độ (row, col) của các bit 1 trong mask."""
+        return [divmod(index, self.cols) for index in iterBits(mask)]
+
+    def copy(self):
+        board = BitBoard.__new__(BitBoard)
+        board.rows, board.cols, board.full = self.rows, self.cols, self.full
+        board.state = bytearray(self.state)
+        board.remaining = self.remaining
+        board.unshotCells = self.unshotCells.copy()
+        board._rows = [_Row(board, row) for row in range(self.rows)]
+        return board
+
+    #  Giao diện list-of-lists cho phần pygame
+    def __getitem__(self, row):
+        return self._rows[row]
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __repr__(self):
+        return f'BitBoard({self.rows}x{self.cols}, remaining={self.remaining})'
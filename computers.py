@@ -0,0 +1,681 @@
+"""
+Các thuật toán tấn công của máy, không phụ thuộc pygame.
+
+Mỗi lớp chỉ quyết định ô cần bắn (choose_move) và cập nhật trạng thái nội bộ sau phát bắn.
+Phần hiển thị (token, âm thanh, trạng thái 'Thinking') nằm trong FullOption.py
+và được gắn vào thông qua hook on_shot.
+"""
+import heapq
+import random
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from bitboard import CellIndex
+from density import DensityTargeter
+from engine import ROWS, COLS, fireShot
+from montecarlo import MAXCELLS, PosteriorSampler
+from policynet import RADIUS, UNKNOWN, HITCELL, MISSCELL, PolicyNetwork, cellFeatures, emptyStates
+
+
+class Computer:
+    """Lớp cơ sở cho các máy: một lượt = chọn ô rồi bắn vào ô đó."""
+    name = 'Computer'
+
+    def __init__(self, rows=ROWS, cols=COLS):
+        self.rows = rows  # Kích thước lưới mà máy tấn công
+        self.cols = cols
+        self.turn = False  # Biến cho biết máy đang ở lượt chơi hay không
+
+    def make_attack(self, gamelogic):
+        """Máy thực hiện lượt tấn công; trả về trạng thái lượt chơi của máy."""
+        move = self.choose_move(gamelogic)
+        if move is not None:
+            self._process_attack(move[0], move[1], gamelogic)
+        return self.turn
+
+    def choose_move(self, gamelogic):
+        """Chọn ô (row, col) để bắn tiếp theo."""
+        raise NotImplementedError
+
+    def _process_attack(self, row, col, gamelogic):
+        """Bắn vào ô (row, col), cập nhật trạng thái của máy và kết thúc lượt."""
+        result = fireShot(gamelogic, row, col)
+        self.observe(row, col, result, gamelogic)
+        self.on_shot(row, col, result)
+        self.turn = False  # Kết thúc lượt chơi
+        return result
+
+    def observe(self, row, col, result, gamelogic):
+        """Cập nhật trạng thái nội bộ sau phát bắn ('Hit', 'Miss' hoặc None)."""
+
+    def on_shot(self, row, col, result):
+        """Hook cho phần hiển thị (token, âm thanh); mặc định không làm gì."""
+
+    def cancel_search(self):
+        """Yêu cầu dừng sớm choose_move đang chạy trên luồng khác (nếu thuật toán hỗ trợ)."""
+
+    def _get_next_position(self, x, y, direction):
+        """
+        Trả về vị trí tiếp theo dựa trên hướng:
+        - 'North': Lên
+        - 'South': Xuống
+        - 'East': Sang phải
+        - 'West': Sang trái
+        """
+        if direction == 'North':
+            return x - 1, y
+        elif direction == 'South':
+            return x + 1, y
+        elif direction == 'East':
+            return x, y + 1
+        elif direction == 'West':
+            return x, y - 1
+        return x, y  # Trả về vị trí ban đầu nếu hướng không hợp lệ
+
+    def is_within_grid(self, x, y):
+        # Kiểm tra xem tọa độ (x, y) có nằm trong lưới (rows x cols) hay không.
+        return 0 <= x < self.rows and 0 <= y < self.cols
+
+
+#Các thuật toán của computer
+#Tìm kiếm mù: DFS
+class DFSCOMPUTER(Computer):
+    name = 'DFS Computer'
+
+    def __init__(self, rows=ROWS, cols=COLS):
+        super().__init__(rows, cols)
+        self.visited = set()  # Tập hợp các ô đã bắn (tránh lặp lại)
+        self.stack = []  # Ngăn xếp để thực hiện thuật toán tìm kiếm theo chiều sâu (DFS)
+        # Đáy ngăn xếp là toàn bộ lưới theo thứ tự chỉ số; thay vì nạp sẵn rows * cols ô,
+        # chỉ giữ chỉ số của ô kế tiếp sẽ được lấy ra (từ ô cuối về ô đầu)
+        self.next_cell = rows * cols - 1
+
+    def choose_move(self, gamelogic):
+        """
+        - Lấy các ô từ ngăn xếp để thực hiện bắn theo DFS.
+        - Khi ngăn xếp rỗng, lấy tiếp các ô của lưới từ ô cuối về ô đầu.
+        Chỉ xem ô kế tiếp chứ không lấy ra: ô được bỏ khỏi ngăn xếp trong observe khi đã thật sự bị bắn,
+        nên nước đi tính trên luồng nền rồi bị hủy (Redeploy, đổi chế độ) không làm mất ô.
+        """
+        # Ô chưa bắn gần đỉnh ngăn xếp nhất
+        for row, col in reversed(self.stack):
+            if (row, col) not in self.visited:  # Chỉ xử lý ô chưa bị bắn
+                return row, col
+        cell = self.next_cell
+        while cell >= 0:
+            row, col = divmod(cell, self.cols)
+            if (row, col) not in self.visited:
+                return row, col
+            cell -= 1
+        return None
+
+    def observe(self, row, col, result, gamelogic):
+        self.visited.add((row, col))  # Đánh dấu ô đã bắn
+        # Bỏ các ô đã bắn ở đỉnh ngăn xếp và ở con trỏ lưới
+        while self.stack and self.stack[-1] in self.visited:
+            self.stack.pop()
+        while self.next_cell >= 0 and divmod(self.next_cell, self.cols) in self.visited:
+            self.next_cell -= 1
+        if result == 'Hit':
+            # Thêm các ô lân cận vào ngăn xếp để tiếp tục DFS
+            self._add_neighbors_to_stack(row, col, gamelogic)
+
+    def _add_neighbors_to_stack(self, row, col, gamelogic):
+        """
+        Thêm các ô lân cận (theo 4 hướng: Bắc, Nam, Đông, Tây) vào ngăn xếp để tiếp tục DFS.
+        """
+        directions = ['North', 'South', 'East', 'West']  # Các hướng di chuyển
+        for direction in directions:
+            # Lấy tọa độ ô lân cận dựa trên hướng
+            nx, ny = self._get_next_position(row, col, direction)
+            # Chỉ thêm ô hợp lệ (nằm trong lưới, chưa bị bắn)
+            if self.is_within_grid(nx, ny) and (nx, ny) not in self.visited:
+                if gamelogic.is_unshot(nx, ny):  # Ô khả nghi (chứa tàu hoặc chưa khám phá)
+                    self.stack.append((nx, ny))  # Thêm ô vào ngăn xếp
+
+
+# Quay lui (Backtracking)
+class BTCOMPUTER(Computer):
+    name = 'Backtracking Computer'
+
+    def __init__(self, rows=ROWS, cols=COLS):
+        super().__init__(rows, cols)
+        self.moves = []  # Danh sách các ô cần tấn công theo chiến thuật backtracking
+        self.visited = set()  # Tập hợp các ô đã được bắn
+
+    def choose_move(self, gamelogic):
+        """
+        - Nếu `self.moves` có ô chưa bắn, bắn ô chưa bắn gần cuối danh sách nhất (chiến thuật backtracking).
+        - Nếu không, máy chọn ngẫu nhiên một ô chưa được bắn.
+        Các ô của `self.moves` chỉ được bỏ ra trong observe, sau khi đã bị bắn (xem DFSCOMPUTER).
+        """
+        for row, col in reversed(self.moves):
+            if gamelogic.is_unshot(row, col):  # Bỏ qua ô đã bị bắn (ô được thêm hai lần)
+                return row, col
+        # Không còn ô nào trong moves: chọn ngẫu nhiên một ô chưa bắn (None nếu đã bắn hết)
+        return gamelogic.random_unshot()
+
+    def observe(self, row, col, result, gamelogic):
+        self.visited.add((row, col))  # Đánh dấu ô đã bắn
+        # Bỏ các ô đã bắn ở cuối danh sách moves
+        while self.moves and self.moves[-1] in self.visited:
+            self.moves.pop()
+        if result == 'Hit':
+            # Gọi hàm thêm các ô lân cận vào danh sách backtracking
+            self._backtrack_ship(row, col, gamelogic)
+
+    def _backtrack_ship(self, row, col, gamelogic):
+        """
+        Thêm các ô lân cận (theo 4 hướng: Bắc, Nam, Đông, Tây) vào danh sách moves
+        để thực hiện chiến thuật backtracking khi bắn trúng tàu.
+        """
+        directions = ['North', 'South', 'East', 'West']  # Các hướng để tìm ô lân cận
+        for direction in directions:
+            nx, ny = self._get_next_position(row, col, direction)  # Lấy tọa độ ô lân cận
+            # Kiểm tra ô hợp lệ và chưa được bắn
+            if self.is_within_grid(nx, ny) and (nx, ny) not in self.visited:
+                if gamelogic.is_unshot(nx, ny):  # Ô khả nghi (chứa tàu hoặc chưa khám phá)
+                    self.moves.append((nx, ny))  # Thêm ô vào danh sách moves
+
+
+# Tìm kiếm đối kháng
+@lru_cache(maxsize=None)
+def zobristKeys(cells):
+    """Khóa Zobrist 64-bit cho từng ô (cố định seed để bảng băm ổn định giữa các lần chạy)."""
+    rng = random.Random(0x5EED)
+    return [rng.getrandbits(64) for _ in range(cells)], rng.getrandbits(64)
+
+
+class _SearchTimeout(Exception):
+    """Hết thời gian suy nghĩ cho nước đi hiện tại."""
+
+
+class ADVCOMPUTER(Computer):
+    name = 'Minimax Computer'
+    depth = 4  # Số lớp tìm kiếm tối đa (nước đi gốc + 3 lớp Minimax)
+    time_budget = 0.5  # Thời gian suy nghĩ tối đa cho mỗi nước đi (giây)
+    table_limit = 1_000_000  # Số mục tối đa trong bảng chuyển vị
+
+    # Loại giá trị lưu trong bảng chuyển vị
+    EXACT, LOWER, UPPER = 0, 1, 2
+
+    def __init__(self, rows=ROWS, cols=COLS):
+        super().__init__(rows, cols)
+        self.table = {}  # Bảng chuyển vị: khóa Zobrist -> (độ sâu, giá trị, loại, nước đi tốt nhất)
+
+    def choose_move(self, gamelogic):
+        """
+        Máy tính chọn nước đi dựa trên thuật toán Minimax:
+        - Tìm kiếm sâu dần (iterative deepening) từ 1 đến self.depth lớp trong self.time_budget giây.
+        - Mỗi lớp dùng Alpha-Beta, bảng chuyển vị Zobrist và sắp xếp nước đi.
+        - Trả về nước đi tốt nhất của lớp sâu nhất đã tìm xong.
+        """
+        self._start_search(gamelogic)
+        if not self._unshot:
+            return None
+
+        best_move = None
+        try:
+            for depth in range(1, self.depth + 1):
+                best_move = self._search_root(depth, best_move)
+                if self._remaining == 0:
+                    break
+        except _SearchTimeout:
+            pass
+        if best_move is None:  # Chưa tìm xong lớp nào: lấy nước đầu tiên theo thứ tự ưu tiên
+            best_move = next(self._ordered_moves(True, None))
+        return gamelogic.cell(best_move)
+
+    def _start_search(self, gamelogic):
+        """Khởi tạo trạng thái tìm kiếm từ bàn cờ thật (không thay đổi bàn cờ trong lúc tìm)."""
+        self._cols = gamelogic.cols
+        self._ships = gamelogic.ships
+        self._unshot = gamelogic.unshot()
+        self._remaining = gamelogic.remaining
+        self._score = self.evaluate(gamelogic)
+        self._keys, self._side = zobristKeys(gamelogic.rows * gamelogic.cols)
+        self._hash = 0
+        shot = gamelogic.full & ~self._unshot
+        while shot:
+            low = shot & -shot
+            self._hash ^= self._keys[low.bit_length() - 1]
+            shot ^= low
+        self._deadline = time.perf_counter() + self.time_budget
+        self._nodes = 0
+        if len(self.table) > self.table_limit:
+            self.table.clear()
+
+    def _search_root(self, depth, previous_best):
+        """Duyệt các nước đi gốc ở độ sâu depth; nước tốt nhất của lớp trước được xét đầu tiên."""
+        best_score = float('-inf')
+        best_move = None
+        alpha, beta = float('-inf'), float('inf')
+        for index in self._ordered_moves(True, previous_best):
+            hit = self._make(index)
+            score = self.minimax(depth - 1, False, alpha, beta)
+            self._unmake(index, hit)
+            if score > best_score:
+                best_score = score
+                best_move = index
+            alpha = max(alpha, score)
+        return best_move
+
+    def _ordered_moves(self, is_maximizing, first):
+        """
+        Sinh nước đi theo thứ tự khả năng tốt:
+        - Nước tốt nhất trong bảng chuyển vị (hoặc của lớp trước) trước tiên.
+        - Máy (tối đa hóa) ưu tiên ô có tàu, đối thủ (tối thiểu hóa) ưu tiên ô trống.
+        """
+        unshot = self._unshot
+        if first is not None and unshot >> first & 1:
+            yield first
+            unshot &= ~(1 << first)
+        ships = unshot & self._ships
+        for mask in ((ships, unshot ^ ships) if is_maximizing else (unshot ^ ships, ships)):
+            while mask:
+                low = mask & -mask
+                yield low.bit_length() - 1
+                mask ^= low
+
+    def _make(self, index):
+        """Giả lập bắn vào ô index; cập nhật điểm, số ô tàu còn lại và khóa băm tăng dần."""
+        # Kiểm tra thời gian theo số nước giả lập (không theo số nút) để lưới lớn, nơi mỗi nút
+        # có hàng nghìn nước con, vẫn dừng đúng hạn
+        self._nodes += 1
+        if self._nodes & 1023 == 0 and time.perf_counter() > self._deadline:
+            raise _SearchTimeout
+        bit = 1 << index
+        self._unshot ^= bit
+        self._hash ^= self._keys[index]
+        if self._ships & bit:
+            self._score += 10
+            self._remaining -= 1
+            return True
+        self._score -= 5
+        return False
+
+    def _unmake(self, index, hit):
+        """Hoàn tác nước đi giả lập."""
+        self._unshot |= 1 << index
+        self._hash ^= self._keys[index]
+        if hit:
+            self._score -= 10
+            self._remaining += 1
+        else:
+            self._score += 5
+
+    def minimax(self, depth, is_maximizing, alpha, beta):
+        """
+        Thuật toán Minimax với Alpha-Beta Pruning:
+        - Đệ quy duyệt qua các trạng thái của trò chơi.
+        - Tối đa hóa điểm số cho máy tính hoặc tối thiểu hóa điểm số cho đối thủ.
+        - Sử dụng Alpha-Beta để cắt bỏ các nhánh không cần thiết.
+        - Tra bảng chuyển vị trước khi duyệt và lưu kết quả sau khi duyệt.
+        """
+        # Điều kiện dừng: độ sâu bằng 0 hoặc trò chơi kết thúc (điểm được cập nhật tăng dần)
+        if depth == 0 or self._remaining == 0 or not self._unshot:
+            return self._score
+
+        key = self._hash ^ self._side if is_maximizing else self._hash
+        entry = self.table.get(key)
+        table_move = None
+        if entry is not None:
+            entry_depth, value, flag, table_move = entry
+            if entry_depth >= depth:
+                if flag == self.EXACT:
+                    return value
+                if flag == self.LOWER and value >= beta:
+                    return value
+                if flag == self.UPPER and value <= alpha:
+                    return value
+
+        alpha_start, beta_start = alpha, beta
+        best_move = None
+        if is_maximizing:
+            best = float('-inf')  # Giá trị tốt nhất cho máy tính
+            for index in self._ordered_moves(True, table_move):
+                hit = self._make(index)
+                eval = self.minimax(depth - 1, False, alpha, beta)
+                self._unmake(index, hit)
+                if eval > best:
+                    best, best_move = eval, index
+                alpha = max(alpha, eval)
+                if beta <= alpha:  # Cắt tỉa nếu Beta <= Alpha
+                    break
+        else:
+            # Giả lập đối thủ
+            best = float('inf')  # Giá trị tốt nhất cho đối thủ
+            for index in self._ordered_moves(False, table_move):
+                hit = self._make(index)
+                eval = self.minimax(depth - 1, True, alpha, beta)
+                self._unmake(index, hit)
+                if eval < best:
+                    best, best_move = eval, index
+                beta = min(beta, eval)
+                if beta <= alpha:  # Cắt tỉa nếu Beta <= Alpha
+                    break
+
+        if best <= alpha_start:
+            flag = self.UPPER
+        elif best >= beta_start:
+            flag = self.LOWER
+        else:
+            flag = self.EXACT
+        self.table[key] = (depth, best, flag, best_move)
+        return best
+
+    def evaluate(self, gamelogic):
+        """
+        Hàm đánh giá trạng thái lưới (đếm bit bằng popcount thay vì duyệt 100 ô):
+        - +10 điểm cho mỗi ô bắn trúng.
+        - -5 điểm cho mỗi ô bắn trượt.
+        Trong lúc tìm kiếm, điểm được cập nhật tăng dần qua _make/_unmake.
+        """
+        return gamelogic.score()
+
+    def is_game_over(self, gamelogic):
+        """Trò chơi kết thúc khi không còn ô 'O' (tàu chưa bị bắn trúng)."""
+        return gamelogic.all_sunk()
+
+    def cancel_search(self):
+        """Đưa hạn chót về 0 để lần kiểm tra thời gian kế tiếp dừng tìm kiếm."""
+        self._deadline = 0.0
+
+
+class GCOMPUTER(Computer):
+    name = 'Greedy Computer'
+
+    def __init__(self, rows=ROWS, cols=COLS):
+        super().__init__(rows, cols)
+        # Ma trận xác suất được lưu thưa để không phải duyệt cả lưới ở mỗi lượt:
+        # - Các ô chưa từng thay đổi (self.untouched) có chung giá trị lưu self.base.
+        # - Các ô đã thay đổi (ô đã bắn và ô lân cận) nằm trong self.values.
+        # - Xác suất thật = giá trị lưu * self.scale, nên chuẩn hóa chỉ là cập nhật self.scale.
+        self.base = 1 / (rows * cols)  # Ban đầu phân bổ đều
+        self.values = {}  # Chỉ số ô -> giá trị lưu của các ô đã thay đổi
+        self.untouched = CellIndex(rows * cols)
+        self.total = 1.0  # Tổng giá trị lưu của toàn bộ ma trận
+        self.scale = 1.0
+        # Hàng đợi ưu tiên (-giá trị lưu, khóa ngẫu nhiên, chỉ số ô) của các ô đã thay đổi;
+        # mục có giá trị cũ bị bỏ qua khi lấy ra
+        self.heap = []
+
+    @property
+    def probability_matrix(self):
+        """Ma trận xác suất đầy đủ (rows, cols), chỉ dựng khi cần in."""
+        matrix = np.full(self.rows * self.cols, self.base)
+        for index, value in self.values.items():
+            matrix[index] = value
+        return (matrix * self.scale).reshape(self.rows, self.cols)
+
+    def _value(self, index):
+        return self.base if index in self.untouched else self.values[index]
+
+    def _set(self, index, value):
+        self.total += value - self._value(index)
+        self.untouched.discard(index)
+        self.values[index] = value
+        heapq.heappush(self.heap, (-value, random.random(), index))
+
+    def update_probability(self, x, y, gamelogic, hit):
+        """Cập nhật ma trận xác suất sau khi bắn (chỉ ô vừa bắn và các ô lân cận)."""
+        reduction_factor = 0.2  # Hệ số giảm xác suất ở các ô lân cận
+
+        # Đặt xác suất của ô vừa bắn về 0 vì không còn khả năng chứa tàu
+        self._set(x * self.cols + y, 0.0)
+
+        # Các ô lân cận chưa bị bắn
+        neighbors = [nx * self.cols + ny for nx, ny in gamelogic.neighbor_cells(x, y) if gamelogic.is_unshot(nx, ny)]
+        if hit:  # Nếu bắn trúng tàu
+            # Tăng xác suất các ô lân cận vì khả năng có phần còn lại của tàu
+            for index in neighbors:
+                self._set(index, self._value(index) + 0.3 / self.scale)
+        else:  # Nếu trượt
+            # Giảm xác suất các ô lân cận vì khả năng không có tàu ở đây
+            for index in neighbors:
+                self._set(index, self._value(index) * (1 - reduction_factor))
+
+        # Chuẩn hóa lại ma trận xác suất để tổng xác suất = 1
+        if self.total > 0:
+            self.scale = 1 / self.total
+
+    def choose_next_move(self):
+        """Chọn vị trí bắn tiếp theo dựa trên xác suất cao nhất."""
+        heap = self.heap
+        while heap and self.values[heap[0][2]] != -heap[0][0]:  # Bỏ các mục đã cũ
+            heapq.heappop(heap)
+        top = -heap[0][0] if heap else None
+        # Các ô chưa thay đổi có cùng xác suất: chọn ngẫu nhiên một ô nếu chúng đang cao nhất
+        if len(self.untouched) and (top is None or self.base >= top):
+            index = self.untouched.choice()
+        elif heap:
+            index = heap[0][2]
+        else:
+            return None
+        return divmod(index, self.cols)
+
+    def choose_move(self, gamelogic):
+        return self.choose_next_move()  # Chọn ô dựa trên xác suất cao nhất
+
+    def observe(self, row, col, result, gamelogic):
+        self.update_probability(row, col, gamelogic, hit=(result == 'Hit'))  # Cập nhật xác suất
+
+
+class OPTIMALMODE(Computer):
+    name = 'Optimal Computer'
+
+    def __init__(self, rows=ROWS, cols=COLS):
+        super().__init__(rows, cols)
+        # Bản đồ mật độ chính xác từ mọi vị trí đặt tàu khớp với các ô đã trúng/trượt
+        self.targeter = DensityTargeter(rows, cols)
+
+    @property
+    def probability_matrix(self):
+        """Bản đồ mật độ hiện tại, chuẩn hóa để tổng xác suất = 1."""
+        density = self.targeter.density()
+        total = density.sum()
+        return density / total if total > 0 else density
+
+    def choose_move(self, gamelogic):
+        """Chọn ô được nhiều vị trí đặt tàu hợp lệ phủ lên nhất."""
+        return self.targeter.choose()
+
+    def observe(self, row, col, result, gamelogic):
+        """Ghi nhận kết quả phát bắn vào bản đồ mật độ."""
+        if result is not None:
+            self.targeter.record(row, col, hit=(result == 'Hit'))
+
+    def print_probability_matrix(self):
+        print(np.array2string(self.probability_matrix, formatter={'float_kind': lambda x: f"{x:0.4f}"}))
+
+
+class MCCOMPUTER(Computer):
+    name = 'Monte Carlo Computer'
+
+    def __init__(self, rows=ROWS, cols=COLS):
+        super().__init__(rows, cols)
+        # Lấy mẫu hậu nghiệm các bố trí khớp với các ô đã trúng/trượt; lưới quá lớn thì chỉ dùng
+        # bản đồ mật độ (cũng là dự phòng khi chưa tìm được mẫu khớp trong thời gian cho phép)
+        self.sampler = PosteriorSampler(rows, cols) if rows * cols <= MAXCELLS else None
+        self.targeter = DensityTargeter(rows, cols)
+
+    @property
+    def probability_matrix(self):
+        """Xác suất có tàu của từng ô theo các mẫu khớp hiện có."""
+        probability = self.sampler.posterior() if self.sampler is not None else None
+        if probability is None:
+            density = self.targeter.density()
+            total = density.sum()
+            return density / total if total > 0 else density
+        return probability
+
+    def choose_move(self, gamelogic):
+        """Chọn ô có xác suất có tàu cao nhất theo lô mẫu (hoặc theo bản đồ mật độ)."""
+        move = self.sampler.choose() if self.sampler is not None else None
+        return move if move is not None else self.targeter.choose()
+
+    def observe(self, row, col, result, gamelogic):
+        """Ghi nhận kết quả phát bắn vào lô mẫu và bản đồ mật độ."""
+        if result is not None:
+            if self.sampler is not None:
+                self.sampler.record(row, col, hit=(result == 'Hit'))
+            self.targeter.record(row, col, hit=(result == 'Hit'))
+
+
+class NNCOMPUTER(Computer):
+    """
+    Mạng nơ-ron nhỏ (policynet.PolicyNetwork) dự đoán xác suất có tàu của từng ô từ cửa sổ 5x5
+    quanh ô đó; máy bắn ô chưa bắn có xác suất cao nhất. Một phát bắn chỉ đổi dự đoán của các ô
+    trong cửa sổ quanh nó, nên mỗi lượt chỉ chạy mạng trên tối đa 25 ô (một lần lan truyền xuôi).
+    """
+    name = 'Neural Network Computer'
+    weights = 'assets/models/policynet.npz'  # Trọng số do policytraining.py huấn luyện
+
+    def __init__(self, rows=ROWS, cols=COLS):
+        super().__init__(rows, cols)
+        self.network = PolicyNetwork()
+        self.state = emptyStates(1, rows, cols)[0]  # Bàn cờ có viền theo các phát bắn đã biết
+        # Các ô chưa bắn có ô đã bắn trong cửa sổ: hàng đợi ưu tiên (-logit, khóa ngẫu nhiên, ô, logit)
+        # và logit hiện tại của từng ô; các ô còn lại chỉ khác nhau ở phần cửa sổ nằm ngoài lưới
+        self.heap = []
+        self.logits = {}
+
+    def load(self, path=None):
+        """Nạp trọng số đã huấn luyện; trả về False (giữ mạng hiện tại) nếu không có tệp hợp lệ."""
+        try:
+            self.network = PolicyNetwork.load(path or self.weights)
+        except (OSError, KeyError, ValueError):
+            return False
+        return True
+
+    def choose_move(self, gamelogic):
+        """So ô tốt nhất trong hàng đợi với một ô ngẫu nhiên chưa có ô đã bắn ở gần."""
+        heap = self.heap
+        while heap and self.logits.get(heap[0][2]) != heap[0][3]:  # Bỏ các mục đã cũ
+            heapq.heappop(heap)
+        candidates = []
+        if heap:
+            candidates.append((heap[0][3], gamelogic.cell(heap[0][2])))
+        fresh = gamelogic.random_unshot(avoid=self.logits)
+        if fresh is not None:
+            features = cellFeatures(self.state, np.array([fresh[0]]), np.array([fresh[1]]))
+            candidates.append((self.network.forward(features)[0], fresh))
+        if not candidates:
+            return None
+        best = max(value for value, _ in candidates)
+        return random.choice([move for value, move in candidates if value == best])
+
+    def observe(self, row, col, result, gamelogic):
+        """Ghi phát bắn vào bàn cờ và dự đoán lại các ô chưa bắn trong cửa sổ quanh nó (một lô)."""
+        if result is None:
+            return
+        self.state[row + RADIUS, col + RADIUS] = HITCELL if result == 'Hit' else MISSCELL
+        self.logits.pop(gamelogic.index(row, col), None)
+        rows, cols = np.mgrid[max(0, row - RADIUS):min(self.rows, row + RADIUS + 1),
+                              max(0, col - RADIUS):min(self.cols, col + RADIUS + 1)]
+        unshot = self.state[rows + RADIUS, cols + RADIUS] == UNKNOWN
+        rows, cols = rows[unshot], cols[unshot]
+        if not len(rows):
+            return
+        logits = self.network.forward(cellFeatures(self.state, rows, cols))
+        for r, c, logit in zip(rows.tolist(), cols.tolist(), logits.tolist()):
+            index = gamelogic.index(r, c)
+            self.logits[index] = logit
+            heapq.heappush(self.heap, (-logit, random.random(), index, logit))
+
+
+# Reinforcement learning: bảng Q được huấn luyện ngoại tuyến bằng qtraining.py
+PATTERNOFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-2, 0), (2, 0), (0, -2), (0, 2))
+PATTERNS = 3 ** len(PATTERNOFFSETS)  # Số mẫu lân cận: mỗi ô lân cận chưa biết / trúng / trượt (hoặc ngoài lưới)
+PATTERNDIGITS = (0, 0, 1, 2)  # Chữ số mẫu theo mã trạng thái ô của BitBoard.state: trống, tàu, trúng, trượt
+
+
+class NRCOMPUTER(Computer):
+    """
+    Q-Learning trên mẫu lân cận: trạng thái của một nước đi là tình trạng 8 ô quanh ô định bắn
+    (cách 1 và 2 ô theo bốn hướng), nên bảng Q chỉ có PATTERNS giá trị và dùng lại được giữa các ván.
+    Bảng Q được học ngoại tuyến (qtraining.py) và nạp từ checkpoint; khi chơi máy chọn ô chưa bắn
+    có Q lớn nhất.
+    """
+    name = 'RL Computer'
+    checkpoint = 'assets/models/nr_qtable.npz'  # Bảng Q huấn luyện sẵn do qtraining.py ghi ra
+
+    def __init__(self, rows=ROWS, cols=COLS):
+        super().__init__(rows, cols)
+        self.q_table = np.zeros(PATTERNS)  # Giá trị Q của từng mẫu lân cận
+        self.epsilon = 0.0  # Xác suất khám phá khi chơi (việc khám phá đã làm lúc huấn luyện)
+        self.learning_rate = 0.1  # Hệ số học
+        self.discount_factor = 0.9  # Hệ số chiết khấu (discount factor)
+        # Các ô chưa bắn có ô đã bắn trong vùng lân cận: hàng đợi ưu tiên (-Q, khóa ngẫu nhiên, ô, mẫu)
+        # và mẫu hiện tại của từng ô; các ô còn lại có cùng mẫu "chưa biết" (trừ phần ngoài lưới)
+        self.heap = []
+        self.patterns = {}
+
+    def load(self, path=None):
+        """Nạp bảng Q từ checkpoint; trả về False (giữ bảng hiện tại) nếu không có checkpoint hợp lệ."""
+        try:
+            with np.load(path or self.checkpoint) as checkpoint:
+                q_table = checkpoint['q_table']
+        except (OSError, KeyError, ValueError):
+            return False
+        if q_table.shape != self.q_table.shape:
+            return False
+        self.q_table = q_table.astype(float)
+        return True
+
+    def choose_move(self, gamelogic):
+        """Chọn ô chưa bắn có Q lớn nhất (hòa thì ngẫu nhiên); khám phá ngẫu nhiên với xác suất ε."""
+        if random.uniform(0, 1) < self.epsilon:
+            return self._random_action(gamelogic)
+        return self._best_action(gamelogic)
+
+    def observe(self, row, col, result, gamelogic):
+        """Cập nhật mẫu lân cận của các ô chưa bắn quanh ô vừa bắn."""
+        if result is None:
+            return
+        self.patterns.pop(gamelogic.index(row, col), None)
+        for dr, dc in PATTERNOFFSETS:
+            r, c = row + dr, col + dc
+            if self.is_within_grid(r, c) and gamelogic.is_unshot(r, c):
+                index = gamelogic.index(r, c)
+                pattern = self.pattern(gamelogic, r, c)
+                self.patterns[index] = pattern
+                heapq.heappush(self.heap, (-self.q_table[pattern], random.random(), index, pattern))
+
+    def pattern(self, gamelogic, row, col):
+        """
+        Chỉ số mẫu lân cận của ô (row, col): chữ số hệ 3 (0 chưa biết, 1 trúng, 2 trượt) cho từng ô lân cận.
+        Đọc thẳng mã trạng thái từ gamelogic.state nên mỗi mẫu tốn O(1).
+        """
+        state, cols = gamelogic.state, gamelogic.cols
+        code = 0
+        for dr, dc in reversed(PATTERNOFFSETS):
+            r, c = row + dr, col + dc
+            digit = PATTERNDIGITS[state[r * cols + c]] if self.is_within_grid(r, c) else 2
+            code = code * 3 + digit
+        return code
+
+    def _random_action(self, gamelogic):
+        """Chọn ngẫu nhiên một ô hợp lệ (None nếu đã bắn hết)."""
+        return gamelogic.random_unshot()
+
+    def _best_action(self, gamelogic):
+        """
+        So ô tốt nhất trong hàng đợi với một ô ngẫu nhiên chưa có ô đã bắn ở gần,
+        nên mỗi nước đi chỉ tốn O(log n) thay vì duyệt cả lưới.
+        """
+        heap = self.heap
+        while heap and self.patterns.get(heap[0][2]) != heap[0][3]:  # Bỏ các mục đã cũ
+            heapq.heappop(heap)
+        candidates = []
+        if heap:
+            candidates.append((-heap[0][0], gamelogic.cell(heap[0][2])))
+        fresh = gamelogic.random_unshot(avoid=self.patterns)
+        if fresh is not None:
+            candidates.append((self.q_table[self.pattern(gamelogic, *fresh)], fresh))
+        if not candidates:
+            return None
+        best = max(value for value, _ in candidates)
+        return random.choice([move for value, move in candidates if value == best])
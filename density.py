@@ -0,0 +1,120 @@
+"""
+Bộ chọn mục tiêu theo mật độ vị trí đặt tàu (placement density).
+
+Mật độ của một ô là tổng trọng số của mọi vị trí đặt tàu hợp lệ phủ lên ô đó: vị trí đè
+lên ô bắn trượt có trọng số 0, vị trí phủ k ô trúng có trọng số HITWEIGHT ** k. Ô nào
+được nhiều vị trí đặt tàu phủ lên nhất thì được bắn trước.
+
+Bản đồ mật độ được cập nhật tăng dần: một phát bắn chỉ đổi trọng số của các vị trí đặt
+tàu đi qua ô đó (tối đa 2 * chiều dài vị trí cho mỗi chiều dài tàu), nên chi phí mỗi lượt
+không phụ thuộc kích thước lưới và bộ chọn vẫn dùng được trên lưới 1000x1000.
+"""
+import heapq
+import random
+from collections import Counter
+
+import numpy as np
+
+from engine import ROWS, COLS, SHIPLENGTHS
+
+HITWEIGHT = 4.0  # Hệ số ưu tiên cho mỗi ô trúng mà một vị trí đặt tàu phủ lên
+
+
+def coverage(size, length):
+    """Số đoạn liên tiếp length ô trên một đường size ô phủ lên từng vị trí của đường."""
+    positions = np.arange(size)
+    return np.clip(np.minimum(positions, size - length) - np.maximum(0, positions - length + 1) + 1, 0, None)
+
+
+def placementWeight(count, hits, misses):
+    """Trọng số của một vị trí đặt tàu (count tàu cùng chiều dài) phủ hits ô trúng và misses ô trượt."""
+    return 0.0 if misses else count * HITWEIGHT ** hits
+
+
+class DensityTargeter:
+    """Giữ bản đồ mật độ theo các ô trúng/trượt đã biết và chọn ô bắn tiếp theo."""
+
+    def __init__(self, rows=ROWS, cols=COLS, shiplengths=SHIPLENGTHS):
+        self.rows = rows
+        self.cols = cols
+        # Mỗi chiều dài chỉ cần xét một lần, nhân với số tàu có chiều dài đó
+        self.lengths = sorted(Counter(shiplengths.values()).items())
+        # Vị trí đặt tàu (chiều dài, ngang, hàng, cột) -> [số ô trúng, số ô trượt];
+        # chỉ các vị trí có ô đã bị bắn mới được lưu
+        self.placements = {}
+
+        # Mật độ ban đầu chỉ phụ thuộc khoảng cách tới mép lưới
+        initial = np.zeros((rows, cols))
+        for length, count in self.lengths:
+            initial += count * (coverage(rows, length)[:, None] + coverage(cols, length)[None, :])
+        self.initial = initial.ravel()
+        self.grid = self.initial.copy()
+        self.shot = np.zeros(rows * cols, dtype=bool)
+
+        # Các ô chưa đổi mật độ được lấy theo thứ tự mật độ ban đầu giảm dần (hòa thì ngẫu nhiên);
+        # các ô đã đổi mật độ nằm trong hàng đợi ưu tiên (-mật độ, khóa ngẫu nhiên, chỉ số ô)
+        self.order = np.lexsort((np.random.random(rows * cols), -self.initial))
+        self.cursor = 0
+        self.changed = np.zeros(rows * cols, dtype=bool)
+        self.heap = []
+
+    def _placementsThrough(self, row, col, length):
+        """Các vị trí đặt tàu dài length đi qua ô (row, col): (ngang, hàng đầu, cột đầu)."""
+        for start in range(max(0, col - length + 1), min(col, self.cols - length) + 1):
+            yield True, row, start
+        for start in range(max(0, row - length + 1), min(row, self.rows - length) + 1):
+            yield False, start, col
+
+    def record(self, row, col, hit):
+        """Ghi nhận kết quả phát bắn vào ô (row, col) và cập nhật mật độ các ô bị ảnh hưởng."""
+        index = row * self.cols + col
+        if self.shot[index]:
+            return
+        self.shot[index] = True
+        grid = self.grid.reshape(self.rows, self.cols)
+        touched = set()
+        for length, count in self.lengths:
+            for horizontal, startRow, startCol in self._placementsThrough(row, col, length):
+                state = self.placements.setdefault((length, horizontal, startRow, startCol), [0, 0])
+                before = placementWeight(count, *state)
+                state[0 if hit else 1] += 1
+                delta = placementWeight(count, *state) - before
+                if not delta:
+                    continue
+                if horizontal:
+                    grid[startRow, startCol:startCol + length] += delta
+                    touched.update(startRow * self.cols + c for c in range(startCol, startCol + length))
+                else:
+                    grid[startRow:startRow + length, startCol] += delta
+                    touched.update(r * self.cols + startCol for r in range(startRow, startRow + length))
+        for cell in touched:
+            if not self.shot[cell]:
+                self.changed[cell] = True
+                heapq.heappush(self.heap, (-self.grid[cell], random.random(), cell))
+
+    def density(self):
+        """Bản đồ mật độ (rows, cols); các ô đã bắn có mật độ 0."""
+        density = self.grid.copy()
+        density[self.shot] = 0
+        return density.reshape(self.rows, self.cols)
+
+    def choose(self):
+        """Chọn ô chưa bắn có mật độ cao nhất (hòa thì ngẫu nhiên); None nếu đã bắn hết."""
+        order = self.order
+        while self.cursor < len(order) and (self.changed[order[self.cursor]] or self.shot[order[self.cursor]]):
+            self.cursor += 1
+        heap = self.heap
+        while heap and (self.shot[heap[0][2]] or self.grid[heap[0][2]] != -heap[0][0]):  # Bỏ các mục đã cũ
+            heapq.heappop(heap)
+
+        candidates = []
+        if self.cursor < len(order):
+            cell = int(order[self.cursor])
+            candidates.append((self.initial[cell], cell))
+        if heap:
+            candidates.append((-heap[0][0], heap[0][2]))
+        if not candidates:
+            return None
+        best = max(value for value, _ in candidates)
+        _, cell = random.choice([candidate for candidate in candidates if candidate[0] == best])
+        return divmod(cell, self.cols)
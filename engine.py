@@ -0,0 +1,196 @@
+"""
+Lõi trò chơi Battleship chạy không cần pygame (headless).
+
+Gồm bàn cờ logic, hạm đội, xử lý phát bắn, luân phiên lượt và kiểm tra thắng thua.
+Không có màn hình, âm thanh hay TURNTIMER nên có thể chạy hàng nghìn ván mỗi giây
+trong kiểm thử và các tác vụ hàng loạt. FullOption.py chỉ là lớp hiển thị bên trên.
+"""
+import random
+
+from bitboard import BitBoard, EMPTY, SHIP
+
+ROWS = 10
+COLS = 10
+
+# Chiều dài (số ô) của từng tàu, cùng thứ tự với FLEET trong FullOption.py
+SHIPLENGTHS = {
+    'battleship': 4,
+    'cruiser': 4,
+    'destroyer': 3,
+    'patrol boat': 2,
+    'submarine': 3,
+    'carrier': 5,
+    'rescue ship': 2,
+}
+
+
+def createGameLogic(rows, cols):
+    """
+    Khởi tạo lưới trò chơi với các khoảng trống (' ') cho người chơi và máy.
+    Lưới là một BitBoard nhưng vẫn dùng được như list-of-lists (gamelogic[i][j]).
+    """
+    return BitBoard(rows, cols)
+
+
+def shipCells(row, col, length, horizontal):
+    """Trả về danh sách các ô mà một con tàu chiếm khi đặt tại (row, col)."""
+    if horizontal:
+        return [(row, col + i) for i in range(length)]
+    return [(row + i, col) for i in range(length)]
+
+
+def placementCount(rows, cols, length):
+    """Số vị trí đặt (ngang và dọc) của một tàu dài length nằm gọn trong lưới rows x cols."""
+    return rows * max(0, cols - length + 1) + max(0, rows - length + 1) * cols
+
+
+def placementAt(rows, cols, length, index):
+    """
+    Vị trí đặt thứ index của tàu dài length: (row, col, horizontal).
+    Các vị trí ngang được đánh số trước theo hàng, sau đó đến các vị trí dọc.
+    """
+    horizontalCount = rows * max(0, cols - length + 1)
+    if index < horizontalCount:
+        row, col = divmod(index, cols - length + 1)
+        return row, col, True
+    row, col = divmod(index - horizontalCount, cols)
+    return row, col, False
+
+
+def randomLayout(rows=ROWS, cols=COLS, shiplengths=SHIPLENGTHS, rng=random):
+    """
+    Sinh ngẫu nhiên một cách bố trí hạm đội hợp lệ (không chồng chéo, nằm gọn trong lưới).
+    Mỗi tàu chọn đều một trong mọi vị trí đặt; bố trí có tàu chồng nhau bị bỏ và sinh lại từ đầu,
+    nên mọi bố trí hợp lệ có xác suất như nhau. Sinh theo lô lớn: xem layouts.LayoutSampler.
+    Trả về dict: tên tàu -> danh sách ô.
+    """
+    counts = {name: placementCount(rows, cols, length) for name, length in shiplengths.items()}
+    if not all(counts.values()):
+        raise ValueError(f'Có tàu không vừa lưới {rows}x{cols}')
+    while True:
+        occupied = set()
+        layout = {}
+        for name, length in shiplengths.items():
+            row, col, horizontal = placementAt(rows, cols, length, rng.randrange(counts[name]))
+            cells = shipCells(row, col, length, horizontal)
+            if occupied.intersection(cells):
+                break  # Tàu chồng lên nhau: sinh lại toàn bộ
+            occupied.update(cells)
+            layout[name] = cells
+        else:
+            return layout
+
+
+def createBoard(layout, rows=ROWS, cols=COLS):
+    """Tạo bàn cờ logic và đánh dấu 'O' cho các ô có tàu theo layout."""
+    gamelogic = createGameLogic(rows, cols)
+    for cells in layout.values():
+        for row, col in cells:
+            gamelogic.set(row, col, SHIP)
+    return gamelogic
+
+
+class Occupancy:
+    """
+    Chỉ mục ô -> tàu của một bàn cờ, cập nhật theo từng tàu (O(chiều dài tàu)) khi tàu được
+    đặt, xoay hoặc đưa về chỗ cũ thay vì dựng lại cả bàn cờ. Các ô 'O' của gamelogic luôn
+    khớp với chỉ mục; các ô đã bị bắn ('T', 'X') không bị thay đổi.
+    """
+    def __init__(self, gamelogic):
+        self.gamelogic = gamelogic
+        self.cells = {}  # Tên tàu -> danh sách ô tàu đang chiếm
+        self.owners = {}  # Ô -> tập tên các tàu chiếm ô đó
+
+    def place(self, name, cells):
+        """Đặt (hoặc dời) tàu name vào các ô cells; cells rỗng nghĩa là tàu không nằm trên bàn cờ."""
+        self.remove(name)
+        if not cells:
+            return
+        self.cells[name] = list(cells)
+        for cell in cells:
+            self.owners.setdefault(cell, set()).add(name)
+            if self.gamelogic.is_unshot(*cell):
+                self.gamelogic.set(*cell, SHIP)
+
+    def remove(self, name):
+        """Gỡ tàu name khỏi bàn cờ."""
+        for cell in self.cells.pop(name, ()):
+            owners = self.owners[cell]
+            owners.discard(name)
+            if not owners:
+                del self.owners[cell]
+                if self.gamelogic.is_unshot(*cell):
+                    self.gamelogic.set(*cell, EMPTY)
+
+    def collides(self, name, cells):
+        """Các ô cells có bị tàu nào khác ngoài name chiếm không."""
+        return any(self.owners.get(cell, {name}) - {name} for cell in cells)
+
+    def rebind(self, gamelogic):
+        """Chuyển chỉ mục sang bàn cờ mới (ván mới) và đánh dấu lại các ô có tàu."""
+        self.gamelogic = gamelogic
+        for cell in self.owners:
+            if gamelogic.is_unshot(*cell):
+                gamelogic.set(*cell, SHIP)
+
+
+def isUnshot(gamelogic, row, col):
+    """Ô (row, col) chưa bị bắn (trống hoặc có tàu)."""
+    return gamelogic.is_unshot(row, col)
+
+
+def fireShot(gamelogic, row, col):
+    """
+    Bắn vào ô (row, col) và cập nhật bàn cờ:
+    - Trả về 'Hit' nếu trúng tàu, 'Miss' nếu trượt.
+    - Trả về None nếu ô đã bị bắn trước đó (bàn cờ không thay đổi).
+    """
+    return gamelogic.fire(row, col)
+
+
+def checkForWinners(grid):
+    """Trả về True nếu không còn ô tàu nào chưa bị bắn trúng (O(1) trên BitBoard)."""
+    return grid.all_sunk()
+
+
+class Game:
+    """
+    Trận đấu headless: players[i] lần lượt tấn công boards[i].
+    Mỗi người chơi cần có thuộc tính turn và phương thức make_attack(gamelogic)
+    giống các lớp máy trong computers.py.
+    """
+    def __init__(self, players, boards):
+        self.players = players
+        self.boards = boards
+        self.current = 0  # Chỉ số người chơi đang có lượt
+        self.shots = [0] * len(players)  # Số phát bắn của từng người chơi
+        self.winner = None
+
+    def step(self):
+        """Thực hiện một lượt; trả về chỉ số người thắng (hoặc None nếu chưa kết thúc)."""
+        player, board = self.players[self.current], self.boards[self.current]
+        player.turn = True
+        player.make_attack(board)
+        if player.turn:
+            raise RuntimeError(f'{type(player).__name__} không thực hiện được nước đi')
+        self.shots[self.current] += 1
+        if checkForWinners(board):
+            self.winner = self.current
+        else:
+            self.current = (self.current + 1) % len(self.players)
+        return self.winner
+
+    def play(self, maxShots=None):
+        """Chơi cho đến khi có người thắng hoặc vượt quá maxShots phát bắn mỗi người."""
+        while self.winner is None:
+            if maxShots is not None and self.shots[self.current] >= maxShots:
+                break
+            self.step()
+        return self.winner
+
+
+def playGame(computer, gamelogic, maxShots=None):
+    """Cho một máy bắn vào một bàn cờ đến khi chìm hết tàu; trả về số phát bắn."""
+    game = Game([computer], [gamelogic])
+    game.play(maxShots)
+    return game.shots[0]
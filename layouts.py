@@ -0,0 +1,110 @@
+"""
+Bộ sinh bố trí hạm đội ngẫu nhiên theo lô bằng NumPy (không cần pygame).
+
+Mỗi tàu chọn đều một vị trí trong tất cả các vị trí đặt nằm gọn trong lưới; lô bố trí có
+tàu chồng lên nhau bị loại bỏ cả bố trí (rejection sampling), nên mọi bố trí hợp lệ có xác
+suất như nhau. Việc kiểm tra chồng lấn được làm cho cả lô cùng lúc:
+- Lưới nhỏ (tối đa MASKCELLS ô): mỗi vị trí đặt là mặt nạ bit vài từ uint64, chồng lấn = AND khác 0.
+- Lưới lớn: sắp xếp chỉ số ô của cả hạm đội trong từng bố trí và tìm ô trùng nhau.
+
+Một bố trí được biểu diễn bằng chỉ số vị trí đặt của từng tàu (theo thứ tự trong shiplengths);
+chỉ đổi sang ô/tọa độ khi cần (layouts, occupancy, cells).
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from engine import ROWS, COLS, SHIPLENGTHS, placementCount, placementAt, shipCells
+
+MASKCELLS = 256  # Lưới có tối đa ngần này ô dùng mặt nạ bit để kiểm tra chồng lấn
+
+
+@lru_cache(maxsize=None)
+def placementCells(rows, cols, length):
+    """Chỉ số ô (P, length) của mọi vị trí đặt tàu dài length, cùng thứ tự với placementAt."""
+    horizontal = np.arange(rows * cols).reshape(rows, cols)
+    cells = [horizontal[:, offset:offset + length] for offset in range(cols - length + 1)]
+    cells = [np.stack(cells, axis=1).reshape(-1, length)] if cells else []
+    vertical = [horizontal[offset:offset + length, :].T for offset in range(rows - length + 1)]
+    if vertical:
+        cells.append(np.stack(vertical, axis=0).reshape(-1, length))
+    cells = np.concatenate(cells) if cells else np.empty((0, length), dtype=np.int64)
+    cells.setflags(write=False)
+    return cells
+
+
+@lru_cache(maxsize=None)
+def placementMasks(rows, cols, length):
+    """Mặt nạ bit (P, số từ uint64) của mọi vị trí đặt tàu dài length."""
+    cells = placementCells(rows, cols, length)
+    masks = np.zeros((len(cells), (rows * cols + 63) // 64), dtype=np.uint64)
+    placements = np.repeat(np.arange(len(cells)), length)
+    flat = cells.ravel()
+    np.bitwise_or.at(masks, (placements, flat // 64), np.left_shift(np.uint64(1), (flat % 64).astype(np.uint64)))
+    masks.setflags(write=False)
+    return masks
+
+
+class LayoutSampler:
+    """Sinh các bố trí hạm đội hợp lệ, phân bố đều, theo lô."""
+
+    def __init__(self, rows=ROWS, cols=COLS, shiplengths=SHIPLENGTHS):
+        self.rows = rows
+        self.cols = cols
+        self.names = list(shiplengths)
+        self.lengths = [shiplengths[name] for name in self.names]
+        self.counts = [placementCount(rows, cols, length) for length in self.lengths]
+        if not all(self.counts):
+            raise ValueError(f'Có tàu không vừa lưới {rows}x{cols}')
+        self.useMasks = rows * cols <= MASKCELLS
+        self.acceptance = 0.5  # Tỷ lệ bố trí hợp lệ ước lượng, dùng để chọn cỡ lô
+
+    def sample(self, count, rng=None):
+        """count bố trí hợp lệ: mảng (count, số tàu) chỉ số vị trí đặt của từng tàu."""
+        if rng is None:
+            # Lấy seed từ np.random để np.random.seed(...) vẫn làm kết quả lặp lại được
+            rng = np.random.default_rng(np.random.randint(2 ** 32))
+        chunks, found = [], 0
+        while found < count:
+            batch = max(16, int((count - found) / self.acceptance * 1.2))
+            candidates = np.stack([rng.integers(0, total, batch) for total in self.counts], axis=1)
+            valid = candidates[self._valid(candidates)]
+            self.acceptance = max(len(valid) / batch, 0.01)
+            chunks.append(valid)
+            found += len(valid)
+        return np.concatenate(chunks)[:count]
+
+    def _valid(self, candidates):
+        """Mặt nạ các bố trí không có tàu chồng lên nhau."""
+        if self.useMasks:
+            occupied = np.zeros((len(candidates), (self.rows * self.cols + 63) // 64), dtype=np.uint64)
+            overlap = np.zeros(len(candidates), dtype=bool)
+            for ship, length in enumerate(self.lengths):
+                masks = placementMasks(self.rows, self.cols, length)[candidates[:, ship]]
+                overlap |= (occupied & masks).any(axis=1)
+                occupied |= masks
+            return ~overlap
+        cells = np.sort(self.cells(candidates), axis=1)
+        return ~(cells[:, 1:] == cells[:, :-1]).any(axis=1)
+
+    def cells(self, layouts):
+        """Chỉ số ô (row * cols + col) của cả hạm đội: mảng (số bố trí, tổng chiều dài các tàu)."""
+        return np.concatenate([placementCells(self.rows, self.cols, length)[layouts[:, ship]]
+                               for ship, length in enumerate(self.lengths)], axis=1)
+
+    def occupancy(self, layouts):
+        """Bản đồ ô có tàu: mảng bool (số bố trí, rows, cols)."""
+        occupied = np.zeros((len(layouts), self.rows * self.cols), dtype=bool)
+        occupied[np.arange(len(layouts))[:, None], self.cells(layouts)] = True
+        return occupied.reshape(len(layouts), self.rows, self.cols)
+
+    def layouts(self, layouts):
+        """Đổi lô bố trí sang dạng dict tên tàu -> danh sách ô như randomLayout."""
+        result = []
+        for layout in layouts.tolist():
+            fleet = {}
+            for name, length, index in zip(self.names, self.lengths, layout):
+                row, col, horizontal = placementAt(self.rows, self.cols, length, index)
+                fleet[name] = shipCells(row, col, length, horizontal)
+            result.append(fleet)
+        return result
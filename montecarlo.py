@@ -0,0 +1,206 @@
+"""
+Bộ chọn mục tiêu Monte Carlo: lấy mẫu các bố trí hạm đội khớp với các ô trúng/trượt đã biết.
+
+Giữ một lô N bố trí (mảng (N, số tàu) chỉ số vị trí đặt như layouts.LayoutSampler) cùng bản đồ
+số tàu phủ lên từng ô (N, rows * cols). Xác suất hậu nghiệm có tàu ở một ô là tỷ lệ các bố trí
+hợp lệ phủ lên ô đó; ô chưa bắn có xác suất cao nhất được bắn trước.
+
+Lô mẫu được cập nhật tăng dần qua các lượt:
+- Kết quả phát bắn mới chỉ loại bỏ các mẫu không còn khớp; mẫu còn lại vẫn dùng được.
+- Chỗ trống được lấp bằng bản sao của các mẫu còn khớp, rồi cả lô được xáo trộn bằng các lượt
+  lấy mẫu Gibbs: lần lượt gỡ từng tàu và đặt lại đều vào một vị trí không chạm ô trượt, không
+  đè tàu khác và phủ mọi ô trúng mà các tàu khác chưa phủ. Với mẫu chưa khớp, tàu được đặt vào
+  vị trí phủ nhiều ô trúng chưa được phủ nhất, nên mẫu dần được sửa cho khớp.
+- Nếu cả lô không còn mẫu khớp, một bố trí khớp được dựng lại bằng quay lui rồi nhân bản ra cả lô.
+Mỗi lượt Gibbs là vài phép nhân ma trận cho cả lô và chỉ chạy trong time_budget giây mỗi nước đi.
+"""
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from engine import ROWS, COLS, SHIPLENGTHS
+from layouts import LayoutSampler, placementCells
+
+MAXCELLS = 400  # Lưới lớn hơn thì ma trận (số mẫu, số vị trí đặt) quá lớn, dùng DensityTargeter
+BLOCKED = -1000.0  # Điểm của vị trí đặt chạm ô trượt hoặc đè tàu khác
+
+
+@lru_cache(maxsize=None)
+def placementMatrix(rows, cols, length):
+    """Ma trận (số vị trí đặt, rows * cols): 1 nếu vị trí đặt tàu dài length phủ ô đó."""
+    cells = placementCells(rows, cols, length)
+    matrix = np.zeros((len(cells), rows * cols), dtype=np.float32)
+    matrix[np.arange(len(cells))[:, None], cells] = 1
+    matrix.setflags(write=False)
+    return matrix
+
+
+@lru_cache(maxsize=None)
+def placementBits(rows, cols, length):
+    """
+    Mặt nạ bit (số nguyên Python) của mọi vị trí đặt tàu dài length,
+    và với mỗi ô, danh sách các vị trí đặt phủ lên ô đó.
+    """
+    masks, covering = [], [[] for _ in range(rows * cols)]
+    for placement, cells in enumerate(placementCells(rows, cols, length).tolist()):
+        masks.append(sum(1 << cell for cell in cells))
+        for cell in cells:
+            covering[cell].append(placement)
+    return masks, covering
+
+
+class PosteriorSampler:
+    """Giữ lô bố trí khớp với các phát bắn đã biết và chọn ô có xác suất có tàu cao nhất."""
+
+    samples = 2000  # Số bố trí trong lô
+    time_budget = 0.2  # Thời gian lấy mẫu tối đa cho mỗi nước đi (giây)
+    sweeps = 2  # Số lượt Gibbs tối thiểu sau khi lô có bản sao
+
+    def __init__(self, rows=ROWS, cols=COLS, shiplengths=SHIPLENGTHS, rng=None):
+        self.rows = rows
+        self.cols = cols
+        # Lấy seed từ np.random để np.random.seed(...) vẫn làm kết quả lặp lại được
+        self.rng = rng or np.random.default_rng(np.random.randint(2 ** 32))
+        sampler = LayoutSampler(rows, cols, shiplengths)
+        self.lengths = sampler.lengths
+        self.layouts = sampler.sample(self.samples, self.rng)
+        self.cover = np.zeros((self.samples, rows * cols), dtype=np.int8)  # Số tàu phủ lên từng ô
+        self.cover[np.arange(self.samples)[:, None], sampler.cells(self.layouts)] = 1
+        self.hit = np.zeros(rows * cols, dtype=bool)
+        self.miss = np.zeros(rows * cols, dtype=bool)
+        self.valid = np.ones(self.samples, dtype=bool)  # Mẫu khớp với mọi phát bắn đã biết
+        self.mixed = True  # Lô không chứa bản sao chưa được xáo trộn
+
+    def record(self, row, col, hit):
+        """Ghi nhận kết quả phát bắn vào ô (row, col) và loại các mẫu không còn khớp."""
+        index = row * self.cols + col
+        (self.hit if hit else self.miss)[index] = True
+        self.valid &= (self.cover[:, index] > 0) == hit
+
+    def _consistent(self):
+        """Mặt nạ các mẫu phủ mọi ô trúng và không phủ ô trượt nào."""
+        covered = self.cover > 0
+        return covered[:, self.hit].all(axis=1) & ~covered[:, self.miss].any(axis=1)
+
+    def _replenish(self):
+        """Thay các mẫu không khớp bằng bản sao ngẫu nhiên của các mẫu còn khớp."""
+        good = np.flatnonzero(self.valid)
+        bad = np.flatnonzero(~self.valid)
+        if not len(good) or not len(bad):
+            return
+        source = self.rng.choice(good, len(bad))
+        self.layouts[bad] = self.layouts[source]
+        self.cover[bad] = self.cover[source]
+        self.valid[bad] = True
+        self.mixed = False
+
+    def _construct(self, deadline):
+        """
+        Tìm một bố trí khớp với mọi phát bắn bằng quay lui (phủ lần lượt từng ô trúng chưa được phủ,
+        các tàu còn lại đặt ngẫu nhiên); None nếu hết thời gian. Dùng khi cả lô không còn mẫu khớp.
+        """
+        bits = [placementBits(self.rows, self.cols, length) for length in self.lengths]
+        misses = sum(1 << int(cell) for cell in np.flatnonzero(self.miss))
+        hits = sum(1 << int(cell) for cell in np.flatnonzero(self.hit))
+        layout = [None] * len(self.lengths)
+
+        def place(occupied, uncovered):
+            if time.perf_counter() > deadline:
+                return False
+            free = [ship for ship, placement in enumerate(layout) if placement is None]
+            if sum(self.lengths[ship] for ship in free) < bin(uncovered).count('1'):
+                return False
+            if not uncovered:  # Mọi ô trúng đã được phủ: đặt ngẫu nhiên các tàu còn lại
+                for ship in free:
+                    masks = bits[ship][0]
+                    options = [p for p, mask in enumerate(masks) if not mask & (occupied | misses)]
+                    if not options:
+                        for other in free:
+                            layout[other] = None
+                        return False
+                    layout[ship] = options[self.rng.integers(len(options))]
+                    occupied |= masks[layout[ship]]
+                return True
+            cell = (uncovered & -uncovered).bit_length() - 1
+            tried = set()
+            for ship in self.rng.permutation(free).tolist():
+                if self.lengths[ship] in tried:  # Tàu cùng chiều dài cho cùng các nhánh
+                    continue
+                tried.add(self.lengths[ship])
+                masks, covering = bits[ship]
+                for placement in self.rng.permutation(covering[cell]).tolist():
+                    mask = masks[placement]
+                    if mask & (occupied | misses):
+                        continue
+                    layout[ship] = placement
+                    if place(occupied | mask, uncovered & ~mask):
+                        return True
+                    layout[ship] = None
+            return False
+
+        return np.array(layout) if place(0, hits) else None
+
+    def _sweep(self):
+        """Một lượt Gibbs: đặt lại lần lượt từng tàu của mọi mẫu trong lô."""
+        everyone = np.arange(self.samples)[:, None]
+        for ship, length in enumerate(self.lengths):
+            cells = placementCells(self.rows, self.cols, length)
+            current = cells[self.layouts[:, ship]]
+            self.cover[everyone, current] -= 1  # Gỡ tàu ra khỏi mẫu
+            others = self.cover > 0
+            # Điểm của ô: +1 nếu là ô trúng chưa có tàu khác phủ, BLOCKED nếu là ô trượt hoặc có tàu khác
+            value = np.where(others | self.miss, np.float32(BLOCKED), (self.hit & ~others).astype(np.float32))
+            score = value @ placementMatrix(self.rows, self.cols, length).T
+            # Chọn đều trong các vị trí có điểm cao nhất: nhiễu nhỏ hơn 1 chỉ phá thế hòa
+            choice = np.argmax(score + self.rng.random(score.shape, dtype=np.float32) * 0.5, axis=1)
+            stuck = score[np.arange(self.samples), choice] < 0  # Không còn chỗ trống: giữ nguyên vị trí cũ
+            choice[stuck] = self.layouts[stuck, ship]
+            self.layouts[:, ship] = choice
+            self.cover[everyone, cells[choice]] += 1
+
+    def update(self):
+        """Lấp và xáo trộn lô mẫu cho tới khi đủ mẫu khớp hoặc hết thời gian của nước đi."""
+        deadline = time.perf_counter() + self.time_budget
+        sweeps = 0
+        self._replenish()
+        if not self.valid.any():
+            layout = self._construct(deadline)
+            if layout is not None:
+                everyone = np.arange(self.samples)[:, None]
+                self.layouts[:] = layout
+                self.cover[:] = 0
+                for length, placement in zip(self.lengths, layout):
+                    self.cover[everyone, placementCells(self.rows, self.cols, length)[placement]] += 1
+                self.valid[:] = True
+                self.mixed = False
+        while not (self.valid.all() and (self.mixed or sweeps >= self.sweeps)):
+            if time.perf_counter() > deadline:
+                break
+            self._sweep()
+            sweeps += 1
+            self.valid = self._consistent()
+            self._replenish()
+        if sweeps >= self.sweeps:
+            self.mixed = True
+
+    def posterior(self):
+        """Xác suất có tàu của từng ô (rows, cols) theo các mẫu khớp; None nếu chưa có mẫu khớp."""
+        if not self.valid.any():
+            return None
+        probability = (self.cover[self.valid] > 0).mean(axis=0)
+        return probability.reshape(self.rows, self.cols)
+
+    def choose(self):
+        """Chọn ô chưa bắn có xác suất có tàu cao nhất (hòa thì ngẫu nhiên); None nếu chưa có mẫu khớp."""
+        self.update()
+        probability = self.posterior()
+        if probability is None:
+            return None
+        probability = probability.ravel()
+        unshot = ~(self.hit | self.miss)
+        if not unshot.any():
+            return None
+        best = probability[unshot].max()
+        cell = self.rng.choice(np.flatnonzero(unshot & (probability == best)))
+        return divmod(int(cell), self.cols)
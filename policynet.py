@@ -0,0 +1,133 @@
+"""
+Mạng nơ-ron nhỏ viết bằng NumPy cho chế độ NeuralNetwork.
+
+Đầu vào của mỗi ô là cửa sổ WINDOW x WINDOW ô quanh nó, mã hóa one-hot thành 3 mặt phẳng
+chưa biết / trúng / trượt (ô ngoài lưới được coi là trượt). Mạng là một MLP áp dụng cho mọi ô
+(tương đương một lớp tích chập WINDOW x WINDOW rồi các lớp tích chập 1x1), đầu ra là logit xác
+suất ô đó có tàu. Số tham số cố định (vài nghìn) nên bộ nhớ không phụ thuộc số ván đã chơi,
+và cùng một bộ trọng số dùng được cho mọi kích thước lưới.
+
+Trọng số được huấn luyện bằng policytraining.py và lưu thành tệp .npz nhỏ.
+"""
+import os
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+UNKNOWN, HITCELL, MISSCELL = 0, 1, 2  # Mã trạng thái ô trên bàn cờ có viền (viền = trượt)
+WINDOW = 5  # Kích thước cửa sổ quanh mỗi ô
+RADIUS = WINDOW // 2  # Độ rộng viền của bàn cờ
+FEATURES = WINDOW * WINDOW * 3
+
+
+def emptyStates(count, rows, cols):
+    """count bàn cờ trống có viền RADIUS ô trượt: mảng int8 (count, rows + 2R, cols + 2R)."""
+    states = np.full((count, rows + 2 * RADIUS, cols + 2 * RADIUS), MISSCELL, dtype=np.int8)
+    states[:, RADIUS:-RADIUS, RADIUS:-RADIUS] = UNKNOWN
+    return states
+
+
+def encode(windows):
+    """Mã hóa one-hot các cửa sổ (..., WINDOW, WINDOW) thành đặc trưng float32 (số cửa sổ, FEATURES)."""
+    codes = windows.reshape(-1, WINDOW * WINDOW)
+    return (codes[:, :, None] == np.arange(3, dtype=np.int8)).reshape(-1, FEATURES).astype(np.float32)
+
+
+def boardFeatures(states):
+    """Đặc trưng của mọi ô trên một lô bàn cờ có viền: (lô * rows * cols, FEATURES), theo hàng."""
+    return encode(sliding_window_view(states, (WINDOW, WINDOW), axis=(1, 2)))
+
+
+def cellFeatures(state, rows, cols):
+    """Đặc trưng của các ô (rows[i], cols[i]) trên một bàn cờ có viền: (số ô, FEATURES)."""
+    return encode(sliding_window_view(state, (WINDOW, WINDOW))[rows, cols])
+
+
+class PolicyNetwork:
+    """MLP (FEATURES -> hidden... -> 1) với ReLU; huấn luyện bằng Adam trên entropy chéo nhị phân."""
+
+    def __init__(self, hidden=(64, 32), seed=None):
+        rng = np.random.default_rng(seed)
+        sizes = [FEATURES, *hidden, 1]
+        # Khởi tạo He cho các lớp ReLU
+        self.weights = [(rng.standard_normal((fanIn, fanOut)) * np.sqrt(2 / fanIn)).astype(np.float32)
+                        for fanIn, fanOut in zip(sizes[:-1], sizes[1:])]
+        self.biases = [np.zeros(fanOut, dtype=np.float32) for fanOut in sizes[1:]]
+        self._moments = None  # Trạng thái Adam, chỉ tạo khi huấn luyện
+        self.steps = 0
+
+    @property
+    def parameters(self):
+        return self.weights + self.biases
+
+    def forward(self, features):
+        """Logit có tàu của từng hàng đặc trưng: (N, FEATURES) -> (N,)."""
+        activation = features
+        for weight, bias in zip(self.weights[:-1], self.biases[:-1]):
+            activation = np.maximum(activation @ weight + bias, 0)
+        return (activation @ self.weights[-1] + self.biases[-1])[:, 0]
+
+    def predict(self, states):
+        """Xác suất có tàu của mọi ô trên một lô bàn cờ có viền: (lô, rows, cols)."""
+        count, height, width = states.shape
+        logits = self.forward(boardFeatures(states))
+        return (1 / (1 + np.exp(-logits))).reshape(count, height - 2 * RADIUS, width - 2 * RADIUS)
+
+    def train_step(self, features, targets, learning_rate=1e-3, beta1=0.9, beta2=0.999):
+        """Một bước Adam trên lô (features, targets 0/1); trả về entropy chéo trung bình trước bước cập nhật."""
+        activations = [features]
+        for weight, bias in zip(self.weights[:-1], self.biases[:-1]):
+            activations.append(np.maximum(activations[-1] @ weight + bias, 0))
+        logits = (activations[-1] @ self.weights[-1] + self.biases[-1])[:, 0]
+        probability = 1 / (1 + np.exp(-logits))
+        loss = float(np.mean(np.logaddexp(0, logits) - targets * logits))
+
+        # Lan truyền ngược
+        delta = ((probability - targets) / len(targets))[:, None].astype(np.float32)
+        gradients = []
+        for layer in range(len(self.weights) - 1, -1, -1):
+            gradients.append((layer, activations[layer].T @ delta, delta.sum(axis=0)))
+            if layer:
+                delta = (delta @ self.weights[layer].T) * (activations[layer] > 0)
+
+        if self._moments is None:
+            self._moments = [(np.zeros_like(p), np.zeros_like(p)) for p in self.parameters]
+        self.steps += 1
+        correction = np.sqrt(1 - beta2 ** self.steps) / (1 - beta1 ** self.steps)
+        layers = len(self.weights)
+        for layer, weightGradient, biasGradient in gradients:
+            for index, parameter, gradient in ((layer, self.weights[layer], weightGradient),
+                                               (layers + layer, self.biases[layer], biasGradient)):
+                first, second = self._moments[index]
+                first *= beta1
+                first += (1 - beta1) * gradient
+                second *= beta2
+                second += (1 - beta2) * gradient * gradient
+                parameter -= learning_rate * correction * first / (np.sqrt(second) + 1e-8)
+        return loss
+
+    def save(self, path):
+        """Ghi trọng số ra path (.npz) qua tệp tạm để tệp cũ không bị hỏng nếu bị ngắt giữa chừng."""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        temporary = path + '.tmp.npz'
+        arrays = {f'weight{layer}': weight for layer, weight in enumerate(self.weights)}
+        arrays.update({f'bias{layer}': bias for layer, bias in enumerate(self.biases)})
+        np.savez_compressed(temporary, window=WINDOW, steps=self.steps, **arrays)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        """Đọc mạng từ tệp .npz do save() ghi ra; ValueError nếu tệp không khớp cấu trúc mạng."""
+        with np.load(path) as weights:
+            if int(weights['window']) != WINDOW:
+                raise ValueError(f'Cửa sổ {int(weights["window"])} khác {WINDOW}')
+            layers = sum(name.startswith('weight') for name in weights.files)
+            network = cls(hidden=())
+            network.weights = [weights[f'weight{layer}'].astype(np.float32) for layer in range(layers)]
+            network.biases = [weights[f'bias{layer}'].astype(np.float32) for layer in range(layers)]
+            network.steps = int(weights['steps'])
+        if network.weights[0].shape[0] != FEATURES or network.weights[-1].shape[1] != 1:
+            raise ValueError('Kích thước trọng số không khớp')
+        return network
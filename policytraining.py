@@ -0,0 +1,102 @@
+"""
+Huấn luyện mạng PolicyNetwork của chế độ NeuralNetwork bằng tự chơi (self-play) không cần pygame.
+
+Một lô batch ván được chơi theo từng bước (lock-step): mỗi bước mạng dự đoán xác suất có tàu của
+mọi ô trong cả lô bằng một lần lan truyền xuôi, mỗi ván bắn ô chưa bắn có xác suất cao nhất
+(ε-greedy), và mạng được cập nhật trên một mẫu ngẫu nhiên các ô chưa bắn với nhãn là bố trí thật
+của ván (học có giám sát trên chính các bàn cờ mà chính sách hiện tại gặp). Ván nào xong được thay
+ngay bằng bố trí mới từ layouts.LayoutSampler nên lô luôn đầy.
+
+Cách dùng:
+    python policytraining.py --steps 3000
+    python policytraining.py --steps 1000 --resume --learning-rate 3e-4
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from computers import NNCOMPUTER
+from engine import ROWS, COLS
+from layouts import LayoutSampler
+from policynet import RADIUS, UNKNOWN, HITCELL, MISSCELL, PolicyNetwork, boardFeatures, emptyStates
+
+
+def train(steps, path=NNCOMPUTER.weights, rows=ROWS, cols=COLS, batch=1024, samples=8192,
+          epsilon=0.1, learning_rate=1e-3, seed=0, resume=False, reportEvery=100):
+    """Huấn luyện steps bước, ghi trọng số ra path sau mỗi reportEvery bước; trả về mạng đã huấn luyện."""
+    rng = np.random.default_rng(seed)
+    network = PolicyNetwork.load(path) if resume and os.path.exists(path) else PolicyNetwork(seed=seed)
+    sampler = LayoutSampler(rows, cols)
+    cells = rows * cols
+    everyone = np.arange(batch)
+
+    states = emptyStates(batch, rows, cols)
+    ships = sampler.occupancy(sampler.sample(batch, rng)).reshape(batch, cells)
+    remaining = ships.sum(axis=1)
+    shots = np.zeros(batch, dtype=np.int64)
+    losses, finished, totalShots = [], 0, 0
+    start = time.perf_counter()
+
+    for step in range(1, steps + 1):
+        features = boardFeatures(states)
+        unshot = states[:, RADIUS:-RADIUS, RADIUS:-RADIUS].reshape(batch, cells) == UNKNOWN
+
+        # Cập nhật mạng trên một mẫu các ô chưa bắn của cả lô
+        candidates = np.flatnonzero(unshot)
+        chosen = candidates[rng.integers(0, len(candidates), min(samples, len(candidates)))]
+        losses.append(network.train_step(features[chosen], ships.ravel()[chosen].astype(np.float32),
+                                         learning_rate))
+
+        # ε-greedy trên xác suất dự đoán; khám phá = ô chưa bắn ngẫu nhiên
+        values = np.where(unshot, network.forward(features).reshape(batch, cells), -np.inf)
+        noise = rng.random((batch, cells), dtype=np.float32)
+        greedy = np.argmax(values, axis=1)
+        explore = np.argmax(np.where(unshot, noise, -1), axis=1)
+        actions = np.where(rng.random(batch) < epsilon, explore, greedy)
+
+        hit = ships[everyone, actions]
+        rowsShot, colsShot = np.divmod(actions, cols)
+        states[everyone, rowsShot + RADIUS, colsShot + RADIUS] = np.where(hit, HITCELL, MISSCELL)
+        remaining -= hit
+        shots += 1
+
+        # Ván kết thúc được thay bằng ván mới
+        done = np.flatnonzero(remaining == 0)
+        if len(done):
+            finished += len(done)
+            totalShots += int(shots[done].sum())
+            states[done] = emptyStates(len(done), rows, cols)
+            ships[done] = sampler.occupancy(sampler.sample(len(done), rng)).reshape(len(done), cells)
+            remaining[done] = ships[done].sum(axis=1)
+            shots[done] = 0
+
+        if step % reportEvery == 0 or step == steps:
+            network.save(path)
+            print(f'Bước {step}: loss {np.mean(losses):.4f}, {finished} ván, trung bình '
+                  f'{totalShots / max(finished, 1):.2f} phát/ván (ε = {epsilon}), {time.perf_counter() - start:.1f}s')
+            losses, finished, totalShots = [], 0, 0
+    return network
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Huấn luyện mạng nơ-ron của chế độ NeuralNetwork bằng tự chơi.')
+    parser.add_argument('--steps', type=int, default=3000, help='số bước huấn luyện')
+    parser.add_argument('--batch', type=int, default=1024, help='số ván chạy đồng thời')
+    parser.add_argument('--samples', type=int, default=8192, help='số ô dùng để cập nhật mạng mỗi bước')
+    parser.add_argument('--epsilon', type=float, default=0.1, help='xác suất khám phá khi huấn luyện')
+    parser.add_argument('--learning-rate', type=float, default=1e-3, help='hệ số học của Adam')
+    parser.add_argument('--seed', type=int, default=0, help='seed cho bố trí hạm đội, khám phá và khởi tạo mạng')
+    parser.add_argument('--rows', type=int, default=ROWS, help='số hàng của lưới')
+    parser.add_argument('--cols', type=int, default=COLS, help='số cột của lưới')
+    parser.add_argument('--output', default=NNCOMPUTER.weights, help='tệp trọng số (.npz)')
+    parser.add_argument('--resume', action='store_true', help='tiếp tục từ tệp trọng số đã có')
+    args = parser.parse_args()
+
+    train(args.steps, args.output, args.rows, args.cols, args.batch, args.samples,
+          args.epsilon, args.learning_rate, args.seed, args.resume)
+
+
+if __name__ == '__main__':
+    main()
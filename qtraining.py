@@ -0,0 +1,185 @@
+"""
+Huấn luyện ngoại tuyến bảng Q của NRCOMPUTER bằng tự chơi (self-play) không cần pygame.
+
+Mỗi tiến trình chạy song song một lô batch ván theo từng bước (lock-step) bằng NumPy: mẫu lân cận
+của mọi ô trong cả lô được tính cùng lúc, mỗi ván chọn ô theo ε-greedy trên bảng Q, và cập nhật
+Q-Learning của cả lô được gộp lại (trung bình sai số TD theo từng mẫu) trước khi áp dụng. Ván nào
+xong được thay ngay bằng bố trí mới từ layouts.LayoutSampler nên lô luôn đầy.
+
+Sau mỗi vòng, thay đổi bảng Q của các tiến trình được lấy trung bình rồi cộng vào bảng chung,
+và bảng được ghi ra checkpoint (.npz); NRCOMPUTER.load() đọc lại checkpoint này.
+
+Cách dùng:
+    python qtraining.py --episodes 2000000
+    python qtraining.py --episodes 500000 --workers 4 --resume
+"""
+import argparse
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from computers import NRCOMPUTER, PATTERNOFFSETS, PATTERNS
+from engine import ROWS, COLS
+from layouts import LayoutSampler
+
+UNKNOWN, HITCELL, MISSCELL = 0, 1, 2  # Chữ số hệ 3 của một ô trong mẫu lân cận (ngoài lưới = trượt)
+
+
+def patternCodes(states, rows, cols):
+    """Chỉ số mẫu lân cận của mọi ô: states (lô, rows + 4, cols + 4) có viền 2 ô -> (lô, rows * cols)."""
+    codes = np.zeros((len(states), rows, cols), dtype=np.int32)
+    for digit, (dr, dc) in enumerate(PATTERNOFFSETS):
+        codes += states[:, 2 + dr:2 + dr + rows, 2 + dc:2 + dc + cols] * np.int32(3 ** digit)
+    return codes.reshape(len(states), rows * cols)
+
+
+def selfPlay(q_table, episodes, seed, rows=ROWS, cols=COLS, batch=4096,
+             epsilon=0.1, learning_rate=0.1, discount_factor=0.9):
+    """
+    Chơi episodes ván từ bảng q_table (không sửa bảng gốc) và học trong lúc chơi;
+    trả về (bảng Q mới, số ván đã xong, tổng số phát bắn của các ván đó).
+    """
+    rng = np.random.default_rng(seed)
+    q_table = q_table.astype(np.float32)
+    sampler = LayoutSampler(rows, cols)
+    cells = rows * cols
+    batch = min(batch, episodes)
+    everyone = np.arange(batch)
+
+    def newGames(count):
+        """Bàn cờ trống (viền = trượt) và bản đồ tàu của count ván mới."""
+        states = np.full((count, rows + 4, cols + 4), MISSCELL, dtype=np.int8)
+        states[:, 2:-2, 2:-2] = UNKNOWN
+        ships = sampler.occupancy(sampler.sample(count, rng)).reshape(count, cells)
+        return states, ships
+
+    states, ships = newGames(batch)
+    remaining = ships.sum(axis=1)
+    shots = np.zeros(batch, dtype=np.int64)
+    # Nước đi trước của từng ván, chờ giá trị max Q của trạng thái sau để cập nhật
+    lastPattern = np.zeros(batch, dtype=np.int64)
+    lastReward = np.zeros(batch, dtype=np.float32)
+    pending = np.zeros(batch, dtype=bool)
+    finished = totalShots = 0
+
+    while finished < episodes:
+        codes = patternCodes(states, rows, cols)
+        unshot = states[:, 2:-2, 2:-2].reshape(batch, cells) == UNKNOWN
+        values = np.where(unshot, q_table[codes], -np.inf)
+
+        # Cập nhật Q-Learning gộp cho nước đi trước: trung bình sai số TD của các ván cùng mẫu
+        if pending.any():
+            target = lastReward[pending] + discount_factor * values[pending].max(axis=1)
+            error = target - q_table[lastPattern[pending]]
+            total = np.bincount(lastPattern[pending], weights=error, minlength=PATTERNS)
+            count = np.bincount(lastPattern[pending], minlength=PATTERNS)
+            q_table += (learning_rate * total / np.maximum(count, 1)).astype(np.float32)
+
+        # ε-greedy: nhiễu nhỏ phá thế hòa giữa các ô cùng giá trị Q; khám phá = ô chưa bắn ngẫu nhiên
+        noise = rng.random((batch, cells), dtype=np.float32)
+        greedy = np.argmax(values + noise * 1e-4, axis=1)
+        explore = np.argmax(np.where(unshot, noise, -1), axis=1)
+        actions = np.where(rng.random(batch) < epsilon, explore, greedy)
+
+        hit = ships[everyone, actions]
+        rowsShot, colsShot = np.divmod(actions, cols)
+        states[everyone, rowsShot + 2, colsShot + 2] = np.where(hit, HITCELL, MISSCELL)
+        remaining -= hit
+        shots += 1
+        lastPattern = codes[everyone, actions]
+        lastReward = np.where(hit, 1.0, -1.0).astype(np.float32)  # Thưởng khi trúng, phạt khi trượt
+        pending = remaining > 0
+
+        # Ván kết thúc: cập nhật với giá trị cuối (không còn trạng thái sau) rồi thay bằng ván mới
+        done = np.flatnonzero(remaining == 0)
+        if len(done):
+            error = lastReward[done] - q_table[lastPattern[done]]
+            total = np.bincount(lastPattern[done], weights=error, minlength=PATTERNS)
+            count = np.bincount(lastPattern[done], minlength=PATTERNS)
+            q_table += (learning_rate * total / np.maximum(count, 1)).astype(np.float32)
+            finished += len(done)
+            totalShots += int(shots[done].sum())
+            states[done], ships[done] = newGames(len(done))
+            remaining[done] = ships[done].sum(axis=1)
+            shots[done] = 0
+    return q_table.astype(float), finished, totalShots
+
+
+def trainChunk(task):
+    """Chạy self-play cho một tiến trình; trả về (thay đổi của bảng Q, số ván, tổng số phát bắn)."""
+    q_table, episodes, seed, rows, cols, batch, epsilon = task
+    learned, finished, totalShots = selfPlay(q_table, episodes, seed, rows, cols, batch, epsilon)
+    return learned - q_table, finished, totalShots
+
+
+def saveCheckpoint(path, q_table, episodes):
+    """Ghi bảng Q ra path (.npz) qua tệp tạm để checkpoint cũ không bị hỏng nếu bị ngắt giữa chừng."""
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    temporary = path + '.tmp.npz'
+    np.savez(temporary, q_table=q_table, episodes=episodes, offsets=np.array(PATTERNOFFSETS))
+    os.replace(temporary, path)
+
+
+def loadCheckpoint(path):
+    """Đọc (bảng Q, số ván đã huấn luyện) từ checkpoint, hoặc bảng 0 nếu chưa có checkpoint."""
+    if not os.path.exists(path):
+        return np.zeros(PATTERNS), 0
+    with np.load(path) as checkpoint:
+        return checkpoint['q_table'].astype(float), int(checkpoint['episodes'])
+
+
+def train(episodes, path=NRCOMPUTER.checkpoint, workers=None, roundEpisodes=None, rows=ROWS, cols=COLS,
+          batch=4096, epsilon=0.1, seed=0, resume=False):
+    """
+    Huấn luyện episodes ván trên workers tiến trình; sau mỗi vòng gộp thay đổi của các tiến trình
+    (trung bình) vào bảng chung và ghi checkpoint. Trả về bảng Q cuối cùng.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    roundEpisodes = roundEpisodes or max(workers, min(episodes, 200_000))
+    q_table, trained = loadCheckpoint(path) if resume else (np.zeros(PATTERNS), 0)
+    start = time.perf_counter()
+
+    with multiprocessing.Pool(workers) as pool:
+        done = 0
+        round_ = 0
+        while done < episodes:
+            count = min(roundEpisodes, episodes - done)
+            share = [count // workers + (worker < count % workers) for worker in range(workers)]
+            tasks = [(q_table, part, (seed, trained + done, worker), rows, cols, batch, epsilon)
+                     for worker, part in enumerate(share) if part]
+            results = pool.map(trainChunk, tasks)
+            q_table = q_table + np.mean([delta for delta, _, _ in results], axis=0)
+            finished = sum(result[1] for result in results)
+            shots = sum(result[2] for result in results)
+            done += count
+            round_ += 1
+            saveCheckpoint(path, q_table, trained + done)
+            print(f'Vòng {round_}: {trained + done} ván, trung bình {shots / max(finished, 1):.2f} phát/ván '
+                  f'(ε = {epsilon}), {time.perf_counter() - start:.1f}s')
+    return q_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Huấn luyện bảng Q của NRCOMPUTER bằng tự chơi song song.')
+    parser.add_argument('--episodes', type=int, default=1_000_000, help='số ván huấn luyện')
+    parser.add_argument('--workers', type=int, default=None, help='số tiến trình (mặc định: số lõi CPU)')
+    parser.add_argument('--round', type=int, default=None, help='số ván mỗi vòng trước khi gộp và ghi checkpoint')
+    parser.add_argument('--batch', type=int, default=4096, help='số ván chạy đồng thời trong mỗi tiến trình')
+    parser.add_argument('--epsilon', type=float, default=0.1, help='xác suất khám phá khi huấn luyện')
+    parser.add_argument('--seed', type=int, default=0, help='seed cho bố trí hạm đội và khám phá')
+    parser.add_argument('--rows', type=int, default=ROWS, help='số hàng của lưới')
+    parser.add_argument('--cols', type=int, default=COLS, help='số cột của lưới')
+    parser.add_argument('--checkpoint', default=NRCOMPUTER.checkpoint, help='đường dẫn checkpoint (.npz)')
+    parser.add_argument('--resume', action='store_true', help='tiếp tục từ checkpoint đã có')
+    args = parser.parse_args()
+
+    train(args.episodes, args.checkpoint, args.workers, args.round, args.rows, args.cols,
+          args.batch, args.epsilon, args.seed, args.resume)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Hiệu ứng quét radar được dựng từ ảnh gốc thay cho 360 khung hình PNG.
+
+Mỗi khung radar_anim gồm một nền tĩnh (vòng tròn, lưới, quầng sáng) cộng với vệt quét
+xoay theo góc. Nền tĩnh là giá trị nhỏ nhất theo từng điểm ảnh của vài khung cách đều
+nhau; vệt quét được tách khỏi khung 000 thành tích cường độ theo bán kính và theo góc
+(để không kéo theo các đường lưới khi xoay). Mỗi khung hình chỉ còn là nền tĩnh cộng
+vệt quét đã xoay, làm tròn theo bước góc và giữ trong một bộ nhớ đệm LRU nhỏ.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+from numpy.lib.stride_tricks import sliding_window_view
+
+BASESAMPLES = 12  # Số khung dùng để tìm nền tĩnh (cách đều nhau trên 360 độ)
+
+
+def groupMedian(keys, values, size):
+    """Trung vị của values theo từng nhóm keys (0 <= key < size); nhóm rỗng có giá trị 0."""
+    order = np.argsort(keys, kind='stable')
+    keys, values = keys[order], values[order]
+    bounds = np.flatnonzero(np.diff(keys)) + 1
+    medians = np.zeros(size)
+    for key, group in zip(keys[np.r_[0, bounds]], np.split(values, bounds)):
+        medians[key] = np.median(group)
+    return medians
+
+
+def circularMedian(values, window):
+    """Lọc trung vị trên dãy vòng (theo góc) để xóa các đỉnh hẹp do đường lưới."""
+    half = window // 2
+    padded = np.r_[values[-half:], values, values[:half]]
+    return np.median(sliding_window_view(padded, window), axis=1)
+
+
+def splitRadarFrames(frames):
+    """Tách các khung radar_anim thành (nền tĩnh, vệt quét của khung 000) dạng Surface."""
+    base = frames[0].copy()
+    for frame in frames[1:]:
+        base.blit(frame, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
+
+    delta = pygame.surfarray.array3d(frames[0]).astype(float) - pygame.surfarray.array3d(base)
+    width, height = base.get_size()
+    x, y = np.meshgrid(np.arange(width) - (width - 1) / 2, np.arange(height) - (height - 1) / 2, indexing='ij')
+    radius = np.hypot(x, y).astype(int)
+    angle = (np.degrees(np.arctan2(y, x)) % 360).astype(int)  # Theo chiều kim đồng hồ, 0 độ ở hướng Đông
+    brightness = delta.sum(axis=-1)
+    colour = delta.reshape(-1, 3).sum(axis=0) / max(brightness.sum(), 1)
+
+    # Cường độ theo góc: trung vị trên vành giữa, lọc bỏ các tia lưới
+    ring = (radius >= 15) & (radius < radius.max() // 3)
+    angular = circularMedian(groupMedian(angle[ring], brightness[ring], 360), 7)
+    angular /= angular.max() or 1
+    # Cường độ theo bán kính: trung vị trong phần sáng của vệt quét, lọc bỏ các vòng lưới
+    bright = angular[angle] > 0.5
+    radial = groupMedian(radius[bright], brightness[bright] / angular[angle][bright], radius.max() + 1)
+    radial = np.median(sliding_window_view(np.pad(radial, 2, mode='edge'), 5), axis=1)
+
+    sweep = (radial[radius] * angular[angle])[..., None] * colour
+    sweep = pygame.surfarray.make_surface(np.clip(sweep, 0, 255).astype(np.uint8))
+    return base, sweep
+
+
+class RadarScanner:
+    """
+    Khung hình quét radar theo góc, dựng khi cần từ nền tĩnh và vệt quét.
+    Ảnh gốc chỉ được tải ở lần quét đầu tiên (load); step là bước làm tròn góc (độ).
+    """
+    def __init__(self, path, size, step=1, cacheSize=2):
+        self.path = path
+        self.size = size
+        self.step = step
+        self.cacheSize = cacheSize
+        self.base = None
+        self.sweep = None
+        self.frames = OrderedDict()  # góc -> Surface, cũ nhất ở đầu
+
+    def load(self):
+        """Tải ảnh gốc và tách nền/vệt quét (chỉ lần đầu)."""
+        if self.base is not None:
+            return
+        frames = [pygame.image.load(f'{self.path}{angle:03d}.png').convert_alpha()
+                  for angle in range(0, 360, 360 // BASESAMPLES)]
+        base, sweep = splitRadarFrames(frames)
+        self.base = pygame.transform.scale(base, self.size)
+        self.sweep = pygame.transform.scale(sweep, self.size).convert()
+
+    def frame(self, angle):
+        """Khung hình radar khi vệt quét ở góc angle (độ, theo chiều kim đồng hồ)."""
+        angle = angle // self.step * self.step % 360
+        image = self.frames.get(angle)
+        if image is not None:
+            self.frames.move_to_end(angle)
+            return image
+        self.load()
+        image = self.base.copy()
+        sweep = pygame.transform.rotate(self.sweep, -angle)
+        image.blit(sweep, sweep.get_rect(center=image.get_rect().center), special_flags=pygame.BLEND_RGB_ADD)
+        self.frames[angle] = image
+        if len(self.frames) > self.cacheSize:
+            self.frames.popitem(last=False)
+        return image
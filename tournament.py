@@ -0,0 +1,230 @@
+"""
+Giải đấu giữa các thuật toán của máy trên cùng một tập bố trí hạm đội ngẫu nhiên.
+
+Các ván được chia cho nhiều tiến trình (multiprocessing.Pool) và kết quả là số phát bắn
+cần để thắng của mỗi thuật toán: trung bình, trung vị, p95 và biểu đồ phân bố.
+
+Cách dùng:
+    python tournament.py --games 100000
+    python tournament.py --games 2000 --strategies DFS Greedy Optimal --workers 4
+    python tournament.py --games 4 --rows 1000 --cols 1000 --max-shots 20000 --strategies Greedy Optimal
+    python tournament.py --games 2000 --strategies Greedy --per-game
+    python tournament.py --games 200 --strategies Adversarial MonteCarlo --time-budget 0.02
+
+Trên lưới nhỏ, mọi thuật toán trừ Adversarial và MonteCarlo mặc định chạy theo lô (batchsim.py):
+bố trí hạm đội của mỗi đoạn ván được sinh một lần bằng layouts.LayoutSampler và các ván được chơi
+cùng lúc bằng mảng NumPy thay vì từng ván một; --per-game dùng lại các lớp trong computers.py trên
+cùng các bố trí đó.
+"""
+import argparse
+import copy
+import multiprocessing
+import random
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+import batchsim
+import computers
+from engine import ROWS, COLS, createBoard, playGame
+from layouts import LayoutSampler
+from montecarlo import MAXCELLS
+
+# Tên giống các nút chọn chế độ ở menu chính
+STRATEGIES = {
+    'DFS': computers.DFSCOMPUTER,
+    'BackTracking': computers.BTCOMPUTER,
+    'Adversarial': computers.ADVCOMPUTER,
+    'Greedy': computers.GCOMPUTER,
+    'NeuralNetwork': computers.NNCOMPUTER,
+    'Optimal': computers.OPTIMALMODE,
+    'MonteCarlo': computers.MCCOMPUTER,
+    'QLearning': computers.NRCOMPUTER,
+}
+
+# Các thuật toán suy nghĩ tới time_budget giây mỗi nước (vài giây mỗi ván): chỉ chạy khi được
+# chọn trong --strategies, không nằm trong giải đấu mặc định
+SEARCHSTRATEGIES = ('Adversarial', 'MonteCarlo')
+DEFAULTSTRATEGIES = [name for name in STRATEGIES if name not in SEARCHSTRATEGIES]
+
+# Số ván tối đa mỗi đoạn: không phụ thuộc thuật toán hay --per-game vì bố trí hạm đội được sinh theo
+# đoạn, và đủ lớn cho lô của các thuật toán theo lô nhẹ (batchsim.BatchStrategy.lotSize)
+MAXCHUNK = 5000
+
+# Thuật toán có bản theo lô (batchsim.py): các ván của một đoạn được chơi cùng lúc bằng mảng NumPy
+BATCHSTRATEGIES = {
+    'DFS': batchsim.BatchDFS,
+    'BackTracking': batchsim.BatchBacktracking,
+    'Greedy': batchsim.BatchGreedy,
+    'Optimal': batchsim.BatchDensity,
+    'NeuralNetwork': batchsim.BatchNeuralNetwork,
+    'QLearning': batchsim.BatchQLearning,
+}
+
+
+def chunkLayouts(seed, start, count, rows=ROWS, cols=COLS):
+    """
+    Bố trí hạm đội của các ván [start, start + count), sinh cả lô bằng LayoutSampler:
+    (sampler, mảng (count, số tàu) chỉ số vị trí đặt). Giống nhau cho mọi thuật toán cùng seed
+    (runTournament chia đoạn giống nhau cho mọi thuật toán), cả khi chơi theo lô lẫn từng ván.
+    """
+    sampler = LayoutSampler(rows, cols)
+    return sampler, sampler.sample(count, np.random.default_rng([seed, start]))
+
+
+def playChunk(task):
+    """
+    Chạy các ván [start, start + count) cho một thuật toán; trả về (tên, Counter số phát bắn).
+    Ván chưa thắng sau maxShots phát được ghi nhận là maxShots.
+    """
+    name, seed, start, count, rows, cols, maxShots, batch, timeBudget = task
+    # Cố định nguồn ngẫu nhiên của thuật toán để kết quả lặp lại được
+    chunkSeed = random.Random(f'{seed}-{name}-{start}').getrandbits(32)
+    random.seed(chunkSeed)
+    np.random.seed(chunkSeed)
+
+    sampler, layouts = chunkLayouts(seed, start, count, rows, cols)
+    if batch and name in BATCHSTRATEGIES and rows * cols <= MAXCELLS:
+        return name, Counter(playBatchChunk(name, sampler.occupancy(layouts), maxShots).tolist())
+    # Thuật toán có trọng số/checkpoint huấn luyện sẵn: chỉ đọc tệp một lần cho cả đoạn,
+    # mỗi ván chơi bằng một bản sao của máy đã nạp
+    prototype = None
+    if hasattr(STRATEGIES[name], 'load'):
+        prototype = STRATEGIES[name](rows, cols)
+        prototype.load()
+    shots = Counter()
+    for layout in sampler.layouts(layouts):
+        gamelogic = createBoard(layout, rows, cols)
+        player = copy.deepcopy(prototype) if prototype is not None else STRATEGIES[name](rows, cols)
+        if timeBudget is not None:
+            setTimeBudget(player, timeBudget)
+        shots[playGame(player, gamelogic, maxShots=maxShots)] += 1
+    return name, shots
+
+
+def setTimeBudget(player, seconds):
+    """Đặt thời gian suy nghĩ tối đa mỗi nước đi cho máy (Minimax) hoặc bộ lấy mẫu của máy (Monte Carlo)."""
+    for searcher in (player, getattr(player, 'sampler', None)):
+        if hasattr(searcher, 'time_budget'):
+            searcher.time_budget = seconds
+
+
+def playBatchChunk(name, ships, maxShots):
+    """Chơi cùng lúc các ván có bản đồ tàu ships (số ván, rows, cols) bằng bản theo lô của thuật toán name."""
+    _, rows, cols = ships.shape
+    strategy = BATCHSTRATEGIES[name](rows, cols)
+    if hasattr(strategy, 'load'):
+        strategy.load()
+    return batchsim.playBatch(strategy, ships, maxShots)
+
+
+def percentile(histogram, fraction):
+    """Giá trị nhỏ nhất mà ít nhất fraction số ván có số phát bắn không vượt quá."""
+    total = sum(histogram.values())
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= fraction * total:
+            return value
+    return None
+
+
+def summarize(histogram):
+    """Tính số ván, trung bình, trung vị và p95 từ biểu đồ số phát bắn."""
+    total = sum(histogram.values())
+    mean = sum(value * count for value, count in histogram.items()) / total
+    return total, mean, percentile(histogram, 0.5), percentile(histogram, 0.95)
+
+
+def printHistogram(name, histogram, binSize=5, width=50):
+    """In biểu đồ phân bố số phát bắn theo từng khoảng binSize."""
+    bins = Counter()
+    for value, count in histogram.items():
+        bins[value // binSize * binSize] += count
+    peak = max(bins.values())
+    print(f'\n{name}')
+    for low in range(min(bins), max(bins) + 1, binSize):
+        count = bins.get(low, 0)
+        bar = '#' * round(width * count / peak)
+        print(f'  {low:3d}-{low + binSize - 1:3d} | {count:8d} {bar}')
+
+
+def trainedStrategies(names, rows=ROWS, cols=COLS):
+    """Bỏ (kèm cảnh báo) các thuật toán cần trọng số/checkpoint huấn luyện nhưng không nạp được."""
+    ready = []
+    for name in names:
+        if hasattr(STRATEGIES[name], 'load') and not STRATEGIES[name](rows, cols).load():
+            print(f'Cảnh báo: không nạp được dữ liệu huấn luyện của {name} (xem qtraining.py, policytraining.py); '
+                  'bỏ qua thuật toán này thay vì chơi bằng trọng số chưa huấn luyện.', file=sys.stderr)
+            continue
+        ready.append(name)
+    return ready
+
+
+def runTournament(names, games, seed=0, workers=None, chunkSize=None, rows=ROWS, cols=COLS, maxShots=None,
+                  batch=True, timeBudget=None):
+    """
+    Chạy giải đấu trên lưới rows x cols và trả về dict: tên thuật toán -> Counter số phát bắn.
+    batch: dùng bản theo lô (BATCHSTRATEGIES) cho các thuật toán có bản này.
+    timeBudget: thời gian suy nghĩ tối đa mỗi nước (giây) của Adversarial/MonteCarlo (None = mặc định của lớp).
+    Thuật toán không nạp được dữ liệu huấn luyện bị bỏ qua (không có trong kết quả).
+    """
+    names = trainedStrategies(names, rows, cols)
+    workers = workers or multiprocessing.cpu_count()
+    chunkSize = chunkSize or max(1, min(MAXCHUNK, games // (workers * 4) or 1))
+    maxShots = maxShots or 2 * rows * cols
+    tasks = [(name, seed, start, min(chunkSize, games - start), rows, cols, maxShots, batch, timeBudget)
+             for name in names for start in range(0, games, chunkSize)]
+
+    results = {name: Counter() for name in names}
+    with multiprocessing.Pool(workers) as pool:
+        for name, shots in pool.imap_unordered(playChunk, tasks):
+            results[name].update(shots)
+    return results
+
+
+def positiveInt(text):
+    """Kiểu của argparse cho các tham số phải là số nguyên dương (--games, --bin)."""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f'cần số nguyên dương, nhận {text!r}')
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='So sánh số phát bắn để thắng của các thuật toán của máy.')
+    parser.add_argument('--games', type=positiveInt, default=1000, help='số ván cho mỗi thuật toán')
+    parser.add_argument('--strategies', nargs='+', choices=list(STRATEGIES), default=DEFAULTSTRATEGIES,
+                        help=f'các thuật toán tham gia (mặc định: tất cả trừ {", ".join(SEARCHSTRATEGIES)})')
+    parser.add_argument('--workers', type=int, default=None, help='số tiến trình (mặc định: số lõi CPU)')
+    parser.add_argument('--seed', type=int, default=0, help='seed cho bố trí hạm đội')
+    parser.add_argument('--bin', type=positiveInt, default=5, help='độ rộng mỗi cột của biểu đồ')
+    parser.add_argument('--rows', type=int, default=ROWS, help='số hàng của lưới')
+    parser.add_argument('--cols', type=int, default=COLS, help='số cột của lưới')
+    parser.add_argument('--max-shots', type=int, default=None,
+                        help='số phát bắn tối đa mỗi ván (mặc định: 2 * rows * cols)')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='thời gian suy nghĩ tối đa mỗi nước (giây) của Adversarial và MonteCarlo')
+    parser.add_argument('--per-game', action='store_true',
+                        help='chạy từng ván bằng các lớp trong computers.py kể cả khi có bản theo lô')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = runTournament(args.strategies, args.games, args.seed, args.workers,
+                            rows=args.rows, cols=args.cols, maxShots=args.max_shots, batch=not args.per_game,
+                            timeBudget=args.time_budget)
+    elapsed = time.perf_counter() - start
+
+    print(f'{"Strategy":<15}{"Games":>8}{"Mean":>9}{"Median":>8}{"P95":>6}')
+    for name in results:
+        total, mean, median, p95 = summarize(results[name])
+        print(f'{name:<15}{total:>8}{mean:>9.2f}{median:>8}{p95:>6}')
+    for name in results:
+        printHistogram(name, results[name], args.bin)
+    print(f'\n{args.games * len(results)} ván trong {elapsed:.1f}s')
+
+
+if __name__ == '__main__':
+    main()